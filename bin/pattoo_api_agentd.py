@@ -32,6 +32,27 @@ from pattoo.api.agents import PATTOO_API_AGENT
 from pattoo.db.db import connectivity
 
 
+class AsyncAgentAPI(Agent):
+    """Agent that serves the agent API using asyncio."""
+
+    def query(self):
+        """Serve the agent API until the daemon is stopped.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Only import the asyncio server when it is used
+        from pattoo.api.agents import aio
+
+        # Run until stopped
+        aio.run(config=self.config)
+        sys.exit(0)
+
+
 def main():
     """Main function to start the Gunicorn WSGI."""
     # Initialize key variables
@@ -40,6 +61,12 @@ def main():
     # Make sure we have a database
     _ = connectivity()
 
+    # Use the asyncio server if configured
+    if config.async_server() is True:
+        cli = AgentCLI()
+        cli.control(AsyncAgentAPI(PATTOO_API_AGENT_NAME, config=config))
+        return
+
     # Create agent object for web_proxy
     agent_gunicorn = Agent(PATTOO_API_AGENT_PROXY, config=config)
 
@@ -8,6 +8,7 @@ Used to add data to backend database
 # Standard libraries
 from __future__ import print_function
 from time import sleep, time
+import signal
 import sys
 import os
 
@@ -32,6 +33,7 @@ from pattoo.constants import PATTOO_INGESTERD_NAME, PATTOO_INGESTER_SCRIPT
 from pattoo.configuration import ConfigIngester as Config
 from pattoo import sysinfo
 from pattoo.ingest import files
+from pattoo.ingest.workers import WorkerPool
 from pattoo.db.db import connectivity
 
 class PollingAgent(Agent):
@@ -50,6 +52,7 @@ class PollingAgent(Agent):
         """
         # Initialize key variables
         Agent.__init__(self, parent, config=config)
+        self._pool = None
 
     def query(self):
         """Query all remote targets for data.
@@ -69,6 +72,13 @@ class PollingAgent(Agent):
         script = '{}{}{}'.format(
             _BIN_DIRECTORY, os.sep, PATTOO_INGESTER_SCRIPT)
 
+        # Create a pool of sub processes that lasts for the life of the
+        # daemon. This is done here as the daemon has already been forked.
+        if bool(use_script) is False and config.multiprocessing() is True:
+            self._pool = WorkerPool()
+            self._pool.start()
+            signal.signal(signal.SIGTERM, self._stop)
+
         # Post data to the remote server
         while True:
             # Get start time
@@ -86,7 +96,7 @@ class PollingAgent(Agent):
                     success = not bool(_result)
                 else:
                     # Process cache with function
-                    success = files.process_cache()
+                    success = files.process_cache(pool=self._pool)
 
                 if bool(success) is False:
                     log_message = ('''\
@@ -112,6 +122,27 @@ for possible causes.''')
             log.log2info(20100, log_message)
             sleep(sleep_time)
 
+    def _stop(self, signum, _):
+        """Stop the pool of sub processes when the daemon is stopped.
+
+        Args:
+            signum: Signal number
+            _: Current stack frame
+
+        Returns:
+            None
+
+        """
+        # Stop the pool
+        log_message = ('''\
+Ingester received signal {}. Stopping worker pool.'''.format(signum))
+        log.log2info(20166, log_message)
+        if self._pool is not None:
+            self._pool.stop()
+
+        # Exit
+        sys.exit(0)
+
 
 def check_lockfile():
     """Delete lockfile if found and ingester is not running.
@@ -9,9 +9,11 @@ from pattoo_shared.constants import PATTOO_API_AGENT_PREFIX
 # Import PATTOO_API_AGENT Blueprints
 from pattoo.api.agents.post import POST
 from pattoo.api.agents.status import STATUS
+from pattoo.configuration import ConfigAgent as Config
 
-# Setup flask
+# Setup flask. Larger posts get a 413 response.
 PATTOO_API_AGENT = Flask(__name__)
+PATTOO_API_AGENT.config['MAX_CONTENT_LENGTH'] = Config().max_post_size()
 
 # Register Blueprints
 PATTOO_API_AGENT.register_blueprint(
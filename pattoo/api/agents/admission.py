@@ -0,0 +1,164 @@
+"""Pattoo. Limit the growth of the agent API cache.
+
+Posts are refused while the cache directory and spool hold more data than
+the configured high water marks, and are accepted again once the ingester
+has reduced them below the low water marks.
+
+"""
+
+# Standard imports
+import os
+import time
+import threading
+
+# pattoo imports
+from pattoo_shared import log
+from pattoo.configuration import ConfigAgent as Config
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.api.agents import dedup
+
+# Seconds between measurements of the cache
+_INTERVAL = 1
+
+# Admission state of this process
+_STATE = {
+    'throttled': False, 'depth': (0, 0), 'timestamp': 0, 'scanning': False}
+_LOCK = threading.Lock()
+
+
+def admit(config=None):
+    """Determine whether posted data should be accepted.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: False if the cache is above its high water marks
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+    high_files = config.cache_high_water_files()
+    high_bytes = config.cache_high_water_bytes()
+
+    # Don't measure the cache if there are no limits
+    if bool(high_files) is False and bool(high_bytes) is False:
+        return True
+    (files, size) = depth(config=config)
+
+    # Stop accepting data at the high water mark and start again at the low
+    # water mark. This prevents rapid changes when near the limits.
+    with _LOCK:
+        if _STATE['throttled'] is True:
+            if (bool(high_files) is False or (
+                    files <= config.cache_low_water_files())) and (
+                        bool(high_bytes) is False or (
+                            size <= config.cache_low_water_bytes())):
+                _STATE['throttled'] = False
+                log_message = ('''\
+Accepting posts again. Cache contains {} files and {} bytes.\
+'''.format(files, size))
+                log.log2info(20183, log_message)
+        else:
+            if (bool(high_files) is True and files > high_files) or (
+                    bool(high_bytes) is True and size > high_bytes):
+                _STATE['throttled'] = True
+                log_message = ('''\
+Refusing posts. Cache contains {} files and {} bytes. Check the \
+pattoo_ingesterd daemon and the database.'''.format(files, size))
+                log.log2warning(20182, log_message)
+        result = _STATE['throttled'] is False
+    return result
+
+
+def depth(config=None):
+    """Get the amount of data waiting in the cache.
+
+    The cache is measured at most once every _INTERVAL seconds, by one
+    thread at a time. The last measurement is returned while it is measured.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: Tuple of (files, bytes)
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+
+    # Only one thread measures the cache at a time. The others use the last
+    # measurement until it is done.
+    with _LOCK:
+        if _STATE['scanning'] is True or (
+                time.time() - _STATE['timestamp'] < _INTERVAL):
+            return _STATE['depth']
+        _STATE['scanning'] = True
+
+    # Measure without holding the lock
+    try:
+        result = _depth(config.agent_cache_directory(PATTOO_API_AGENT_NAME))
+        with _LOCK:
+            _STATE['depth'] = result
+            _STATE['timestamp'] = time.time()
+    finally:
+        with _LOCK:
+            _STATE['scanning'] = False
+    return result
+
+
+def status(config=None):
+    """Create the text of the status page.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: Status page
+
+    """
+    # Get depth
+    (files, size) = depth(config=config)
+    result = '''\
+The Pattoo Agent API is Operational.
+Cache files: {}
+Cache bytes: {}
+Duplicate posts: {}
+'''.format(files, size, sum(dedup.hits().values()))
+    return result
+
+
+def _depth(directory):
+    """Measure the files in a directory and its subdirectories.
+
+    Args:
+        directory: Directory
+
+    Returns:
+        result: Tuple of (files, bytes)
+
+    """
+    # Initialize key variables
+    files = 0
+    size = 0
+
+    # Measure. Files may be deleted by the ingester while doing this.
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return (files, size)
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False) is True:
+                (_files, _size) = _depth(entry.path)
+                files += _files
+                size += _size
+            elif entry.is_file(follow_symlinks=False) is True:
+                size += entry.stat(follow_symlinks=False).st_size
+                files += 1
+        except OSError:
+            continue
+    result = (files, size)
+    return result
@@ -0,0 +1,253 @@
+"""Pattoo. asyncio server for the agent API.
+
+Serves the same routes as the PATTOO_API_AGENT Flask application from a
+single event loop. The configuration is read once at startup. Posted data
+is decoded and saved by a small pool of threads so that slow disks don't
+block the acceptance of new connections.
+
+"""
+
+# Standard imports
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# PIP3 imports
+from aiohttp import web
+
+# pattoo imports
+from pattoo_shared import log
+from pattoo_shared.constants import PATTOO_API_AGENT_PREFIX
+from pattoo.configuration import ConfigAgent as Config
+from pattoo.api.agents import cache, admission
+
+# Application keys
+_CONFIG = web.AppKey('config', Config)
+_EXECUTOR = web.AppKey('executor', ThreadPoolExecutor)
+
+
+def create_app(config=None):
+    """Create the agent API application.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        app: aiohttp.web.Application object
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+
+    # Create the application. Larger posts get a 413 response.
+    app = web.Application(client_max_size=config.max_post_size())
+    app[_CONFIG] = config
+    app[_EXECUTOR] = ThreadPoolExecutor(
+        max_workers=config.async_server_threads())
+    app.on_cleanup.append(_cleanup)
+
+    # Add routes
+    app.router.add_post(
+        '{}/receive/{{source}}'.format(PATTOO_API_AGENT_PREFIX), receive)
+    app.router.add_post(
+        '{}/bulk/{{source}}'.format(PATTOO_API_AGENT_PREFIX), receive_bulk)
+    app.router.add_get('{}/status'.format(PATTOO_API_AGENT_PREFIX), status)
+    return app
+
+
+def run(config=None):
+    """Run the agent API server until it is stopped.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+
+    # Log so that user running the script from the CLI knows that something
+    # is happening
+    log_message = ('''\
+Pattoo asyncio API running on {}:{} and logging to file {}.\
+'''.format(config.ip_listen_address(), config.ip_bind_port(),
+           config.log_file_api()))
+    log.log2info(20193, log_message)
+
+    # Run
+    web.run_app(
+        create_app(config=config), host=config.ip_listen_address(),
+        port=config.ip_bind_port(), backlog=4096, access_log=None,
+        print=None)
+
+
+async def receive(request):
+    """Handle the agent posting route.
+
+    Args:
+        request: aiohttp.web.Request object
+
+    Returns:
+        Text response of Received
+
+    """
+    # Initialize key variables
+    source = request.match_info['source']
+    loop = asyncio.get_running_loop()
+
+    # Ask the sender to post later if the cache is too large
+    admitted = await loop.run_in_executor(
+        request.app[_EXECUTOR], admission.admit, request.app[_CONFIG])
+    if admitted is False:
+        return _unavailable(request.app[_CONFIG])
+
+    # Save the data
+    body = await request.read()
+    success = await loop.run_in_executor(
+        request.app[_EXECUTOR], _receive, body, source,
+        request.app[_CONFIG])
+    if success is False:
+        raise web.HTTPNotFound()
+
+    # Return
+    return web.Response(text='OK')
+
+
+async def receive_bulk(request):
+    """Handle the posting route for the data of many agents.
+
+    Args:
+        request: aiohttp.web.Request object
+
+    Returns:
+        Text response of Received
+
+    """
+    # Initialize key variables
+    source = request.match_info['source']
+    loop = asyncio.get_running_loop()
+
+    # Ask the sender to post later if the cache is too large
+    admitted = await loop.run_in_executor(
+        request.app[_EXECUTOR], admission.admit, request.app[_CONFIG])
+    if admitted is False:
+        return _unavailable(request.app[_CONFIG])
+
+    # Save the data
+    body = await request.read()
+    try:
+        success = await loop.run_in_executor(
+            request.app[_EXECUTOR], _receive_bulk, body, source,
+            request.app[_CONFIG])
+    except cache.PostTooLarge:
+        raise web.HTTPRequestEntityTooLarge(
+            max_size=request.app[_CONFIG].max_decoded_size(),
+            actual_size=len(body))
+    if success is False:
+        raise web.HTTPNotFound()
+
+    # Return
+    return web.Response(text='OK')
+
+
+async def status(request):
+    """Provide the status page.
+
+    Args:
+        request: aiohttp.web.Request object
+
+    Returns:
+        Status page
+
+    """
+    # Measure the cache in a thread as it may be large
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(
+        request.app[_EXECUTOR], admission.status, request.app[_CONFIG])
+    return web.Response(text=text)
+
+
+def _unavailable(config):
+    """Create the response to posts that aren't accepted.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: Response with a 503 status
+
+    """
+    # Return
+    result = web.Response(
+        text='The cache is full. Try again later.\n', status=503,
+        headers={'Retry-After': str(config.cache_retry_after())})
+    return result
+
+
+def _receive(body, source, config):
+    """Decode, validate and save data posted by an agent.
+
+    Args:
+        body: Body of the POST
+        source: Unique Identifier of an pattoo agent
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Get JSON from incoming agent POST. Don't crash if we cannot convert it
+    try:
+        posted_data = json.loads(body.decode())
+    except:
+        return False
+
+    # Save valid data
+    if cache.validate(posted_data) is False:
+        return False
+    result = cache.save(posted_data, source, config=config)
+    return result
+
+
+def _receive_bulk(body, source, config):
+    """Decode, validate and save the data of many agents.
+
+    Args:
+        body: Body of the POST. It may be gzip or zstd compressed
+        source: Unique Identifier of the relay posting the data
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    Raises:
+        PostTooLarge: If the decoded body is larger than max_decoded_size
+
+    """
+    # Get JSON from incoming POST
+    posted_data = cache.decode(body, config=config)
+    if posted_data is None:
+        return False
+
+    # Save valid data
+    result = cache.save_bulk(posted_data, source, config=config)
+    return result
+
+
+async def _cleanup(app):
+    """Stop the threads used to save and write data.
+
+    Args:
+        app: aiohttp.web.Application object
+
+    Returns:
+        None
+
+    """
+    # Wait for data to be saved
+    app[_EXECUTOR].shutdown(wait=True)
+    cache.close()
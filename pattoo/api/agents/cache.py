@@ -0,0 +1,404 @@
+"""Pattoo. Functions to validate and save data posted by agents."""
+
+# Standard imports
+import os
+import json
+import sys
+import zlib
+import threading
+from random import randrange
+
+# pattoo imports
+from pattoo_shared import log
+from pattoo_shared.constants import CACHE_KEYS
+from pattoo.configuration import ConfigAgent as Config
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.api.agents import writethrough, dedup
+from pattoo import spool
+
+# Magic numbers at the start of compressed data
+_GZIP = b'\x1f\x8b'
+_ZSTD = b'\x28\xb5\x2f\xfd'
+
+# Size of the chunks of data decompressed at a time
+_CHUNK_SIZE = 1048576
+
+# Write-through buffers of each process
+_BUFFERS = {}
+_LOCK = threading.Lock()
+
+
+class PostTooLarge(Exception):
+    """Raised when a post is larger than max_decoded_size when decoded."""
+
+    pass
+
+
+def validate(posted_data):
+    """Validate data posted by an agent.
+
+    Args:
+        posted_data: JSON posted by the agent
+
+    Returns:
+        result: True if valid
+
+    """
+    # Initialize key variables
+    prefix = 'Invalid posted data.'
+
+    # Abort if posted_data isn't a list
+    if isinstance(posted_data, dict) is False:
+        log_message = '{} Not a dictionary'.format(prefix)
+        log.log2warning(20024, log_message)
+        return False
+    if len(posted_data) != len(CACHE_KEYS):
+        log_message = ('''\
+{} Incorrect length. Expected length of {}'''.format(prefix, len(CACHE_KEYS)))
+        log.log2warning(20019, log_message)
+        return False
+    for key in posted_data.keys():
+        if key not in CACHE_KEYS:
+            log_message = '{} Invalid key'.format(prefix)
+            log.log2warning(20018, log_message)
+            return False
+    return True
+
+
+def decode(body, config=None):
+    """Decode the body of a POST, decompressing it if necessary.
+
+    Args:
+        body: Bytes posted. These may be gzip or zstd compressed
+        config: ConfigAgent object
+
+    Returns:
+        result: JSON posted or None if the body is invalid
+
+    Raises:
+        PostTooLarge: If the decoded body is larger than max_decoded_size
+
+    """
+    # Read configuration
+    if config is None:
+        config = Config()
+    max_size = config.max_decoded_size()
+
+    # Decompress. JSON never starts with these bytes.
+    try:
+        if body.startswith(_GZIP) is True:
+            body = _gunzip(body, max_size)
+        elif body.startswith(_ZSTD) is True:
+            body = _unzstd(body, max_size)
+        elif len(body) > max_size:
+            raise PostTooLarge()
+        result = json.loads(body.decode())
+    except PostTooLarge:
+        log_message = ('''\
+Invalid posted data. Larger than {} bytes when decoded'''.format(max_size))
+        log.log2warning(20194, log_message)
+        raise
+    except:
+        log_message = 'Invalid posted data. Cannot be decoded'
+        log.log2warning(20176, log_message)
+        result = None
+    return result
+
+
+def save_bulk(posted_data, source, config=None):
+    """Save a list of data posted by agents to the cache.
+
+    Data of multiple agents is posted by relays. Invalid items are ignored.
+
+    Args:
+        posted_data: List of JSON posted by each agent
+        source: Unique Identifier of the source of the POST
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Read configuration
+    if config is None:
+        config = Config()
+
+    # Abort if posted_data isn't a list
+    if isinstance(posted_data, list) is False:
+        log_message = 'Invalid posted data. Not a list'
+        log.log2warning(20177, log_message)
+        return False
+    items = [_ for _ in posted_data if validate(_) is True]
+    log_message = ('''\
+Received data from {} agents posted by {}. {} were invalid.\
+'''.format(len(items), source, len(posted_data) - len(items)))
+    log.log2debug(20179, log_message)
+
+    # Ignore posts that have already been saved
+    pending = [
+        (dedup.digest(_['pattoo_agent_id'], _, config=config), _)
+        for _ in items]
+    pending = [_ for _ in pending if dedup.seen(_[0]) is False]
+    items = [item for _, item in pending]
+
+    # Write directly to the database if configured, otherwise save
+    if config.write_through() is True and (
+            _buffer(config).add(items) is True):
+        result = True
+    else:
+        result = store(items, config=config)
+    if result is True:
+        dedup.add([_digest for _digest, _ in pending], config=config)
+    return result
+
+
+def store(items, config=None):
+    """Save a list of valid data posted by agents to the cache.
+
+    Args:
+        items: List of JSON posted by each agent
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Read configuration
+    if config is None:
+        config = Config()
+
+    # Append to the spool in a single write if configured
+    if config.spool() is True:
+        try:
+            spool.extend(items, config=config)
+        except Exception as err:
+            log_message = '{}'.format(err)
+            log.log2warning(20178, log_message)
+            return False
+        return True
+
+    # Create cache files named after each agent
+    for item in items:
+        if _save(item, item['pattoo_agent_id'], config) is False:
+            return False
+    return True
+
+
+def save(posted_data, source, config=None):
+    """Save valid data posted by an agent to the cache.
+
+    Args:
+        posted_data: JSON posted by the agent
+        source: Unique Identifier of an pattoo agent
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Read configuration
+    if config is None:
+        config = Config()
+
+    # Ignore posts that have already been saved
+    _digest = dedup.digest(source, posted_data, config=config)
+    if dedup.seen(_digest) is True:
+        return True
+
+    # Save
+    result = _write(posted_data, source, config)
+    if result is True:
+        dedup.add([_digest], config=config)
+    return result
+
+
+def _write(posted_data, source, config):
+    """Save valid data posted by an agent.
+
+    Args:
+        posted_data: JSON posted by the agent
+        source: Unique Identifier of an pattoo agent
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Write directly to the database if configured
+    if config.write_through() is True:
+        if _buffer(config).add([posted_data]) is True:
+            return True
+
+    # Append to the spool if configured
+    if config.spool() is True:
+        try:
+            spool.append(posted_data, config=config)
+        except Exception as err:
+            log_message = '{}'.format(err)
+            log.log2warning(20174, log_message)
+            return False
+        return True
+
+    # Create cache file
+    result = _save(posted_data, source, config)
+    return result
+
+
+def close():
+    """Write the data buffered by this process and close the spool.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Stop buffers. Data that can't be written to the database is saved to
+    # the cache.
+    with _LOCK:
+        buffer = _BUFFERS.pop(os.getpid(), None)
+    if buffer is not None:
+        buffer.stop()
+    spool.close()
+
+
+def _buffer(config):
+    """Get the write-through buffer of this process.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: writethrough.Buffer object
+
+    """
+    # Don't reuse buffers created by a parent process. Their threads don't
+    # exist in this one.
+    with _LOCK:
+        result = _BUFFERS.get(os.getpid())
+        if result is None:
+            result = writethrough.Buffer(store, config=config)
+            result.start()
+            _BUFFERS[os.getpid()] = result
+    return result
+
+
+def _gunzip(body, max_size):
+    """Decompress gzip data without creating more than max_size bytes.
+
+    Args:
+        body: gzip compressed bytes. There may be more than one member
+        max_size: Maximum size of the result
+
+    Returns:
+        result: Decompressed bytes
+
+    Raises:
+        PostTooLarge: If the result would be larger than max_size
+
+    """
+    # Initialize key variables
+    result = []
+    size = 0
+    data = body
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    # Decompress no more than one byte over the limit at a time
+    while True:
+        chunk = decompressor.decompress(data, max_size - size + 1)
+        size += len(chunk)
+        if size > max_size:
+            raise PostTooLarge()
+        result.append(chunk)
+        data = decompressor.unconsumed_tail
+
+        # Start on the next member, if any
+        if decompressor.eof is True:
+            data = decompressor.unused_data
+            if bool(data) is False:
+                break
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif bool(data) is False:
+            raise EOFError('Compressed data ended before the end of a member')
+    return b''.join(result)
+
+
+def _unzstd(body, max_size):
+    """Decompress zstd data without creating more than max_size bytes.
+
+    Args:
+        body: zstd compressed bytes
+        max_size: Maximum size of the result
+
+    Returns:
+        result: Decompressed bytes
+
+    Raises:
+        PostTooLarge: If the result would be larger than max_size
+        ImportError: If the zstandard package isn't installed
+
+    """
+    # Only the bulk route uses zstd. The package is optional.
+    import zstandard
+
+    # Initialize key variables
+    result = []
+    size = 0
+
+    # Decompress in chunks
+    with zstandard.ZstdDecompressor().stream_reader(body) as reader:
+        while True:
+            chunk = reader.read(min(_CHUNK_SIZE, max_size - size + 1))
+            if bool(chunk) is False:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise PostTooLarge()
+            result.append(chunk)
+    return b''.join(result)
+
+
+def _save(posted_data, source, config):
+    """Save valid data posted by an agent to a cache file.
+
+    Args:
+        posted_data: JSON posted by the agent
+        source: Unique Identifier of an pattoo agent
+        config: ConfigAgent object
+
+    Returns:
+        result: True if successful
+
+    """
+    # Extract key values from posting
+    try:
+        timestamp = posted_data['pattoo_agent_timestamp']
+    except:
+        _exception = sys.exc_info()
+        log_message = ('API Failure')
+        log.log2exception(20025, _exception, message=log_message)
+        return False
+
+    # Create filename. Add a suffix in the event the source is posting
+    # frequently.
+    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+    suffix = str(randrange(100000)).zfill(6)
+    json_path = (
+        '{}{}{}_{}_{}.json'.format(
+            cache_dir, os.sep, timestamp, source, suffix))
+
+    # Create cache file
+    try:
+        with open(json_path, 'w+') as temp_file:
+            json.dump(posted_data, temp_file)
+    except Exception as err:
+        log_message = '{}'.format(err)
+        log.log2warning(20016, log_message)
+        return False
+    except:
+        _exception = sys.exc_info()
+        log_message = ('API Failure')
+        log.log2exception(20017, _exception, message=log_message)
+        return False
+    return True
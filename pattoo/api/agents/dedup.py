@@ -0,0 +1,140 @@
+"""Pattoo. Ignore posts the agent API has already received.
+
+Agents resend identical data after restarts and network errors. Digests of
+recently saved posts are kept for dedup_window seconds so that these
+duplicates are dropped before they are written to the cache.
+
+Digests and counters are kept in the memory of each process. Duplicates
+received by different gunicorn workers are not detected.
+
+"""
+
+# Standard imports
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict, Counter
+
+# pattoo imports
+from pattoo_shared import log
+from pattoo.configuration import ConfigAgent as Config
+
+# Expiry times of digests, oldest first. Keyed by (source, digest)
+_DIGESTS = OrderedDict()
+_HITS = Counter()
+_LOCK = threading.Lock()
+
+
+def digest(source, posted_data, config=None):
+    """Create the digest of a post.
+
+    Args:
+        source: Unique Identifier of an pattoo agent
+        posted_data: JSON posted by the agent
+        config: ConfigAgent object
+
+    Returns:
+        result: Digest of the post. None if deduplication is disabled
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+    if bool(config.dedup_window()) is False:
+        return None
+
+    # Create digest
+    data = json.dumps(posted_data, sort_keys=True).encode()
+    result = (source, hashlib.blake2b(data, digest_size=16).digest())
+    return result
+
+
+def seen(_digest):
+    """Determine whether a post has already been saved.
+
+    Args:
+        _digest: Digest of the post
+
+    Returns:
+        result: True if the post is a duplicate
+
+    """
+    # Initialize key variables
+    if _digest is None:
+        return False
+    now = time.time()
+
+    # Check
+    with _LOCK:
+        _expire(now)
+        result = _digest in _DIGESTS
+        if result is True:
+            _HITS[_digest[0]] += 1
+    if result is True:
+        log_message = 'Ignoring duplicate post from {}'.format(_digest[0])
+        log.log2debug(20184, log_message)
+    return result
+
+
+def add(digests, config=None):
+    """Record the digests of saved posts.
+
+    Args:
+        digests: List of digests
+        config: ConfigAgent object
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+    digests = [_ for _ in digests if _ is not None]
+    if bool(digests) is False:
+        return
+    expiry = time.time() + config.dedup_window()
+    size = config.dedup_size()
+
+    # Add. Remove the oldest digests if there are too many.
+    with _LOCK:
+        for _digest in digests:
+            _DIGESTS.pop(_digest, None)
+            _DIGESTS[_digest] = expiry
+        while len(_DIGESTS) > size:
+            _DIGESTS.popitem(last=False)
+
+
+def hits():
+    """Get the number of duplicate posts ignored for each source.
+
+    Args:
+        None
+
+    Returns:
+        result: Dict of counts keyed by source
+
+    """
+    # Return
+    with _LOCK:
+        result = dict(_HITS)
+    return result
+
+
+def _expire(now):
+    """Remove expired digests. _LOCK must be held.
+
+    Args:
+        now: Current time
+
+    Returns:
+        None
+
+    """
+    # Digests are added in order of expiry
+    while bool(_DIGESTS) is True:
+        (_digest, expiry) = next(iter(_DIGESTS.items()))
+        if expiry > now:
+            break
+        _DIGESTS.popitem(last=False)
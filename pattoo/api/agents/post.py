@@ -1,25 +1,37 @@
 """Pattoo. Posting Routes."""
 
-# Standard imports
-import os
-import json
-import sys
-from random import randrange
-
 # Flask imports
-from flask import Blueprint, request, abort
+from flask import Blueprint, Response, request, abort
 
 # pattoo imports
-from pattoo_shared import log
-from pattoo_shared.constants import CACHE_KEYS
-from pattoo_shared.configuration import ServerConfig as Config
-from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.configuration import ConfigAgent as Config
+from pattoo.api.agents import cache, admission
 
 
 # Define the POST global variable
 POST = Blueprint('POST', __name__)
 
 
+@POST.before_request
+def limit():
+    """Reject posts larger than MAX_CONTENT_LENGTH.
+
+    Werkzeug only applies the limit when parsing forms, not when reading
+    JSON or the raw body of a post.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Abort if the post is too large
+    maximum = request.max_content_length
+    if maximum is not None and (request.content_length or 0) > maximum:
+        abort(413)
+
+
 @POST.route('/receive/<source>', methods=['POST'])
 def receive(source):
     """Handle the agent posting route.
@@ -31,64 +43,56 @@ def receive(source):
         Text response of Received
 
     """
-    # Initialize key variables
-    prefix = 'Invalid posted data.'
-
     # Read configuration
     config = Config()
-    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
 
-    # Get JSON from incoming agent POST
-    try:
-        posted_data = request.json
-    except:
-        # Don't crash if we cannot convert JSON
-        abort(404)
+    # Ask the agent to post later if the cache is too large
+    if admission.admit(config=config) is False:
+        return _unavailable(config)
 
-    # Abort if posted_data isn't a list
-    if isinstance(posted_data, dict) is False:
-        log_message = '{} Not a dictionary'.format(prefix)
-        log.log2warning(20024, log_message)
-        abort(404)
-    if len(posted_data) != len(CACHE_KEYS):
-        log_message = ('''\
-{} Incorrect length. Expected length of {}'''.format(prefix, len(CACHE_KEYS)))
-        log.log2warning(20019, log_message)
+    # Get JSON from incoming agent POST. Don't crash if we cannot convert it
+    posted_data = request.get_json(silent=True)
+
+    # Abort if posted_data isn't valid
+    if cache.validate(posted_data) is False:
         abort(404)
-    for key in posted_data.keys():
-        if key not in CACHE_KEYS:
-            log_message = '{} Invalid key'.format(prefix)
-            log.log2warning(20018, log_message)
-            abort(404)
 
-    # Extract key values from posting
-    try:
-        timestamp = posted_data['pattoo_agent_timestamp']
-    except:
-        _exception = sys.exc_info()
-        log_message = ('API Failure')
-        log.log2exception(20025, _exception, message=log_message)
+    # Create cache file
+    if cache.save(posted_data, source, config=config) is False:
         abort(404)
 
-    # Create filename. Add a suffix in the event the source is posting
-    # frequently.
-    suffix = str(randrange(100000)).zfill(6)
-    json_path = (
-        '{}{}{}_{}_{}.json'.format(
-            cache_dir, os.sep, timestamp, source, suffix))
+    # Return
+    return 'OK'
 
-    # Create cache file
+
+@POST.route('/bulk/<source>', methods=['POST'])
+def receive_bulk(source):
+    """Handle the posting route for the data of many agents.
+
+    Args:
+        source: Unique Identifier of the relay posting the data
+
+    Returns:
+        Text response of Received
+
+    """
+    # Read configuration
+    config = Config()
+
+    # Ask the relay to post later if the cache is too large
+    if admission.admit(config=config) is False:
+        return _unavailable(config)
+
+    # Get JSON from the incoming POST. It may be compressed
     try:
-        with open(json_path, 'w+') as temp_file:
-            json.dump(posted_data, temp_file)
-    except Exception as err:
-        log_message = '{}'.format(err)
-        log.log2warning(20016, log_message)
+        posted_data = cache.decode(request.get_data(), config=config)
+    except cache.PostTooLarge:
+        abort(413)
+    if posted_data is None:
         abort(404)
-    except:
-        _exception = sys.exc_info()
-        log_message = ('API Failure')
-        log.log2exception(20017, _exception, message=log_message)
+
+    # Create cache files
+    if cache.save_bulk(posted_data, source, config=config) is False:
         abort(404)
 
     # Return
@@ -107,4 +111,21 @@ def index():
 
     """
     # Return
-    return 'The Pattoo Agent API is Operational.\n'
+    return admission.status()
+
+
+def _unavailable(config):
+    """Create the response to posts that aren't accepted.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: Response object with a 503 status
+
+    """
+    # Return
+    result = Response(
+        'The cache is full. Try again later.\n', status=503,
+        headers={'Retry-After': str(config.cache_retry_after())})
+    return result
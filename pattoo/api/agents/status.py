@@ -3,6 +3,9 @@
 # Flask imports
 from flask import Blueprint
 
+# pattoo imports
+from pattoo.api.agents import admission
+
 # Define the STATUS global variable
 STATUS = Blueprint('STATUS', __name__)
 
@@ -19,4 +22,4 @@ def index():
 
     """
     # Return
-    return 'The Pattoo Agent API is Operational.\n'
+    return admission.status()
@@ -0,0 +1,191 @@
+"""Pattoo. Write posted agent data directly to the database.
+
+Posted data is buffered in memory and written to the database in batches
+by a background thread. Data that cannot be written is saved to the cache
+for the ingester instead.
+
+"""
+
+# Standard imports
+import sys
+import atexit
+import threading
+
+# pattoo imports
+from pattoo_shared import log, converter
+from pattoo.configuration import ConfigAgent as Config
+from pattoo.db import misc
+from pattoo.ingest.records import process_db_records
+
+
+class Buffer():
+    """Buffer posted agent data for writing to the database."""
+
+    def __init__(self, fallback, config=None):
+        """Initialize the class.
+
+        Args:
+            fallback: Function that saves a list of posted agent data to the
+                cache. It is called with the list and config as arguments
+            config: ConfigAgent object
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        if config is None:
+            config = Config()
+        self._fallback = fallback
+        self._config = config
+        self._size = config.write_through_batch_size()
+        self._interval = config.write_through_interval()
+        self._items = []
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start writing to the database in the background.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Write all the buffered data and stop.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def add(self, items):
+        """Add posted agent data to the buffer.
+
+        Args:
+            items: List of valid posted agent data
+
+        Returns:
+            result: False if the buffer is full or stopped
+
+        """
+        with self._condition:
+            # Limit memory usage if the database is slower than the agents
+            if self._stopped is True or (
+                    len(self._items) >= self._size * 10):
+                return False
+
+            # Add
+            self._items.extend(items)
+            if len(self._items) >= self._size:
+                self._condition.notify()
+        return True
+
+    def _run(self):
+        """Write batches of data to the database until stopped.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        while True:
+            # Wait until there is a batch of data, or for the flush interval
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped is True or (
+                        len(self._items) >= self._size),
+                    timeout=self._interval)
+                items = self._items
+                self._items = []
+                stopped = self._stopped
+
+            # Write
+            if bool(items) is True:
+                self._flush(items)
+            if stopped is True:
+                break
+
+    def _flush(self, items):
+        """Write data to the database, saving it to the cache on failure.
+
+        Each agent is written separately. Only the data of agents that
+        cannot be written is saved to the cache.
+
+        Args:
+            items: List of valid posted agent data
+
+        Returns:
+            None
+
+        """
+        # Group posts by agent_id
+        _items = {}
+        for item in items:
+            _items.setdefault(item['pattoo_agent_id'], []).append(item)
+
+        # Write. Database errors raise SystemExit, so catch everything.
+        for agent_id, posts in sorted(_items.items()):
+            try:
+                self._ingest(posts)
+            except:
+                _exception = sys.exc_info()
+                log_message = ('''\
+Cannot write {} posts from agent {} to the database. Saving them to the \
+cache.'''.format(len(posts), agent_id))
+                log.log2exception(20180, _exception, message=log_message)
+                self._fallback(posts, config=self._config)
+
+    def _ingest(self, items):
+        """Write the data of an agent to the database.
+
+        Args:
+            items: List of valid data posted by the same agent
+
+        Returns:
+            None
+
+        """
+        # Create PattooDBrecord objects
+        pattoo_db_records = []
+        for item in sorted(
+                items, key=lambda _: _['pattoo_agent_timestamp']):
+            pattoo_db_records.extend(converter.cache_to_keypairs(item))
+        if bool(pattoo_db_records) is False:
+            return
+
+        # The ingester and other API processes also write the agent's data.
+        # Get the latest last_timestamp values from the database so that
+        # data already in the database isn't inserted again.
+        agent_id = pattoo_db_records[0].pattoo_agent_id
+        misc.CACHE.discard(agent_id)
+
+        # Write
+        rows = process_db_records(pattoo_db_records)
+
+        # Log
+        log_message = ('''\
+Wrote {} posts from agent {} directly to the database. {} rows inserted.\
+'''.format(len(items), agent_id, rows))
+        log.log2debug(20181, log_message)
@@ -2,13 +2,14 @@
 
 # Import PIP3 libraries
 from flask import Flask
-from flask_caching import Cache
 
 # Define the global URL prefix
 from pattoo_shared.constants import PATTOO_API_WEB_PREFIX
 
 # Import pattoo modules
 from pattoo.db import POOL
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.api.web import cache
 
 # Setup REST URI prefix
 PATTOO_API_WEB_REST_PREFIX = '{}/rest'.format(PATTOO_API_WEB_PREFIX)
@@ -16,8 +17,9 @@ PATTOO_API_WEB_REST_PREFIX = '{}/rest'.format(PATTOO_API_WEB_PREFIX)
 # Setup flask
 PATTOO_API_WEB = Flask(__name__)
 
-# Setup memcache. Required for all API imports
-CACHE = Cache(PATTOO_API_WEB, config={'CACHE_TYPE': 'simple'})
+# Setup the cache shared by all API processes. Required for all API imports
+CACHE = cache.CACHE
+CACHE.init_app(PATTOO_API_WEB, config=cache.configuration(Config()))
 
 # Import PATTOO_API_WEB Blueprints (MUST be done after CACHE)
 from pattoo.api.web.graphql import GRAPHQL
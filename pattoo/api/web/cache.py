@@ -0,0 +1,173 @@
+"""Pattoo. Cache the time series returned by pattoo_apid.
+
+Results are cached for each DataPoint using keys that include the
+last_timestamp of the DataPoint. New data from the ingester creates new
+keys, so cached results are never out of date. The default filesystem cache
+is shared by all the processes of the API.
+
+"""
+
+# Standard imports
+import hashlib
+
+# PIP3 imports
+from flask_caching import Cache
+
+# pattoo imports
+from pattoo_shared import log
+from pattoo_shared import times
+from pattoo.constants import PATTOO_API_WEB_NAME
+from pattoo.downsample import downsample
+from pattoo.db.table import datapoint
+from pattoo.api.web import tail
+
+# Cache of time series. Configured when the API is created.
+CACHE = Cache()
+
+# Flask-Caching backend classes of each cache_type. Recent releases only
+# accept class names.
+BACKENDS = {
+    'filesystem': 'FileSystemCache',
+    'simple': 'SimpleCache',
+    'redis': 'RedisCache',
+    'memcached': 'MemcachedCache',
+    'null': 'NullCache'}
+
+
+def configuration(config):
+    """Create the Flask-Caching configuration.
+
+    Args:
+        config: ConfigPattoo object
+
+    Returns:
+        result: Dict of Flask-Caching configuration values
+
+    """
+    # Initialize key variables
+    cache_type = config.cache_type()
+    result = {
+        'CACHE_TYPE': BACKENDS[cache_type],
+        'CACHE_DEFAULT_TIMEOUT': config.cache_timeout(),
+        'CACHE_THRESHOLD': config.cache_size(),
+        'CACHE_KEY_PREFIX': '{}_'.format(PATTOO_API_WEB_NAME)}
+
+    # Add the location of the cache
+    if cache_type == 'filesystem':
+        result['CACHE_DIR'] = config.agent_cache_directory(
+            PATTOO_API_WEB_NAME)
+    elif cache_type == 'redis':
+        result['CACHE_REDIS_URL'] = config.cache_url()
+    elif cache_type == 'memcached':
+        result['CACHE_MEMCACHED_SERVERS'] = [config.cache_url()]
+    return result
+
+
+def key(row, ts_start, resolution=None, points=None, mode=None):
+    """Create the cache key of a DataPoint time series.
+
+    Args:
+        row: Row from pattoo.db.table.datapoint.metadata()
+        ts_start: Start time
+        resolution: Interval between values required by the caller
+        points: Maximum number of values to return
+        mode: Downsampling mode
+
+    Returns:
+        result: Key
+
+    """
+    # Align the start time with the values that will be returned
+    _resolution = datapoint.rollup_resolution(
+        row.polling_interval, resolution)
+    interval = row.polling_interval if _resolution is None else _resolution
+    result = 'series/{}/{}/{}/{}/{}/{}'.format(
+        row.idx_datapoint, times.normalized_timestamp(interval, ts_start),
+        row.last_timestamp, _resolution, points, mode)
+    return result
+
+
+def etag(rows, ts_starts, resolution=None, points=None, mode=None):
+    """Create the entity tag of the time series of many DataPoints.
+
+    The tag changes when the time series would change. It is the same for
+    all processes.
+
+    Args:
+        rows: Dict of rows from pattoo.db.table.datapoint.metadata() keyed
+            by idx_datapoint
+        ts_starts: Dict of start times keyed by idx_datapoint
+        resolution: Interval between values required by the caller
+        points: Maximum number of values to return
+        mode: Downsampling mode
+
+    Returns:
+        result: Entity tag
+
+    """
+    # Create a digest of the keys
+    keys = sorted([
+        key(row, ts_starts[_idx_datapoint], resolution=resolution,
+            points=points, mode=mode)
+        for _idx_datapoint, row in rows.items()])
+    result = hashlib.md5('\n'.join(keys).encode()).hexdigest()
+    return result
+
+
+def series(rows, ts_starts, resolution=None, points=None, mode=None):
+    """Get the time series of many DataPoints using the cache.
+
+    Only the DataPoints not found in the cache are read from the database.
+
+    Args:
+        rows: Dict of rows from pattoo.db.table.datapoint.metadata() keyed
+            by idx_datapoint
+        ts_starts: Dict of start times keyed by idx_datapoint
+        resolution: Interval between values required by the caller
+        points: Maximum number of values to return
+        mode: Downsampling mode
+
+    Returns:
+        result: Dict of lists of key-value pair dicts keyed by idx_datapoint
+
+    """
+    # Initialize key variables
+    result = {}
+    keys = {
+        _idx_datapoint: key(
+            row, ts_starts[_idx_datapoint], resolution=resolution,
+            points=points, mode=mode)
+        for _idx_datapoint, row in rows.items()}
+    if bool(keys) is False:
+        return result
+
+    # Get cached values. Cache failures are treated as misses.
+    try:
+        values = CACHE.get_many(*keys.values())
+    except Exception as error:
+        log_message = 'Cannot read the pattoo_apid cache: {}'.format(error)
+        log.log2warning(20191, log_message)
+        values = [None] * len(keys)
+    for (_idx_datapoint, value) in zip(keys.keys(), values):
+        if value is not None:
+            result[_idx_datapoint] = value
+    missing = {
+        _idx_datapoint: row for _idx_datapoint, row in rows.items()
+        if _idx_datapoint not in result}
+    if bool(missing) is False:
+        return result
+
+    # Get the rest. Only rows not already in memory are read from the
+    # database.
+    found = tail.series(missing, ts_starts, resolution=resolution)
+    for _idx_datapoint, values in found.items():
+        result[_idx_datapoint] = downsample(values, points=points, mode=mode)
+
+    # Update the cache
+    try:
+        CACHE.set_many(
+            {keys[_]: result[_] for _ in missing.keys()})
+    except Exception as error:
+        log_message = 'Cannot update the pattoo_apid cache: {}'.format(error)
+        log.log2warning(20192, log_message)
+    return result
@@ -1,23 +1,33 @@
 """Pattoo version routes."""
 
+# Standard imports
+from datetime import datetime, timezone
+
 # PIP libraries
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
 # pattoo imports
-from pattoo.api.web import CACHE
 from pattoo import data
 from pattoo import uri
-from pattoo.db.table.datapoint import DataPoint
+from pattoo.api.web import cache
+from pattoo.db.table import datapoint
 
 # Define the various global variables
 REST_API_DATA = Blueprint('REST_API_DATA', __name__)
 
 
 @REST_API_DATA.route('/data/<int:idx_datapoint>')
-@CACHE.cached(query_string=True, timeout=10)
 def route_data(idx_datapoint):
     """Provide data from the Data table.
 
+    The optional points and mode arguments reduce the number of values
+    returned using pattoo.downsample. Values are read from rollups of the
+    Data table when points is small enough.
+
+    Responses have an ETag header. An empty 304 response is returned
+    without reading the Data table if it matches the If-None-Match header
+    of the request.
+
     Args:
         idx_datapoint: DataPoint.idx_datapoint key
 
@@ -26,15 +36,106 @@ def route_data(idx_datapoint):
 
     """
     # Initialize key variables
-    _result = {}
     secondsago = data.integerize(request.args.get('secondsago'))
-    ts_start = uri.chart_timestamp_args(idx_datapoint, secondsago)
+    points = data.integerize(request.args.get('points'))
+    mode = request.args.get('mode')
+    resolution = uri.resolution(secondsago, points)
+
+    # Get the DataPoint
+    rows = datapoint.metadata([idx_datapoint])
+    ts_starts = {
+        _idx_datapoint: uri.timestamp_start(row.polling_interval, secondsago)
+        for _idx_datapoint, row in rows.items()}
+
+    # Return nothing if the client has the data
+    tag = cache.etag(
+        rows, ts_starts, resolution=resolution, points=points, mode=mode)
+    if request.if_none_match.contains(tag) is True:
+        return _conditional(Response(status=304), tag, rows)
+
+    # Get data ending at the last_timestamp of the DataPoint
+    _result = cache.series(
+        rows, ts_starts, resolution=resolution, points=points, mode=mode)
+
+    # Return
+    result = _conditional(
+        jsonify(_result.get(idx_datapoint, [])), tag, rows)
+    return result
+
+
+@REST_API_DATA.route('/data')
+def route_data_batch():
+    """Provide data of many DataPoints from the Data table.
+
+    DataPoints are selected by repeating the idx_datapoint argument. The
+    data of all of them is fetched in a single query. ETag headers are used
+    in the same way as route_data.
+
+    Args:
+        None
+
+    Returns:
+        _result: JSONify dict of lists of dicts {timestamp: value} from the
+            Data table keyed by idx_datapoint.
+
+    """
+    # Initialize key variables
+    secondsago = data.integerize(request.args.get('secondsago'))
+    points = data.integerize(request.args.get('points'))
+    mode = request.args.get('mode')
+    resolution = uri.resolution(secondsago, points)
+    idx_datapoints = sorted(set([
+        _ for _ in [
+            data.integerize(_) for _ in request.args.getlist(
+                'idx_datapoint')] if _ is not None]))
+
+    # Get the DataPoints
+    rows = datapoint.metadata(idx_datapoints)
+    ts_starts = {
+        _idx_datapoint: uri.timestamp_start(row.polling_interval, secondsago)
+        for _idx_datapoint, row in rows.items()}
+
+    # Return nothing if the client has the data
+    tag = cache.etag(
+        rows, ts_starts, resolution=resolution, points=points, mode=mode)
+    if request.if_none_match.contains(tag) is True:
+        return _conditional(Response(status=304), tag, rows)
 
     # Get data
-    _datapoint = DataPoint(idx_datapoint)
-    ts_stop = _datapoint.last_timestamp()
-    _result = _datapoint.data(ts_start, ts_stop)
+    _result = cache.series(
+        rows, ts_starts, resolution=resolution, points=points, mode=mode)
+
+    # DataPoints that don't exist have no data
+    for _idx_datapoint in idx_datapoints:
+        _result.setdefault(_idx_datapoint, [])
 
     # Return
-    result = jsonify(_result)
+    result = _conditional(jsonify(_result), tag, rows)
     return result
+
+
+def _conditional(response, tag, rows):
+    """Add the headers used by clients to make conditional requests.
+
+    Only the ETag is used to find responses the client already has. The
+    range of data returned moves with time even if a DataPoint has no new
+    data, so Last-Modified is for information only.
+
+    Args:
+        response: Response object
+        tag: Entity tag
+        rows: Dict of rows from pattoo.db.table.datapoint.metadata() keyed
+            by idx_datapoint
+
+    Returns:
+        response: Response object
+
+    """
+    # Add headers. Clients must check whether cached responses are current.
+    response.set_etag(tag)
+    response.cache_control.no_cache = True
+    if bool(rows) is True:
+        response.last_modified = datetime.fromtimestamp(
+            max([row.last_timestamp for row in rows.values()]) / 1000,
+            tz=timezone.utc)
+    return response
@@ -0,0 +1,172 @@
+"""Pattoo. Keep the time series of recently requested DataPoints in memory.
+
+Dashboards request the same time range of a DataPoint every few seconds.
+The rows of the last range requested for each DataPoint are kept, so only
+rows added since then are read from the database. The range then slides
+forward, dropping the oldest rows.
+
+Each process keeps its own windows. The series_cache_size limit applies to
+each gunicorn worker and counts windows, not bytes.
+
+"""
+
+# Standard imports
+import threading
+import collections
+
+# PIP3 imports
+import numpy as np
+
+# pattoo imports
+from pattoo_shared import times
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.db.table import datapoint
+
+# Rows of a DataPoint between ts_start and its last_timestamp, ts_stop
+Window = collections.namedtuple(
+    'Window', 'ts_start ts_stop timestamps values')
+
+# Windows of the most recently used DataPoints, oldest first. Keyed by
+# (idx_datapoint, resolution of the rollup read)
+_WINDOWS = collections.OrderedDict()
+_LOCK = threading.Lock()
+
+
+def series(rows, ts_starts, resolution=None, config=None):
+    """Get the data of many DataPoints reading only rows not in memory.
+
+    Args:
+        rows: Dict of rows from pattoo.db.table.datapoint.metadata() keyed
+            by idx_datapoint
+        ts_starts: Dict of start times keyed by idx_datapoint. The data of
+            each DataPoint ends at its last_timestamp
+        resolution: Interval between values in milliseconds required by the
+            caller
+        config: ConfigPattoo object
+
+    Returns:
+        result: Dict of lists of key-value pair dicts keyed by idx_datapoint
+
+    """
+    # Initialize key variables
+    if config is None:
+        config = Config()
+    size = config.series_cache_size()
+    result = {}
+    keys = {}
+    ranges = {}
+    intervals = {}
+    windows = {}
+    fetches = {}
+
+    # Find the rows that need to be read
+    for _idx_datapoint, row in rows.items():
+        _resolution = datapoint.rollup_resolution(
+            row.polling_interval, resolution)
+        interval = row.polling_interval if _resolution is None else (
+            _resolution)
+        ts_start = times.normalized_timestamp(
+            interval, ts_starts[_idx_datapoint])
+        ts_stop = row.last_timestamp
+        keys[_idx_datapoint] = (_idx_datapoint, _resolution)
+        ranges[_idx_datapoint] = (ts_start, ts_stop)
+        intervals[_idx_datapoint] = interval
+
+        with _LOCK:
+            window = _WINDOWS.get(keys[_idx_datapoint])
+        (start, windows[_idx_datapoint]) = _slide(
+            window, ts_start, ts_stop, _resolution)
+        if start <= ts_stop:
+            fetches[_idx_datapoint] = (start, ts_stop)
+
+    # Read the new rows
+    if bool(fetches) is True:
+        found = datapoint.fetch(
+            {_: rows[_] for _ in fetches.keys()}, fetches,
+            resolution=resolution)
+    else:
+        found = {}
+
+    # Create the result
+    for _idx_datapoint, row in rows.items():
+        window = windows[_idx_datapoint]
+        (ts_start, ts_stop) = ranges[_idx_datapoint]
+        if _idx_datapoint in found:
+            (timestamps, _values) = found[_idx_datapoint]
+            window = window._replace(
+                timestamps=np.concatenate((window.timestamps, timestamps)),
+                values=np.concatenate((window.values, _values)))
+        windows[_idx_datapoint] = window._replace(ts_stop=ts_stop)
+
+        # The window may start before the request
+        first = np.searchsorted(window.timestamps, ts_start)
+        result[_idx_datapoint] = datapoint.values(
+            window.timestamps[first:], window.values[first:], row.data_type,
+            intervals[_idx_datapoint], ts_start, ts_stop)
+
+    # Keep the windows of the most recently used DataPoints
+    with _LOCK:
+        for _idx_datapoint, window in windows.items():
+            key = keys[_idx_datapoint]
+            _WINDOWS.pop(key, None)
+            _WINDOWS[key] = window
+        while len(_WINDOWS) > size:
+            _WINDOWS.popitem(last=False)
+    return result
+
+
+def clear():
+    """Remove all windows from memory.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Clear
+    with _LOCK:
+        _WINDOWS.clear()
+
+
+def _slide(window, ts_start, ts_stop, resolution):
+    """Slide a window forward to the time range of a request.
+
+    Args:
+        window: Window from memory. None if there isn't one
+        ts_start: Normalized start time of the request
+        ts_stop: last_timestamp of the DataPoint
+        resolution: Resolution of the rollup read. None if the Data table is
+            read
+
+    Returns:
+        result: Tuple of (start, window). Rows from start to ts_stop need to
+            be read from the database and added to the window
+
+    """
+    # Read all rows if the window doesn't cover the start of the request or
+    # the DataPoint has changed
+    if window is None or window.ts_start > ts_start or (
+            window.ts_stop > ts_stop):
+        empty = Window(
+            ts_start=ts_start, ts_stop=ts_stop,
+            timestamps=np.array([], dtype=np.int64),
+            values=np.array([], dtype=float))
+        return (ts_start, empty)
+
+    # Rows in the Data table don't change. The most recent rollup bucket is
+    # updated as data is added, so it is read again if there is new data.
+    if resolution is None or window.ts_stop == ts_stop:
+        start = window.ts_stop + 1
+    else:
+        start = times.normalized_timestamp(resolution, window.ts_stop)
+
+    # Move the start of the window forward by as much as the end, keeping
+    # its length unless that would exclude rows the request needs.
+    _ts_start = min(ts_start, window.ts_start + (ts_stop - window.ts_stop))
+    keep = (window.timestamps >= _ts_start) & (window.timestamps < start)
+    result = (start, Window(
+        ts_start=_ts_start, ts_stop=window.ts_stop,
+        timestamps=window.timestamps[keep], values=window.values[keep]))
+    return result
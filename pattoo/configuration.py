@@ -211,31 +211,589 @@ class ConfigPattoo(ServerConfig):
             result = int(intermediate)
         return result
 
+    def cache_type(self):
+        """Get cache_type.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'cache_type'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Default to a cache shared by all API processes
+        if result not in [
+                'filesystem', 'simple', 'redis', 'memcached', 'null']:
+            result = 'filesystem'
+        return result
+
+    def cache_url(self):
+        """Get cache_url.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'cache_url'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+        return result
+
+    def cache_timeout(self):
+        """Get cache_timeout.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 600
+
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'cache_timeout'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def cache_size(self):
+        """Get cache_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 10000
+
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'cache_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def series_cache_size(self):
+        """Get series_cache_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 100
+
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'series_cache_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
 
 class ConfigAgent(ServerConfig):
     """Class gathers all configuration information.
 
-    Only processes the following YAML keys in the configuration file:
+    Only processes the following YAML keys in the configuration file:
+
+        The value of the PATTOO_API_WEB_NAME constant
+
+    """
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Instantiate the Config parent
+        ServerConfig.__init__(self)
+
+    def ip_listen_address(self):
+        """Get ip_listen_address.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'ip_listen_address'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Default to 0.0.0.0
+        if result is None:
+            result = '0.0.0.0'
+        return result
+
+    def ip_bind_port(self):
+        """Get ip_bind_port.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key variables
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'ip_bind_port'
+
+        # Get result
+        intermediate = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+        if intermediate is None:
+            result = 20202
+        else:
+            result = int(intermediate)
+        return result
+
+    def spool(self):
+        """Get spool.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def spool_segment_size(self):
+        """Get spool_segment_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 67108864
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool_segment_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def spool_fsync_interval(self):
+        """Get spool_fsync_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 1
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool_fsync_interval'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, float(_result))
+            except:
+                result = default
+        return result
+
+    def async_server(self):
+        """Get async_server.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'async_server'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def async_server_threads(self):
+        """Get async_server_threads.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 4
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'async_server_threads'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def write_through(self):
+        """Get write_through.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'write_through'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def write_through_batch_size(self):
+        """Get write_through_batch_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 500
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'write_through_batch_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def write_through_interval(self):
+        """Get write_through_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 5
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'write_through_interval'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0.1, float(_result))
+            except:
+                result = default
+        return result
+
+    def cache_high_water_files(self):
+        """Get cache_high_water_files.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_high_water_files'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def cache_high_water_bytes(self):
+        """Get cache_high_water_bytes.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_high_water_bytes'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def cache_low_water_files(self):
+        """Get cache_low_water_files.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = self.cache_high_water_files() * 8 // 10
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_low_water_files'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def cache_low_water_bytes(self):
+        """Get cache_low_water_bytes.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = self.cache_high_water_bytes() * 8 // 10
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_low_water_bytes'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def cache_retry_after(self):
+        """Get cache_retry_after.
 
-        The value of the PATTOO_API_WEB_NAME constant
+        Args:
+            None
 
-    """
+        Returns:
+            result: result
 
-    def __init__(self):
-        """Initialize the class.
+        """
+        # Initialize key varibles
+        default = 60
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_retry_after'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def dedup_window(self):
+        """Get dedup_window.
 
         Args:
             None
 
         Returns:
-            None
+            result: result
 
         """
-        # Instantiate the Config parent
-        ServerConfig.__init__(self)
+        # Initialize key varibles
+        default = 0
 
-    def ip_listen_address(self):
-        """Get ip_listen_address.
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'dedup_window'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def dedup_size(self):
+        """Get dedup_size.
 
         Args:
             None
@@ -244,19 +802,27 @@ class ConfigAgent(ServerConfig):
             result: result
 
         """
+        # Initialize key varibles
+        default = 100000
+
         # Get result
         key = PATTOO_API_AGENT_NAME
-        sub_key = 'ip_listen_address'
-        result = search(
+        sub_key = 'dedup_size'
+        _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Default to 0.0.0.0
-        if result is None:
-            result = '0.0.0.0'
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
         return result
 
-    def ip_bind_port(self):
-        """Get ip_bind_port.
+    def max_post_size(self):
+        """Get max_post_size.
 
         Args:
             None
@@ -265,17 +831,52 @@ class ConfigAgent(ServerConfig):
             result: result
 
         """
-        # Initialize key variables
+        # Initialize key varibles
+        default = 67108864
+
+        # Get result
         key = PATTOO_API_AGENT_NAME
-        sub_key = 'ip_bind_port'
+        sub_key = 'max_post_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def max_decoded_size(self):
+        """Get max_decoded_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 268435456
 
         # Get result
-        intermediate = search(
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'max_decoded_size'
+        _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
-        if intermediate is None:
-            result = 20202
+
+        # Return
+        if _result is None:
+            result = default
         else:
-            result = int(intermediate)
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
         return result
 
 
@@ -406,3 +1007,188 @@ class ConfigIngester(ServerConfig):
             except:
                 result = default
         return result
+
+    def insert_chunk_size(self):
+        """Get insert_chunk_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 5000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'insert_chunk_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def load_data_infile(self):
+        """Get load_data_infile.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'load_data_infile'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def pipeline(self):
+        """Get pipeline.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def pipeline_queue_size(self):
+        """Get pipeline_queue_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 2
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline_queue_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def checksum_cache_size(self):
+        """Get checksum_cache_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 1000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'checksum_cache_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def stream(self):
+        """Get stream.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'stream'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def stream_memory_limit(self):
+        """Get stream_memory_limit.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 67108864
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'stream_memory_limit'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
@@ -25,6 +25,20 @@ PATTOO_API_AGENT_PROXY = '{}-gunicorn'.format(
 # Constants for data ingestion
 ###############################################################################
 
+# Maximum number of rows processed by each bulk database statement. Bulk
+# inserts of the Pair, Glue and DataPoint tables use "ON DUPLICATE KEY UPDATE"
+# so that they are idempotent when multiple ingester processes race to
+# create the same rows.
+DB_CHUNK_SIZE = 1000
+
+# Resolutions of the rollups of the Data table in milliseconds. Rollups are
+# maintained for 5 minute, 1 hour and 1 day buckets.
+ROLLUP_RESOLUTIONS = (300000, 3600000, 86400000)
+
+# Spool of posted agent data. Segments are rotated after this many seconds
+SPOOL_DIRECTORY_NAME = 'spool'
+SPOOL_SEGMENT_AGE = 300
+
 IDXTimestampValue = collections.namedtuple(
     'IDXTimestampValue', 'idx_datapoint timestamp polling_interval value')
 
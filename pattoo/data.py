@@ -25,3 +25,22 @@ def integerize(value):
 
     # Return
     return result
+
+
+def chunks(items, size):
+    """Split a list into sublists of no more than size entries.
+
+    Args:
+        items: List to split
+        size: Maximum number of entries in each sublist
+
+    Returns:
+        result: Generator of sublists
+
+    """
+    # Don't allow zero or negative sizes
+    size = max(1, int(size))
+
+    # Return
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
@@ -18,6 +18,7 @@ from sqlalchemy.pool import QueuePool
 # pattoo libraries
 from pattoo_shared import log
 from pattoo.configuration import ConfigPattoo as Config
+from pattoo.configuration import ConfigIngester
 
 #############################################################################
 # Setup a global pool for database connections
@@ -50,6 +51,9 @@ def main():
     pool_size = config.db_pool_size()
     max_overflow = config.db_max_overflow()
 
+    # Only allow "LOAD DATA LOCAL INFILE" when the ingester needs it
+    local_infile = ConfigIngester().load_data_infile()
+
     # Create DB connection pool
     if use_mysql is True:
         URL = ('mysql+pymysql://{}:{}@{}/{}?charset=utf8mb4'.format(
@@ -70,7 +74,8 @@ def main():
             pool_size=pool_size,
             pool_pre_ping=True,
             pool_recycle=pool_recycle,
-            pool_timeout=pool_timeout)
+            pool_timeout=pool_timeout,
+            connect_args={'local_infile': local_infile})
 
         # Fix for multiprocessing on engines.
         _add_engine_pidguard(db_engine)
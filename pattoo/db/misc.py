@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Inserts various database values required during ingest."""
 
+# Standard libraries
+from collections import OrderedDict
+
 # PIP libraries
 from sqlalchemy import and_
 
@@ -8,6 +11,147 @@ from sqlalchemy import and_
 from pattoo.db import db
 from pattoo.db.models import DataPoint, Glue, Pair, Agent
 from pattoo.constants import ChecksumLookup
+from pattoo.configuration import ConfigIngester as Config
+
+
+class ChecksumCache():
+    """Keep the DataPoint checksums of recently seen agents in memory.
+
+    Agents are removed in least recently used order when there are more
+    than the configured checksum_cache_size.
+
+    """
+
+    def __init__(self, size=None):
+        """Initialize the class.
+
+        Args:
+            size: Maximum number of agents to cache. Defaults to the
+                configured checksum_cache_size
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._size = size
+        self._agents = OrderedDict()
+        self._idx_datapoints = {}
+        self._disabled = set()
+
+        # Instrumentation counters
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, agent_id):
+        """Get all the checksum values for a specific agent_id.
+
+        Args:
+            agent_id: PattooDBrecord object agent_id
+
+        Returns:
+            result: Dict of ChecksumLookup values keyed by DataPoint.checksum
+
+        """
+        # Initialize key variables
+        if self._size is None:
+            self._size = Config().checksum_cache_size()
+
+        # Use cached values
+        if agent_id in self._agents:
+            self.hits += 1
+            self._agents.move_to_end(agent_id)
+            return dict(self._agents[agent_id])
+
+        # Get the data from the database
+        self.misses += 1
+        (result, disabled) = _agent_checksums(agent_id)
+        if bool(self._size) is False:
+            return result
+
+        # Update the cache
+        self._agents[agent_id] = dict(result)
+        for checksum, lookup in result.items():
+            self._idx_datapoints[lookup.idx_datapoint] = (agent_id, checksum)
+        self._disabled.update(disabled)
+        while len(self._agents) > self._size:
+            self.discard(next(iter(self._agents)))
+        return result
+
+    def add(self, agent_id, checksum, lookup):
+        """Add a new DataPoint to a cached agent.
+
+        Args:
+            agent_id: PattooDBrecord object agent_id
+            checksum: DataPoint.checksum
+            lookup: ChecksumLookup object
+
+        Returns:
+            None
+
+        """
+        # Only update agents already in the cache
+        if agent_id in self._agents:
+            self._agents[agent_id][checksum] = lookup
+            self._idx_datapoints[lookup.idx_datapoint] = (agent_id, checksum)
+
+    def advance(self, last_timestamps):
+        """Update the last_timestamp values of cached DataPoints.
+
+        Args:
+            last_timestamps: Dict of DataPoint.last_timestamp values keyed by
+                DataPoint.idx_datapoint
+
+        Returns:
+            None
+
+        """
+        for idx_datapoint, last_timestamp in last_timestamps.items():
+            if idx_datapoint not in self._idx_datapoints:
+                continue
+            (agent_id, checksum) = self._idx_datapoints[idx_datapoint]
+            lookup = self._agents[agent_id][checksum]
+            if last_timestamp > lookup.last_timestamp:
+                self._agents[agent_id][checksum] = lookup._replace(
+                    last_timestamp=last_timestamp)
+
+    def invalidate(self, idx_datapoints):
+        """Remove agents with newly disabled DataPoints from the cache.
+
+        Args:
+            idx_datapoints: List of disabled DataPoint.idx_datapoint values
+
+        Returns:
+            None
+
+        """
+        for idx_datapoint in idx_datapoints:
+            # Ignore DataPoints known to be disabled when the agent was cached
+            if idx_datapoint in self._disabled:
+                continue
+            if idx_datapoint in self._idx_datapoints:
+                (agent_id, _) = self._idx_datapoints[idx_datapoint]
+                self.discard(agent_id)
+
+    def discard(self, agent_id):
+        """Remove an agent from the cache.
+
+        Args:
+            agent_id: PattooDBrecord object agent_id
+
+        Returns:
+            None
+
+        """
+        # Remove agent
+        checksums = self._agents.pop(agent_id, {})
+        for lookup in checksums.values():
+            self._idx_datapoints.pop(lookup.idx_datapoint, None)
+            self._disabled.discard(lookup.idx_datapoint)
+
+
+# Checksums of the agents recently processed by this process
+CACHE = ChecksumCache()
 
 
 def agent_checksums(agent_id):
@@ -19,9 +163,26 @@ def agent_checksums(agent_id):
     Returns:
         result: Dict of idx_datapoint values keyed by DataPoint.checksum
 
+    """
+    # Return
+    result = CACHE.get(agent_id)
+    return result
+
+
+def _agent_checksums(agent_id):
+    """Get all the checksum values for a specific agent_id from the database.
+
+    Args:
+        agent_id: PattooDBrecord object agent_id
+
+    Returns:
+        result: Tuple of a dict of idx_datapoint values keyed by
+            DataPoint.checksum and a set of disabled idx_datapoint values
+
     """
     # Result
-    result = {}
+    checksums = {}
+    disabled = set()
     rows = []
 
     # Get the data from the database
@@ -30,15 +191,18 @@ def agent_checksums(agent_id):
             DataPoint.checksum,
             DataPoint.last_timestamp,
             DataPoint.polling_interval,
-            DataPoint.idx_datapoint).filter(and_(
+            DataPoint.idx_datapoint,
+            DataPoint.enabled).filter(and_(
                 Agent.agent_id == agent_id.encode(),
                 DataPoint.idx_agent == Agent.idx_agent
             ))
 
     # Return
     for row in rows:
-        result[row.checksum.decode()] = ChecksumLookup(
+        checksums[row.checksum.decode()] = ChecksumLookup(
             idx_datapoint=row.idx_datapoint,
             polling_interval=row.polling_interval,
             last_timestamp=row.last_timestamp)
-    return result
+        if bool(row.enabled) is False:
+            disabled.add(row.idx_datapoint)
+    return (checksums, disabled)
@@ -527,3 +527,47 @@ class Data(BASE):
         DataPoint,
         backref=backref(
             'data_checksum', uselist=True, cascade='delete,all'))
+
+
+class DataRollup(BASE):
+    """Class defining the pt_data_rollup table of the database.
+
+    Summaries of the Data table for buckets of each resolution in
+    pattoo.constants.ROLLUP_RESOLUTIONS.
+
+    """
+
+    __tablename__ = 'pt_data_rollup'
+    __table_args__ = (
+        PrimaryKeyConstraint('idx_datapoint', 'resolution', 'timestamp'),
+        {'mysql_engine': 'InnoDB'}
+    )
+
+    idx_datapoint = Column(
+        BIGINT(unsigned=True),
+        ForeignKey('pt_datapoint.idx_datapoint'),
+        index=True, nullable=False, server_default='1')
+
+    resolution = Column(BIGINT(unsigned=True), nullable=False, default='1')
+
+    timestamp = Column(BIGINT(unsigned=True), nullable=False, default='1')
+
+    minimum = Column(NUMERIC(40, 10), nullable=False, default='0')
+
+    maximum = Column(NUMERIC(40, 10), nullable=False, default='0')
+
+    total = Column(NUMERIC(40, 10), nullable=False, default='0')
+
+    count = Column(BIGINT(unsigned=True), nullable=False, default='0')
+
+    last = Column(NUMERIC(40, 10), nullable=False, default='0')
+
+    last_timestamp = Column(
+        BIGINT(unsigned=True), nullable=False, default='1')
+
+    # Use cascade='delete,all' to propagate the deletion of a
+    # DataPoint onto its DataRollup
+    datapoint = relationship(
+        DataPoint,
+        backref=backref(
+            'data_rollup', uselist=True, cascade='delete,all'))
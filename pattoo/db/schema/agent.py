@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Agent as AgentModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 
 
@@ -47,3 +48,7 @@ class Agent(SQLAlchemyObjectType, AgentAttribute):
 
         model = AgentModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_pair_xlate_group = loader.resolver(AgentModel.pair_xlate_group)
@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import AgentXlate as AgentXlateModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 
 
@@ -43,3 +44,7 @@ class AgentXlate(SQLAlchemyObjectType, AgentXlateAttribute):
 
         model = AgentXlateModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_language = loader.resolver(AgentXlateModel.language)
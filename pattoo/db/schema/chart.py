@@ -7,6 +7,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 # pattoo imports
 from pattoo.db import db
 from pattoo.db.models import Chart as ChartModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 from pattoo_shared.constants import DATA_INT
 
@@ -42,6 +43,7 @@ class Chart(SQLAlchemyObjectType, ChartAttribute):
 
         model = ChartModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
 
 
 class CreateChartInput(graphene.InputObjectType, ChartAttribute):
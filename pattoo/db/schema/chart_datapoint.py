@@ -7,6 +7,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 # pattoo imports
 from pattoo.db import db
 from pattoo.db.models import ChartDataPoint as ChartDataPointModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 from pattoo_shared.constants import DATA_INT
 
@@ -40,6 +41,11 @@ class ChartDataPoint(SQLAlchemyObjectType, ChartDataPointAttribute):
 
         model = ChartDataPointModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_datapoint = loader.resolver(ChartDataPointModel.datapoint)
+    resolve_chart = loader.resolver(ChartDataPointModel.chart)
 
 
 class CreateChartDataPointInput(
@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Data as DataModel
+from pattoo.db.schema import loader
 
 
 class DataAttribute():
@@ -34,3 +35,7 @@ class Data(SQLAlchemyObjectType, DataAttribute):
 
         model = DataModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_datapoint = loader.resolver(DataModel.datapoint)
@@ -6,7 +6,11 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import DataPoint as DataPointModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
+from pattoo.db.table import datapoint
+from pattoo.downsample import downsample
+from pattoo import uri
 
 
 class DataPointAttribute():
@@ -42,11 +46,57 @@ Timestamp when the Data table was last updated for this datapoint.'''))
         description='True if enabled.')
 
 
+class DataPointValue(graphene.ObjectType):
+    """A value of a DataPoint time series."""
+
+    timestamp = graphene.String(
+        description='Data collection timestamp.')
+
+    value = graphene.Float(
+        description='Data value. Null if no data was collected.')
+
+
 class DataPoint(SQLAlchemyObjectType, DataPointAttribute):
     """DataPoint node."""
 
+    series = graphene.List(
+        DataPointValue,
+        secondsago=graphene.Int(
+            description='Start of the time series in seconds ago.'),
+        points=graphene.Int(
+            description='Maximum number of values to return.'),
+        mode=graphene.String(
+            description='Downsampling mode (avg, min, max, lttb).'),
+        description='Time series of DataPoint values.')
+
     class Meta:
         """Define the metadata."""
 
         model = DataPointModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_agent = loader.resolver(DataPointModel.agent)
+
+    def resolve_series(self, info, secondsago=None, points=None, mode=None):
+        """Resolve the time series of the DataPoint.
+
+        Args:
+            info: GraphQL ResolveInfo object
+            secondsago: Start of the time series in seconds ago
+            points: Maximum number of values to return
+            mode: Downsampling mode
+
+        Returns:
+            result: List of {'timestamp': timestamp, 'value': value} dicts
+
+        """
+        # Get the data ending at the last_timestamp of the DataPoint
+        ts_start = uri.timestamp_start(self.polling_interval, secondsago)
+        values = datapoint.series(
+            {self.idx_datapoint: self}, {self.idx_datapoint: ts_start},
+            resolution=uri.resolution(secondsago, points))
+        result = downsample(
+            values[self.idx_datapoint], points=points, mode=mode)
+        return result
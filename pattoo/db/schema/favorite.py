@@ -7,6 +7,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 # pattoo imports
 from pattoo.db import db
 from pattoo.db.models import Favorite as FavoriteModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 from pattoo_shared.constants import DATA_INT
 
@@ -43,6 +44,11 @@ class Favorite(SQLAlchemyObjectType, FavoriteAttribute):
 
         model = FavoriteModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_user = loader.resolver(FavoriteModel.user)
+    resolve_chart = loader.resolver(FavoriteModel.chart)
 
 
 class CreateFavoriteInput(graphene.InputObjectType, FavoriteAttribute):
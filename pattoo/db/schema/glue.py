@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Glue as GlueModel
+from pattoo.db.schema import loader
 
 
 class GlueAttribute():
@@ -31,3 +32,8 @@ class Glue(SQLAlchemyObjectType, GlueAttribute):
 
         model = GlueModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_datapoint = loader.resolver(GlueModel.datapoint)
+    resolve_pair = loader.resolver(GlueModel.pair)
@@ -0,0 +1,140 @@
+"""pattoo ORM Schema relationship loaders.
+
+Relationships are normally loaded one row at a time. The loaders here get
+the relationship of all the rows at the same level of a GraphQL result with
+a single query. A new set of loaders is used for each request.
+
+"""
+
+# PIP3 imports
+from promise import Promise
+from promise.dataloader import DataLoader
+from sqlalchemy.orm.attributes import set_committed_value
+from graphene_sqlalchemy.fields import BatchSQLAlchemyConnectionField
+
+
+class RelationshipLoader(DataLoader):
+    """Load a relationship of many rows with a single query."""
+
+    def __init__(self, relationship):
+        """Initialize the class.
+
+        Args:
+            relationship: SQLAlchemy RelationshipProperty
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        DataLoader.__init__(self)
+        self.relationship = relationship
+
+    def batch_load_fn(self, rows):
+        """Load the relationship of many rows.
+
+        Args:
+            rows: List of database model instances
+
+        Returns:
+            result: Promise of a list of the related instance, or list of
+                instances, of each row
+
+        """
+        # Initialize key variables
+        relationship = self.relationship
+        ((local, remote),) = relationship.local_remote_pairs
+        local_key = relationship.parent.get_property_by_column(local).key
+        remote_key = relationship.mapper.get_property_by_column(remote).key
+        values = set([getattr(row, local_key) for row in rows]) - {None}
+        found = {}
+        result = []
+
+        # Get the related instances of all the rows
+        if bool(values) is True:
+            query = relationship.mapper.class_.query.filter(
+                remote.in_(values))
+            for item in query:
+                found.setdefault(getattr(item, remote_key), []).append(item)
+
+        # Save the related instances so they aren't loaded again
+        for row in rows:
+            items = found.get(getattr(row, local_key), [])
+            if relationship.uselist is True:
+                value = items
+            else:
+                value = items[0] if bool(items) is True else None
+            set_committed_value(row, relationship.key, value)
+            result.append(value)
+        return Promise.resolve(result)
+
+
+def loader(info, relationship):
+    """Get the loader of a relationship for the current request.
+
+    Args:
+        info: GraphQL ResolveInfo object
+        relationship: SQLAlchemy RelationshipProperty
+
+    Returns:
+        result: RelationshipLoader
+
+    """
+    # Loaders are kept in the context of the request. Relationships are
+    # loaded one row at a time without one.
+    context = info.context
+    loaders = getattr(context, 'loaders', None)
+    if loaders is None:
+        loaders = {}
+        if context is not None:
+            setattr(context, 'loaders', loaders)
+
+    # Get the loader
+    result = loaders.get(relationship)
+    if result is None:
+        result = RelationshipLoader(relationship)
+        loaders[relationship] = result
+    return result
+
+
+def resolver(relationship):
+    """Create a resolver that loads a relationship in batches.
+
+    Args:
+        relationship: Model relationship attribute, such as
+            pattoo.db.models.DataPoint.agent
+
+    Returns:
+        resolve: Resolver function
+
+    """
+    # Initialize key variables
+    relationship = getattr(relationship, 'property', relationship)
+
+    def resolve(root, info, **kwargs):
+        """Resolve the relationship."""
+        return loader(info, relationship).load(root)
+
+    return resolve
+
+
+def connection_field(relationship, registry, **field_kwargs):
+    """Create the connection field of a relationship loaded in batches.
+
+    Used as the connection_field_factory of SQLAlchemyObjectType classes.
+
+    Args:
+        relationship: SQLAlchemy RelationshipProperty
+        registry: graphene_sqlalchemy Registry
+        field_kwargs: Keyword arguments of the field
+
+    Returns:
+        result: Connection field
+
+    """
+    # Create
+    model_type = registry.get_type_for_model(relationship.mapper.entity)
+    result = BatchSQLAlchemyConnectionField(
+        model_type.connection, resolver=resolver(relationship),
+        **field_kwargs)
+    return result
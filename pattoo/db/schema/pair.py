@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Pair as PairModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 
 
@@ -37,3 +38,4 @@ class Pair(SQLAlchemyObjectType, PairAttribute):
 
         model = PairModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import PairXlate as PairXlateModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 
 
@@ -52,3 +53,8 @@ class PairXlate(SQLAlchemyObjectType, PairXlateAttribute):
 
         model = PairXlateModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
+
+    # Load relationships of many rows with a single query
+    resolve_pair_xlate_group = loader.resolver(PairXlateModel.pair_xlate_group)
+    resolve_language = loader.resolver(PairXlateModel.language)
@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import PairXlateGroup as PairXlateGroupModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 
 
@@ -36,3 +37,4 @@ class PairXlateGroup(SQLAlchemyObjectType, PairXlateGroupAttribute):
 
         model = PairXlateGroupModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
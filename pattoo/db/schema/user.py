@@ -7,6 +7,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 # pattoo imports
 from pattoo.db import db
 from pattoo.db.models import User as UserModel
+from pattoo.db.schema import loader
 from pattoo.db.schema import utils
 from pattoo_shared.constants import DATA_INT
 
@@ -50,6 +51,7 @@ class User(SQLAlchemyObjectType, UserAttribute):
 
         model = UserModel
         interfaces = (graphene.relay.Node,)
+        connection_field_factory = loader.connection_field
 
 
 class CreateUserInput(graphene.InputObjectType, UserAttribute):
@@ -16,14 +16,18 @@ Based on the pages at:
     https://github.com/graphql-python/graphene-sqlalchemy/issues/27#issuecomment-361978832
 
 """
+# Standard imports
+import json
+
 # PIP3 imports
 import graphene
 from graphene import relay
 from graphene.utils.str_converters import to_snake_case
 from graphene.relay.connection import PageInfo
 from graphene_sqlalchemy import SQLAlchemyConnectionField
-from graphql_relay.connection.arrayconnection import connection_from_list_slice
-from sqlalchemy import desc, asc
+from graphql import GraphQLError
+from graphql_relay.utils import base64, unbase64
+from sqlalchemy import desc, asc, and_, or_, inspect
 
 # Import schemas
 from pattoo.db.schema.agent import Agent
@@ -51,12 +55,46 @@ from pattoo.db.schema import user as user_
 #
 ###############################################################################
 
+class CountableConnection(relay.Connection):
+    """Relay connection with an optional count of all results.
+
+    The count is only made if the client asks for the totalCount field.
+
+    """
+
+    class Meta:
+        """Define the metadata."""
+
+        abstract = True
+
+    total_count = graphene.Int(
+        description='Number of results on all pages.')
+
+    def resolve_total_count(self, info):
+        """Count the results of the query without paging.
+
+        Args:
+            info: GraphQL ResolveInfo object
+
+        Returns:
+            result: Count
+
+        """
+        # Count
+        result = self.query.order_by(None).count()
+        return result
+
+
 class InstrumentedQuery(SQLAlchemyConnectionField):
     """Class to allow GraphQL filtering by SQlAlchemycolumn name.
 
     Add filtering support:
     https://github.com/graphql-python/graphene-sqlalchemy/issues/27#issuecomment-361978832
 
+    Results are paged in SQL. The first, after, last and before arguments
+    are converted to conditions on the columns used to sort the results,
+    ending with the primary key, and a LIMIT.
+
     """
 
     def __init__(self, type_, **kwargs):
@@ -67,11 +105,18 @@ class InstrumentedQuery(SQLAlchemyConnectionField):
                 field_type = value.type
                 if isinstance(field_type, graphene.NonNull):
                     field_type = field_type.of_type
+
+                # Lists, such as DataPoint.series, aren't table columns
+                if isinstance(field_type, graphene.List):
+                    continue
                 self.query_args[key] = field_type()
         args = kwargs.pop('args', dict())
         args.update(self.query_args)
         args['sort_by'] = graphene.List(graphene.String, required=False)
-        SQLAlchemyConnectionField.__init__(self, type_, args=args, **kwargs)
+        connection = CountableConnection.create_type(
+            '{}CountableConnection'.format(type_.__name__), node=type_)
+        SQLAlchemyConnectionField.__init__(
+            self, connection, args=args, **kwargs)
 
     def get_query(self, model, info, **args):
         """Replace the get_query method."""
@@ -83,36 +128,183 @@ class InstrumentedQuery(SQLAlchemyConnectionField):
             v, str) else v) for k, v in query_filters.items()}
 
         query = model.query.filter_by(**query_filters)
-        if 'sort_by' in args:
-            criteria = [self.get_order_by_criterion(
-                model, *arg.split(' ')) for arg in args['sort_by']]
-            query = query.order_by(*criteria)
+        criteria = [self.get_order_by_criterion(
+            column, direction) for column, direction in self.get_order_by(
+                model, args.get('sort_by'))]
+        query = query.order_by(*criteria)
         return query
 
     def connection_resolver(
             self, resolver, connection, model, root, info, **args):
         query = resolver(
             root, info, **args) or self.get_query(model, info, **args)
-        count = query.count()
-        connection = connection_from_list_slice(
-            query,
-            args,
-            slice_start=0,
-            list_length=count,
-            list_slice_length=count,
-            connection_type=connection,
-            pageinfo_type=PageInfo,
-            edge_type=connection.Edge,
-        )
-        connection.iterable = query
-        connection.length = count
-        return connection
+        order_by = self.get_order_by(model, args.get('sort_by'))
+        first = args.get('first')
+        last = args.get('last')
+        has_next_page = False
+        has_previous_page = False
+        for value in [first, last]:
+            if value is not None and value < 0:
+                raise GraphQLError(
+                    'The first and last arguments must not be negative')
+
+        # Start after and end before the rows of the cursors
+        _query = query
+        for cursor, reverse in [
+                (args.get('after'), False), (args.get('before'), True)]:
+            if cursor is not None:
+                _query = _query.filter(
+                    self.get_keyset_criterion(
+                        order_by, self.get_cursor_values(
+                            model, order_by, cursor), reverse=reverse))
+
+        # Get the first rows, then the last of those. Get one extra row to
+        # find out whether there is another page.
+        if first is not None:
+            rows = _query.limit(first + 1).all()
+            has_next_page = len(rows) > first
+            rows = rows[:first]
+            if last is not None:
+                has_previous_page = len(rows) > last
+                rows = rows[len(rows) - min(len(rows), last):]
+        elif last is not None:
+            rows = _query.order_by(None).order_by(*[
+                self.get_order_by_criterion(
+                    column, 'desc' if direction == 'asc' else 'asc')
+                for column, direction in order_by]).limit(last + 1).all()
+            has_previous_page = len(rows) > last
+            rows = list(reversed(rows[:last]))
+        else:
+            rows = _query.all()
+
+        # Create the connection
+        edges = [
+            connection.Edge(node=row, cursor=self.get_cursor(row))
+            for row in rows]
+        result = connection(
+            edges=edges,
+            page_info=PageInfo(
+                start_cursor=edges[0].cursor if bool(edges) else None,
+                end_cursor=edges[-1].cursor if bool(edges) else None,
+                has_previous_page=has_previous_page,
+                has_next_page=has_next_page))
+        result.iterable = rows
+        result.query = query
+        return result
+
+    @staticmethod
+    def get_order_by(model, sort_by=None):
+        """Get the columns used to sort the results.
+
+        Args:
+            model: Database model
+            sort_by: List of 'column [asc|desc]' strings
+
+        Returns:
+            result: List of (column, direction) tuples ending with the
+                columns of the primary key
+
+        """
+        # Initialize key variables
+        result = []
+        mapper = inspect(model)
+
+        # Sort by the requested columns, then the primary key
+        for arg in sort_by or []:
+            (name, direction) = (arg.split(' ') + ['asc'])[:2]
+            result.append(
+                (getattr(model, to_snake_case(name)), direction.lower()))
+        for column in mapper.primary_key:
+            result.append(
+                (getattr(model, mapper.get_property_by_column(column).key),
+                 'asc'))
+        return result
 
     @staticmethod
-    def get_order_by_criterion(model, name, direction='asc'):
+    def get_order_by_criterion(column, direction='asc'):
         order_functions = {'asc': asc, 'desc': desc}
-        return order_functions[
-            direction.lower()](getattr(model, to_snake_case(name)))
+        return order_functions[direction.lower()](column)
+
+    @staticmethod
+    def get_keyset_criterion(order_by, values, reverse=False):
+        """Get the criterion for rows after those with the given values.
+
+        Args:
+            order_by: List of (column, direction) tuples used to sort
+            values: List of values of the columns in order_by
+            reverse: Get rows before those with the values if True
+
+        Returns:
+            result: SQLAlchemy criterion
+
+        """
+        # Rows are after if they are equal in the preceding columns, but
+        # after in the next one.
+        criteria = []
+        for position, (column, direction) in enumerate(order_by):
+            if (direction == 'asc') is not reverse:
+                after = column > values[position]
+            else:
+                after = column < values[position]
+            criteria.append(and_(*[
+                _column == values[_position]
+                for _position, (_column, _) in enumerate(
+                    order_by[:position])] + [after]))
+        result = or_(*criteria)
+        return result
+
+    @staticmethod
+    def get_cursor(row):
+        """Create the cursor of a row from its primary key.
+
+        Args:
+            row: Database model instance
+
+        Returns:
+            result: Cursor
+
+        """
+        # Encode
+        result = base64(
+            'keyset:{}'.format(json.dumps(list(inspect(row).identity))))
+        return result
+
+    @staticmethod
+    def get_cursor_values(model, order_by, cursor):
+        """Get the values of the sort columns of the row of a cursor.
+
+        Args:
+            model: Database model
+            order_by: List of (column, direction) tuples used to sort
+            cursor: Cursor
+
+        Returns:
+            result: List of values of the columns in order_by
+
+        """
+        # Get the primary key
+        try:
+            (prefix, identity) = unbase64(cursor).split(':', 1)
+            identity = json.loads(identity)
+        except:
+            prefix = None
+        if prefix != 'keyset' or isinstance(identity, list) is False or (
+                len(identity) != len(inspect(model).primary_key)):
+            raise GraphQLError('Invalid cursor "{}"'.format(cursor))
+
+        # Only the primary key is needed if the results aren't sorted by
+        # other columns
+        columns = [column for column, _ in order_by]
+        if len(columns) == len(identity):
+            return identity
+        result = model.query.with_entities(*columns).filter(
+            and_(*[
+                column == identity[position] for position, column in
+                enumerate(columns[len(columns) - len(identity):])])).first()
+        if result is None:
+            raise GraphQLError(
+                'The row of cursor "{}" no longer exists'.format(cursor))
+        return list(result)
 
 ###############################################################################
 # Map database table columns to igraphql attributes
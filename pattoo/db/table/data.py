@@ -2,44 +2,63 @@
 """Inserts various database values required during ingest."""
 
 # Standard libraries
+import os
+import io
+import csv
+import tempfile
 from operator import attrgetter
+from contextlib import contextmanager
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, case, text
 
 # Import project libraries
-from pattoo.db import db
+from pattoo.db import db, misc
 from pattoo.db.models import Data, DataPoint
+from pattoo.db.table import rollup
+from pattoo.data import chunks
+from pattoo.constants import DB_CHUNK_SIZE
+from pattoo.configuration import ConfigIngester as Config
 
+# Insert options of the ingester configuration. Read once per process.
+_OPTIONS = {}
 
-def insert_rows(items):
+
+def insert_rows(items, chunk_size=None, load_data_infile=None):
     """Insert timeseries data.
 
     Args:
         items: List of IDXTimestampValue objects
+        chunk_size: Number of rows to insert per statement. Defaults to the
+            configured insert_chunk_size.
+        load_data_infile: Use "LOAD DATA LOCAL INFILE" if there are more than
+            chunk_size rows to insert. Defaults to the configured value.
 
     Returns:
-        result: DataPoint.checksum value
+        result: Number of rows inserted
 
     """
     # Initialize key variables
     _rows = []
     last_timestamps = {}
     polling_intervals = {}
+    disabled = set()
 
     # Fail safe checks
     if bool(items) is False:
-        return
+        return 0
+
+    # Get configuration if required
+    if chunk_size is None:
+        chunk_size = _options()['insert_chunk_size']
+    if load_data_infile is None:
+        load_data_infile = _options()['load_data_infile']
 
     # Update the data
     for item in sorted(items, key=attrgetter('timestamp')):
         # Insert data
         value = round(item.value, 10)
-        _rows.append(
-            Data(idx_datapoint=item.idx_datapoint,
-                 timestamp=item.timestamp,
-                 value=value)
-        )
+        _rows.append((item.idx_datapoint, item.timestamp, value))
 
         # Get the most recent timestamp for each idx_datapoint
         if item.idx_datapoint in last_timestamps:
@@ -49,20 +68,124 @@ def insert_rows(items):
             last_timestamps[item.idx_datapoint] = item.timestamp
         polling_intervals[item.idx_datapoint] = item.polling_interval
 
-    # Update the last_timestamp
-    for idx_datapoint, timestamp in last_timestamps.items():
-        with db.db_modify(20047, die=False) as session:
-            session.query(DataPoint).filter(
-                and_(DataPoint.idx_datapoint == idx_datapoint,
-                     DataPoint.enabled == 1)).update(
-                         {'last_timestamp': timestamp,
-                          'polling_interval': int(
-                            polling_intervals[idx_datapoint])}
-                     )
-
-    # Update after updating the last timestamp. Helps to prevent
+    # Update the last_timestamp, insert the data and update the rollups in
+    # the same transaction. A failure rolls back all of them, which prevents
     # 'Duplicate entry' errors in the event you need to re-run the ingester
     # after a previous crash.
-    if bool(_rows) is True:
-        with db.db_modify(20012, die=True) as session:
-            session.add_all(_rows)
+    with db.db_modify(20012, die=True) as session:
+        # Update the last_timestamp with one statement per chunk
+        for chunk in chunks(sorted(last_timestamps.keys()), DB_CHUNK_SIZE):
+            count = session.query(DataPoint).filter(
+                and_(DataPoint.idx_datapoint.in_(chunk),
+                     DataPoint.enabled == 1)).update(
+                         {'last_timestamp': case(
+                             {_: last_timestamps[_] for _ in chunk},
+                             value=DataPoint.idx_datapoint),
+                          'polling_interval': case(
+                              {_: int(polling_intervals[_]) for _ in chunk},
+                              value=DataPoint.idx_datapoint)},
+                         synchronize_session=False)
+
+            # Not all rows were updated. Find the disabled DataPoints
+            if count < len(chunk):
+                rows = session.query(DataPoint.idx_datapoint).filter(
+                    and_(DataPoint.idx_datapoint.in_(chunk),
+                         DataPoint.enabled == 0))
+                disabled.update([row.idx_datapoint for row in rows])
+
+        # Insert the data
+        if bool(load_data_infile) is True and len(_rows) > chunk_size:
+            # Very large backfills
+            with _infile(_rows) as filename:
+                result = session.execute(
+                    text('''\
+LOAD DATA LOCAL INFILE :filename INTO TABLE {} \
+FIELDS TERMINATED BY ',' LINES TERMINATED BY '\\n' \
+(idx_datapoint, timestamp, value)'''.format(Data.__tablename__)),
+                    {'filename': filename})
+
+            # LOCAL files skip duplicate rows instead of failing. Fail like
+            # the other inserts so that the rollups only include rows
+            # that were inserted.
+            if result.rowcount != len(_rows):
+                raise RuntimeError('''\
+Duplicate entry. {} of {} rows are already in the {} table\
+'''.format(len(_rows) - result.rowcount, len(_rows), Data.__tablename__))
+        else:
+            # Use SQLAlchemy Core executemany which bypasses the creation of
+            # ORM objects.
+            for chunk in chunks(_rows, chunk_size):
+                session.execute(
+                    Data.__table__.insert(),
+                    [{'idx_datapoint': idx_datapoint,
+                      'timestamp': timestamp,
+                      'value': value}
+                     for idx_datapoint, timestamp, value in chunk])
+
+        # Update the rollups
+        rollup.update(session, _rows)
+
+    # Update the checksum cache
+    misc.CACHE.advance(
+        {key: value for key, value in last_timestamps.items()
+         if key not in disabled})
+    misc.CACHE.invalidate(disabled)
+
+    # Return
+    return len(_rows)
+
+
+def _options():
+    """Get the ingester configuration options used by insert_rows.
+
+    The configuration file is only read the first time.
+
+    Args:
+        None
+
+    Returns:
+        _OPTIONS: Dict of option values keyed by option name
+
+    """
+    # Read the configuration
+    if bool(_OPTIONS) is False:
+        config = Config()
+        _OPTIONS['insert_chunk_size'] = config.insert_chunk_size()
+        _OPTIONS['load_data_infile'] = config.load_data_infile()
+    return _OPTIONS
+
+
+@contextmanager
+def _infile(rows):
+    """Create a CSV file of rows for use with "LOAD DATA LOCAL INFILE".
+
+    The file is created in memory where the operating system supports it.
+
+    Args:
+        rows: List of tuples
+
+    Returns:
+        filename: Name of the file
+
+    """
+    # Create the CSV in memory
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows(rows)
+
+    # Create the file. Use an anonymous in memory file on Linux.
+    in_memory = hasattr(os, 'memfd_create')
+    if in_memory is True:
+        descriptor = os.memfd_create(Data.__tablename__)
+        filename = '/proc/self/fd/{}'.format(descriptor)
+    else:
+        (descriptor, filename) = tempfile.mkstemp(suffix='.csv')
+
+    try:
+        with open(descriptor, 'w', closefd=False) as f_handle:
+            f_handle.write(buffer.getvalue())
+        yield filename
+    finally:
+        os.close(descriptor)
+        if in_memory is False:
+            os.remove(filename)
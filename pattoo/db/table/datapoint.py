@@ -6,7 +6,8 @@ import random
 # PIP3 imports
 import numpy as np
 from sqlalchemy.orm.exc import NoResultFound, MultipleResultsFound
-from sqlalchemy import and_
+from sqlalchemy import and_, case
+from sqlalchemy.dialects.mysql import insert
 
 from pattoo_shared import times
 from pattoo_shared import data as data_
@@ -15,11 +16,15 @@ from pattoo_shared.constants import (
 
 
 # Import project libraries
-from pattoo.db import db
+from pattoo.db import db, misc
 from pattoo.db.models import DataPoint as _DataPoint
-from pattoo.db.models import Data
+from pattoo.db.models import (
+    Agent, Data, DataRollup, Chart, ChartDataPoint)
 from pattoo.db.table import agent, chart, chart_datapoint
-from pattoo.constants import DbRowChart, DbRowChartDataPoint
+from pattoo.data import chunks
+from pattoo.constants import (
+    DbRowChart, DbRowChartDataPoint, ChecksumLookup, DB_CHUNK_SIZE,
+    ROLLUP_RESOLUTIONS)
 
 
 class DataPoint():
@@ -169,93 +174,357 @@ class DataPoint():
         value = self._result['polling_interval']
         return value
 
-    def data(self, ts_start, ts_stop):
+    def data(self, ts_start, ts_stop, resolution=None):
         """Create list of dicts of counter values retrieved from database.
 
         Args:
             ts_start: Start time for query
             ts_stop: Stop time for query
+            resolution: Interval between values in milliseconds required by
+                the caller. Values are read from the coarsest rollup that
+                meets it. The Data table is used if None
 
         Returns:
             result: List of key-value pair dicts
 
         """
         # Initialize key variables
-        data_type = self.data_type()
         _pi = self.polling_interval()
-        places = 10
         result = []
 
         # Return nothing if the DataPoint does not exist
         if self.exists() is False:
             return result
 
+        # Use a rollup if possible
+        _resolution = rollup_resolution(_pi, resolution)
+        if _resolution is not None:
+            _pi = _resolution
+
         # Normalize timestamp to match the start of the nones array. If not,
         # we could get the starting timestamp of the result to have a "None"
         # value
         ts_start = times.normalized_timestamp(_pi, timestamp=ts_start)
 
-        # Make sure we have entries for entire time range
-        timestamps = times.timestamps(ts_start, ts_stop, _pi)
-        nones = {_key: None for _key in timestamps}
-
         # Get data from database
         with db.db_query(20092) as session:
-            rows = session.query(Data.timestamp, Data.value).filter(and_(
-                Data.timestamp <= ts_stop, Data.timestamp >= ts_start,
-                Data.idx_datapoint == self._idx_datapoint)).order_by(
-                    Data.timestamp).all()
+            if _resolution is None:
+                rows = session.query(Data.timestamp, Data.value).filter(and_(
+                    Data.timestamp <= ts_stop, Data.timestamp >= ts_start,
+                    Data.idx_datapoint == self._idx_datapoint)).order_by(
+                        Data.timestamp).all()
+            else:
+                counters = []
+                if self.data_type() in [DATA_COUNT64, DATA_COUNT]:
+                    counters.append(self._idx_datapoint)
+                rows = session.query(
+                    DataRollup.timestamp, _rollup_value(counters)).filter(
+                        and_(DataRollup.timestamp <= ts_stop,
+                             DataRollup.timestamp >= ts_start,
+                             DataRollup.resolution == _resolution,
+                             DataRollup.idx_datapoint == self._idx_datapoint
+                             )).order_by(DataRollup.timestamp).all()
+
+        # Return
+        result = _values(rows, self.data_type(), _pi, ts_start, ts_stop)
+        return result
 
-        # Put values into a dict for ease of processing
-        for row in rows:
-            # Find the first timestamp in the sorted list that is greater than
-            # that found in the database
-            timestamp = times.normalized_timestamp(_pi, row.timestamp)
-            rounded_value = round(float(row.value), places)
-            nones[timestamp] = rounded_value
 
-        if data_type in [DATA_INT, DATA_FLOAT]:
-            # Process non-counter values
-            result = _response(nones)
+def metadata(idx_datapoints):
+    """Get the DataPoint table rows of many DataPoints in a single query.
 
-        elif data_type in [DATA_COUNT64, DATA_COUNT] and len(rows) > 1:
-            # Process counter values by calculating the difference between
-            # successive values
-            result = _counters(nones, _pi, places)
+    Args:
+        idx_datapoints: List of DataPoint.idx_datapoint values
 
+    Returns:
+        result: Dict of rows keyed by idx_datapoint. Rows have
+            idx_datapoint, data_type, polling_interval and last_timestamp
+            attributes
+
+    """
+    # Initialize key variables
+    result = {}
+    if bool(idx_datapoints) is False:
         return result
 
+    # Get the result
+    with db.db_query(20185) as session:
+        rows = session.query(
+            _DataPoint.idx_datapoint, _DataPoint.data_type,
+            _DataPoint.polling_interval, _DataPoint.last_timestamp).filter(
+                _DataPoint.idx_datapoint.in_(idx_datapoints)).all()
+    for row in rows:
+        result[row.idx_datapoint] = row
+    return result
 
-def _counters(nones, polling_interval, places):
-    """Create list of dicts of counter values retrieved from database.
+
+def series(rows, ts_starts, resolution=None):
+    """Get the data of many DataPoints in as few queries as possible.
+
+    Args:
+        rows: Dict of rows from metadata() keyed by idx_datapoint
+        ts_starts: Dict of start times keyed by idx_datapoint. The data of
+            each DataPoint ends at its last_timestamp
+        resolution: Interval between values in milliseconds required by the
+            caller. The values of each DataPoint are read from the coarsest
+            rollup that meets it. The Data table is used if None
+
+    Returns:
+        result: Dict of lists of key-value pair dicts keyed by idx_datapoint
+
+    """
+    # Initialize key variables
+    result = {}
+    ranges = {}
+    intervals = {}
+
+    # Normalize timestamps to match the start of the nones array
+    for _idx_datapoint, row in rows.items():
+        _resolution = rollup_resolution(row.polling_interval, resolution)
+        _pi = row.polling_interval if _resolution is None else _resolution
+        ranges[_idx_datapoint] = (
+            times.normalized_timestamp(
+                _pi, timestamp=ts_starts[_idx_datapoint]),
+            row.last_timestamp)
+        intervals[_idx_datapoint] = _pi
+
+    # Create the result
+    found = fetch(rows, ranges, resolution=resolution)
+    for _idx_datapoint, row in rows.items():
+        (ts_start, ts_stop) = ranges[_idx_datapoint]
+        (row_timestamps, row_values) = found[_idx_datapoint]
+        result[_idx_datapoint] = values(
+            row_timestamps, row_values, row.data_type,
+            intervals[_idx_datapoint], ts_start, ts_stop)
+    return result
+
+
+def fetch(rows, ranges, resolution=None):
+    """Get the database rows of many DataPoints in as few queries as possible.
+
+    Args:
+        rows: Dict of rows from metadata() keyed by idx_datapoint
+        ranges: Dict of (start, stop) tuples of the times of the rows to get
+            keyed by idx_datapoint
+        resolution: Interval between values in milliseconds required by the
+            caller. The rows of each DataPoint are read from the coarsest
+            rollup that meets it. The Data table is used if None
+
+    Returns:
+        result: Dict of (timestamps, values) tuples of numpy arrays sorted
+            by timestamp keyed by idx_datapoint
+
+    """
+    # Initialize key variables
+    result = {}
+    found = {}
+    groups = {}
+
+    # DataPoints are grouped by the resolution of the table they are read
+    # from.
+    for _idx_datapoint, row in rows.items():
+        _resolution = rollup_resolution(row.polling_interval, resolution)
+        groups.setdefault(_resolution, []).append(_idx_datapoint)
+        found[_idx_datapoint] = []
+
+    # Get data from database with one query per group. The range covers all
+    # the DataPoints of the group, rows outside the range of each DataPoint
+    # are ignored.
+    for _resolution, members in sorted(
+            groups.items(), key=lambda _: _[0] or 0):
+        ts_stop = max([ranges[_][1] for _ in members])
+        ts_start = min([ranges[_][0] for _ in members])
+        with db.db_query(20186) as session:
+            if _resolution is None:
+                _rows = session.query(
+                    Data.idx_datapoint, Data.timestamp, Data.value).filter(
+                        and_(Data.timestamp <= ts_stop,
+                             Data.timestamp >= ts_start,
+                             Data.idx_datapoint.in_(members))).order_by(
+                                 Data.idx_datapoint, Data.timestamp).all()
+            else:
+                counters = [
+                    _ for _ in members if rows[_].data_type in [
+                        DATA_COUNT64, DATA_COUNT]]
+                _rows = session.query(
+                    DataRollup.idx_datapoint, DataRollup.timestamp,
+                    _rollup_value(counters)).filter(
+                        and_(DataRollup.timestamp <= ts_stop,
+                             DataRollup.timestamp >= ts_start,
+                             DataRollup.resolution == _resolution,
+                             DataRollup.idx_datapoint.in_(members))).order_by(
+                                 DataRollup.idx_datapoint,
+                                 DataRollup.timestamp).all()
+        for row in _rows:
+            (ts_start, ts_stop) = ranges[row.idx_datapoint]
+            if ts_start <= row.timestamp <= ts_stop:
+                found[row.idx_datapoint].append(row)
+
+    # Convert to arrays
+    for _idx_datapoint, _rows in found.items():
+        result[_idx_datapoint] = _arrays(_rows)
+    return result
+
+
+def rollup_resolution(polling_interval, resolution):
+    """Get the resolution of the rollup to use for a query.
+
+    Args:
+        polling_interval: Polling interval of the DataPoint
+        resolution: Interval between values in milliseconds required by the
+            caller
+
+    Returns:
+        result: The coarsest rollup resolution that is both larger than the
+            polling_interval and no larger than resolution. None if the Data
+            table should be used
+
+    """
+    # Initialize key variables
+    result = None
+    if bool(resolution) is False or bool(polling_interval) is False:
+        return result
+
+    # Find the rollup
+    for _resolution in ROLLUP_RESOLUTIONS:
+        if polling_interval < _resolution <= resolution:
+            result = _resolution
+    return result
+
+
+def _rollup_value(counters):
+    """Get the value of rollup buckets.
+
+    Counters use the last value of each bucket. Other DataPoints use the
+    average of each bucket.
+
+    Args:
+        counters: List of idx_datapoint values of counter DataPoints
+
+    Returns:
+        result: Labeled SQLAlchemy column expression
+
+    """
+    # Initialize key variables
+    average = DataRollup.total / DataRollup.count
+
+    # Return
+    if bool(counters) is False:
+        result = average.label('value')
+    else:
+        result = case(
+            [(DataRollup.idx_datapoint.in_(counters), DataRollup.last)],
+            else_=average).label('value')
+    return result
+
+
+def _values(rows, data_type, polling_interval, ts_start, ts_stop):
+    """Create list of dicts of values retrieved from database.
 
     Args:
-        nones: Dict of values keyed by timestamp
+        rows: Data table rows sorted by timestamp
+        data_type: Type of data
         polling_interval: Polling interval
-        places: Number of places to round values
+        ts_start: Normalized start time
+        ts_stop: Stop time
+
+    Returns:
+        result: List of key-value pair dicts
+
+    """
+    # Return
+    (row_timestamps, row_values) = _arrays(rows)
+    result = values(
+        row_timestamps, row_values, data_type, polling_interval, ts_start,
+        ts_stop)
+    return result
+
+
+def values(row_timestamps, row_values, data_type, polling_interval,
+           ts_start, ts_stop):
+    """Create list of dicts of values from arrays of database rows.
+
+    Args:
+        row_timestamps: numpy array of the timestamps of database rows
+            sorted by timestamp
+        row_values: numpy array of the values of the database rows
+        data_type: Type of data
+        polling_interval: Polling interval
+        ts_start: Normalized start time
+        ts_stop: Stop time
 
     Returns:
         result: List of key-value pair dicts
 
     """
     # Initialize key variables
-    final = {}
+    places = 10
+    result = []
+
+    # Make sure we have entries for entire time range. Absent data is NaN.
+    ts_start = times.normalized_timestamp(polling_interval, ts_start)
+    ts_stop = times.normalized_timestamp(polling_interval, ts_stop)
+    timestamps = np.arange(
+        ts_start, ts_stop + polling_interval, polling_interval,
+        dtype=np.int64)
+    _values = np.full(len(timestamps), np.nan)
+
+    # Put values at the position of their normalized timestamps
+    if bool(len(row_timestamps)) is True:
+        positions = (row_timestamps // polling_interval) - (
+            ts_start // polling_interval)
+
+        # Rows are sorted by timestamp. Use the last value found in each
+        # polling interval.
+        keep = np.append(positions[1:] != positions[:-1], True) & (
+            positions >= 0) & (positions < len(_values))
+        _values[positions[keep]] = _round(row_values[keep], places)
+
+    if data_type in [DATA_INT, DATA_FLOAT]:
+        # Process non-counter values
+        result = _response(timestamps, _values)
+
+    elif data_type in [DATA_COUNT64, DATA_COUNT] and len(row_timestamps) > 1:
+        # Process counter values by calculating the difference between
+        # successive values
+        result = _counters(timestamps, _values, polling_interval, places)
+
+    return result
+
+
+def _arrays(rows):
+    """Convert database rows to numpy arrays.
+
+    Args:
+        rows: Data table rows sorted by timestamp
+
+    Returns:
+        result: Tuple of (timestamps, values) numpy arrays
 
-    # Create list of timestamps and values
-    timestamps = []
-    values = []
-    for timestamp, value in sorted(nones.items()):
-        timestamps.append(timestamp)
-        values.append(value)
+    """
+    # Return
+    result = (
+        np.fromiter(
+            (row.timestamp for row in rows), dtype=np.int64,
+            count=len(rows)),
+        np.fromiter(
+            (row.value for row in rows), dtype=float, count=len(rows)))
+    return result
+
+
+def _counters(timestamps, values, polling_interval, places):
+    """Create list of dicts of counter values retrieved from database.
 
-    # Remove first timestamp value as it isn't necessary
-    # after deltas are created
-    timestamps = timestamps[1:]
+    Args:
+        timestamps: numpy array of timestamps
+        values: numpy array of counter values. Absent data is NaN
+        polling_interval: Polling interval
+        places: Number of places to round values
 
-    # Create an array for ease of readability.
-    # Convert to None values to nans to make deltas without errors
-    values_array = np.array(values).astype(np.float)
+    Returns:
+        result: List of key-value pair dicts
 
+    """
     '''
     Sometimes we'll get unsigned counter values in the database that roll over
     to zero. This result in a negative delta.
@@ -266,35 +535,60 @@ def _counters(nones, polling_interval, places):
     (value.current + integer.type.max - value.previous)
 
     '''
-    deltas = np.abs(np.diff(values_array))
-    for key, delta in enumerate(deltas):
-        # Null values means absent data and therefore no change
-        if np.isnan(delta):
-            tps = None
-        else:
-            # Calculate the value as a transaction per second value
-            tps = round((delta / polling_interval) * 1000, places)
-        final[timestamps[key]] = tps
-
-    # Return the result
-    result = _response(final)
+    deltas = np.abs(np.diff(values))
+
+    # Calculate the value as a transaction per second value. Absent data
+    # means no change and produces NaN. Deltas are numpy values, which have
+    # always been rounded by numpy.
+    tps = np.round((deltas / polling_interval) * 1000, places)
+
+    # Return the result. The first timestamp isn't necessary after deltas
+    # are created
+    result = _response(timestamps[1:], tps)
+    return result
+
+
+def _round(values, places):
+    """Round the values of an array.
+
+    np.round() scales values before rounding them, which sometimes gives
+    different results to round(). Data table values have always been
+    rounded with round().
+
+    Args:
+        values: numpy array of values. NaN values stay NaN
+        places: Number of places to round values
+
+    Returns:
+        result: numpy array of rounded values
+
+    """
+    # Return
+    result = np.fromiter(
+        (round(value, places) for value in values.tolist()),
+        dtype=float, count=len(values))
     return result
 
 
-def _response(nones):
+def _response(timestamps, values):
     """Create list of dicts.
 
     Args:
-        nones: Dict of values keyed by timestamp
+        timestamps: numpy array of timestamps
+        values: numpy array of values. NaN values are returned as None
 
     Returns:
         result: List of key-value pair dicts
 
     """
+    # Convert to python types
+    _values = values.astype(object)
+    _values[np.isnan(values)] = None
+
     # Return a list of dicts
-    result = []
-    for timestamp, value in sorted(nones.items()):
-        result.append({'timestamp': timestamp, 'value': value})
+    result = [
+        {'timestamp': timestamp, 'value': value}
+        for timestamp, value in zip(timestamps.tolist(), _values.tolist())]
     return result
 
 
@@ -338,10 +632,175 @@ def idx_datapoint(pattoo_db_record):
             DbRowChartDataPoint(
                 idx_chart=idx_chart, idx_datapoint=_idx_datapoint, enabled=1))
 
+        # Update the checksum cache
+        misc.CACHE.add(
+            agent_id, checksum, ChecksumLookup(
+                idx_datapoint=_idx_datapoint,
+                polling_interval=int(polling_interval),
+                last_timestamp=1))
+
+    else:
+        # The cached checksums for the agent are out of date
+        misc.CACHE.discard(agent_id)
+
     # Return
     return _idx_datapoint
 
 
+def idx_datapoints(pattoo_db_records):
+    """Get the db DataPoint.idx_datapoint values for PattooDBrecord objects.
+
+    DataPoint, Chart and ChartDataPoint table entries are created in bulk for
+    checksums not already in the database.
+
+    Args:
+        pattoo_db_records: List of PattooDBrecord objects
+
+    Returns:
+        result: Dict of DataPoint.idx_datapoint values keyed by checksum
+
+    """
+    # Initialize key variables
+    records = {}
+    idx_agents = {}
+    existing = {}
+    created = {}
+
+    # Remove duplicates
+    for pdbr in pattoo_db_records:
+        records.setdefault(pdbr.pattoo_checksum, pdbr)
+
+    # Find the checksums already in the database
+    result = _idx_datapoints(list(records.keys()))
+    missing = [_ for _ in sorted(records.keys()) if _ not in result]
+
+    # The cached checksums for agents are out of date if the DataPoint was
+    # created elsewhere
+    for checksum in result.keys():
+        misc.CACHE.discard(records[checksum].pattoo_agent_id)
+
+    # Return if there is nothing to create
+    if bool(missing) is False:
+        return result
+
+    # Create records in the Agent table
+    for checksum in missing:
+        pdbr = records[checksum]
+        key = (pdbr.pattoo_agent_id, pdbr.pattoo_agent_polled_target)
+        if key not in idx_agents:
+            idx_agents[key] = agent.idx_agent(
+                pdbr.pattoo_agent_id,
+                pdbr.pattoo_agent_polled_target,
+                pdbr.pattoo_agent_program)
+
+    with db.db_modify(20168, die=True) as session:
+        # Lock the Agent table rows. DataPoints of an agent are then only
+        # created by one process at a time.
+        session.query(Agent.idx_agent).filter(
+            Agent.idx_agent.in_(sorted(set(idx_agents.values())))).order_by(
+                Agent.idx_agent).with_for_update().all()
+
+        # Other processes may have created some of the DataPoints after
+        # they were looked up. Read them again now that the lock is held,
+        # and only create the others.
+        for chunk in chunks(missing, DB_CHUNK_SIZE):
+            rows = session.query(
+                _DataPoint.idx_datapoint, _DataPoint.checksum).filter(
+                    _DataPoint.checksum.in_([_.encode() for _ in chunk]))
+            for row in rows:
+                existing[row.checksum.decode()] = row.idx_datapoint
+        missing = [_ for _ in missing if _ not in existing]
+
+        for chunk in chunks(missing, DB_CHUNK_SIZE):
+            # Create records in the DataPoint table
+            rows = []
+            for checksum in chunk:
+                pdbr = records[checksum]
+                rows.append({
+                    'checksum': checksum.encode(),
+                    'data_type': pdbr.pattoo_data_type,
+                    'polling_interval': int(
+                        pdbr.pattoo_agent_polling_interval),
+                    'idx_agent': idx_agents[
+                        (pdbr.pattoo_agent_id,
+                         pdbr.pattoo_agent_polled_target)]})
+            statement = insert(_DataPoint.__table__).values(rows)
+            statement = statement.on_duplicate_key_update(
+                checksum=statement.inserted.checksum)
+            session.execute(statement)
+
+            # Get the new idx_datapoint values
+            rows = session.query(
+                _DataPoint.idx_datapoint, _DataPoint.checksum).filter(
+                    _DataPoint.checksum.in_([_.encode() for _ in chunk]))
+            for row in rows:
+                created[row.checksum.decode()] = row.idx_datapoint
+
+            # Create records in the Chart table
+            charts = {}
+            for checksum in chunk:
+                chart_checksum = data_.hashstring(
+                    '{}{}'.format(random.random(), checksum))
+                charts[chart_checksum] = created[checksum]
+            session.execute(
+                insert(Chart.__table__).values(
+                    [{'name': b'', 'checksum': _.encode(), 'enabled': 1}
+                     for _ in charts.keys()]))
+
+            # Create records in the ChartDataPoint table
+            rows = session.query(Chart.idx_chart, Chart.checksum).filter(
+                Chart.checksum.in_([_.encode() for _ in charts.keys()]))
+            statement = insert(ChartDataPoint.__table__).values(
+                [{'idx_chart': row.idx_chart,
+                  'idx_datapoint': charts[row.checksum.decode()],
+                  'enabled': 1} for row in rows])
+            statement = statement.on_duplicate_key_update(
+                enabled=statement.inserted.enabled)
+            session.execute(statement)
+
+    # Update the checksum cache
+    for checksum in existing.keys():
+        misc.CACHE.discard(records[checksum].pattoo_agent_id)
+    for checksum, _idx_datapoint in created.items():
+        pdbr = records[checksum]
+        misc.CACHE.add(
+            pdbr.pattoo_agent_id, checksum, ChecksumLookup(
+                idx_datapoint=_idx_datapoint,
+                polling_interval=int(pdbr.pattoo_agent_polling_interval),
+                last_timestamp=1))
+
+    # Return
+    result.update(existing)
+    result.update(created)
+    return result
+
+
+def _idx_datapoints(checksums):
+    """Get the db DataPoint.idx_datapoint values for checksums.
+
+    Args:
+        checksums: List of checksums
+
+    Returns:
+        result: Dict of DataPoint.idx_datapoint values keyed by checksum
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Get the result
+    for chunk in chunks(checksums, DB_CHUNK_SIZE):
+        with db.db_query(20169) as session:
+            rows = session.query(
+                _DataPoint.idx_datapoint, _DataPoint.checksum).filter(
+                    _DataPoint.checksum.in_([_.encode() for _ in chunk]))
+        for row in rows:
+            result[row.checksum.decode()] = row.idx_datapoint
+
+    # Return
+    return result
+
+
 def checksum_exists(_checksum):
     """Get the db _DataPoint.idx_datapoint value for specific checksum.
 
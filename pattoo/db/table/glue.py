@@ -2,11 +2,106 @@
 """Verifies the existence of various database data required for ingest."""
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
+from pattoo_shared import log
 from pattoo.db import db
-from pattoo.db.models import Pair, DataPoint, Glue
+from pattoo.db.models import Glue
+from pattoo.data import chunks
+from pattoo.constants import DB_CHUNK_SIZE
+
+
+class Batch():
+    """Collect Glue table rows for bulk insertion."""
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._rows = {}
+
+        # Instrumentation counters
+        self.inserted = 0
+        self.skipped = 0
+
+    def add(self, idx_datapoint, _idx_pairs):
+        """Add rows to the batch.
+
+        Args:
+            idx_datapoint: DataPoint.idx_datapoint
+            _idx_pairs: List of Pair.idx_pair values
+
+        Returns:
+            None
+
+        """
+        # Create a list for processing if not available
+        if isinstance(_idx_pairs, list) is False:
+            _idx_pairs = [_idx_pairs]
+
+        # Add rows. Using a dict removes duplicates
+        for idx_pair in _idx_pairs:
+            self._rows[(idx_datapoint, idx_pair)] = None
+
+    def flush(self):
+        """Write the batch to the database.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        items = sorted(self._rows.keys())
+        self._rows = {}
+        inserted = 0
+        skipped = 0
+
+        for chunk in chunks(items, DB_CHUNK_SIZE):
+            # Skip pre-existing rows
+            with db.db_query(20156) as session:
+                rows = session.query(
+                    Glue.idx_datapoint, Glue.idx_pair).filter(
+                        tuple_(Glue.idx_datapoint, Glue.idx_pair).in_(
+                            chunk)).all()
+            existing = set(
+                [(row.idx_datapoint, row.idx_pair) for row in rows])
+            _rows = [
+                {'idx_datapoint': idx_datapoint, 'idx_pair': idx_pair}
+                for idx_datapoint, idx_pair in chunk
+                if (idx_datapoint, idx_pair) not in existing]
+            skipped += len(chunk) - len(_rows)
+
+            # Insert
+            if bool(_rows) is True:
+                statement = insert(Glue.__table__).values(_rows)
+                statement = statement.on_duplicate_key_update(
+                    idx_pair=statement.inserted.idx_pair)
+                with db.db_modify(20002, die=True) as session:
+                    session.execute(statement)
+                inserted += len(_rows)
+
+        # Update counters
+        self.inserted += inserted
+        self.skipped += skipped
+
+        # Log
+        if bool(items) is True:
+            log_message = ('''\
+Glue table batch complete. {} rows inserted, {} pre-existing rows skipped.\
+'''.format(inserted, skipped))
+            log.log2debug(20157, log_message)
 
 
 def glue_exists(_idx_datapoint, idx_pair):
@@ -28,9 +123,7 @@ def glue_exists(_idx_datapoint, idx_pair):
     with db.db_query(20008) as session:
         rows = session.query(Glue.idx_pair).filter(and_(
             Glue.idx_datapoint == _idx_datapoint,
-            Glue.idx_pair == idx_pair,
-            Pair.idx_pair == Glue.idx_pair,
-            DataPoint.idx_datapoint == Glue.idx_datapoint
+            Glue.idx_pair == idx_pair
             ))
 
     # Return
@@ -41,7 +134,7 @@ def glue_exists(_idx_datapoint, idx_pair):
 
 
 def insert_rows(idx_datapoint, _idx_pairs):
-    """Create db Pair table entries.
+    """Create db Glue table entries.
 
     Args:
         idx_datapoint: DataPoint.idx_datapoint
@@ -51,24 +144,10 @@ def insert_rows(idx_datapoint, _idx_pairs):
         None
 
     """
-    # Initialize key variables
-    rows = []
-
-    # Create a list for processing if not available
-    if isinstance(_idx_pairs, list) is False:
-        _idx_pairs = [_idx_pairs]
-
-    # Iterate over _idx_pairs
-    for idx_pair in _idx_pairs:
-        pair_exists = glue_exists(idx_datapoint, idx_pair)
-        if bool(pair_exists) is False:
-            # Insert and get the new idx_datasource value
-            row = Glue(idx_pair=idx_pair, idx_datapoint=idx_datapoint)
-            rows.append(row)
-
-    if bool(rows) is True:
-        with db.db_modify(20002, die=True) as session:
-            session.add_all(rows)
+    # Insert
+    batch = Batch()
+    batch.add(idx_datapoint, _idx_pairs)
+    batch.flush()
 
 
 def idx_pairs(_idx_datapoints):
@@ -3,10 +3,13 @@
 
 # PIP libraries
 from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
 from pattoo.db import db
 from pattoo.db.models import Pair
+from pattoo.data import chunks
+from pattoo.constants import DB_CHUNK_SIZE
 
 
 def pair_exists(key, value):
@@ -45,11 +48,10 @@ def insert_rows(items):
         items: List of lists, or list of key-value pairs
 
     Returns:
-        None
+        result: Dict of Pair.idx_pair values keyed by (key, value) tuple
 
     """
     # Initialize key variables
-    _rows = []
     uniques = {}
     all_kvs = []
 
@@ -67,19 +69,55 @@ def insert_rows(items):
     for _kv in all_kvs:
         uniques[_kv] = None
 
+    # Skip pre-existing pairs
+    result = lookup(list(uniques.keys()))
+    missing = [_kv for _kv in uniques.keys() if _kv not in result]
+
     # Insert the key-value pairs into the database
-    for (key, value), _ in uniques.items():
-        # Skip pre-existing pairs
-        if bool(pair_exists(key, value)) is True:
-            continue
+    for chunk in chunks(missing, DB_CHUNK_SIZE):
+        rows = [
+            {'key': key.encode(), 'value': value.encode()}
+            for key, value in chunk]
+        statement = insert(Pair.__table__).values(rows)
+        statement = statement.on_duplicate_key_update(
+            key=statement.inserted.key)
+        with db.db_modify(20007, die=True) as session:
+            session.execute(statement)
 
-        # Add values to list for future insertion
-        _row = Pair(key=key.encode(), value=value.encode())
-        _rows.append(_row)
+    # Get the indexes of the newly inserted pairs
+    if bool(missing) is True:
+        result.update(lookup(missing))
+    return result
 
-    if bool(_rows) is True:
-        with db.db_modify(20007, die=True) as session:
-            session.add_all(_rows)
+
+def lookup(_items):
+    """Get the db Pair table indices keyed by key, value pairs.
+
+    Args:
+        _items: List of (key, value) tuples
+
+    Returns:
+        result: Dict of Pair.idx_pair values keyed by (key, value) tuple
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Get the data from the database
+    for chunk in chunks(_items, DB_CHUNK_SIZE):
+        # Encode the items
+        items = [(key.encode(), value.encode()) for key, value in chunk]
+
+        with db.db_query(20155) as session:
+            rows = session.query(
+                Pair.idx_pair, Pair.key, Pair.value).filter(
+                    tuple_(Pair.key, Pair.value).in_(items)).all()
+
+        for row in rows:
+            result[(row.key.decode(), row.value.decode())] = row.idx_pair
+
+    # Return
+    return result
 
 
 def idx_pairs(_items):
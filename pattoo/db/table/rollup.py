@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Maintain the rollups of the Data table.
+
+Rollups summarize the Data table in buckets of each resolution in
+ROLLUP_RESOLUTIONS. They are updated with each batch of inserted data so
+that queries of long time ranges don't have to read every row.
+
+"""
+
+# PIP libraries
+from sqlalchemy import func, text, literal_column
+from sqlalchemy.dialects.mysql import insert
+
+# Import project libraries
+from pattoo.db import db
+from pattoo.db.models import Data, DataRollup
+from pattoo.data import chunks
+from pattoo.constants import ROLLUP_RESOLUTIONS, DB_CHUNK_SIZE
+
+
+def aggregate(rows):
+    """Summarize rows of data in buckets of each rollup resolution.
+
+    Args:
+        rows: List of (idx_datapoint, timestamp, value) tuples sorted by
+            timestamp
+
+    Returns:
+        result: Dict of [minimum, maximum, total, count, last,
+            last_timestamp] lists keyed by (idx_datapoint, resolution,
+            timestamp)
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Summarize
+    for idx_datapoint, timestamp, value in rows:
+        for resolution in ROLLUP_RESOLUTIONS:
+            key = (
+                idx_datapoint, resolution,
+                (timestamp // resolution) * resolution)
+            summary = result.get(key)
+            if summary is None:
+                result[key] = [value, value, value, 1, value, timestamp]
+                continue
+            summary[0] = min(summary[0], value)
+            summary[1] = max(summary[1], value)
+            summary[2] += value
+            summary[3] += 1
+            if timestamp >= summary[5]:
+                summary[4] = value
+                summary[5] = timestamp
+    return result
+
+
+def update(session, rows):
+    """Add rows of data to the rollups.
+
+    Args:
+        session: Database session used to insert the rows into the Data table
+        rows: List of (idx_datapoint, timestamp, value) tuples sorted by
+            timestamp
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    table = DataRollup.__table__
+    summaries = aggregate(rows)
+
+    # Insert new buckets and merge with existing ones. MySQL applies the
+    # updates in order, so "last" must be updated before "last_timestamp".
+    # SQLAlchemy renders all inserted values in an update as those of the
+    # updated column, so the inserted last_timestamp is written out.
+    for chunk in chunks(sorted(summaries.items()), DB_CHUNK_SIZE):
+        statement = insert(table).values(
+            [{'idx_datapoint': idx_datapoint,
+              'resolution': resolution,
+              'timestamp': timestamp,
+              'minimum': summary[0],
+              'maximum': summary[1],
+              'total': summary[2],
+              'count': summary[3],
+              'last': summary[4],
+              'last_timestamp': summary[5]}
+             for (idx_datapoint, resolution, timestamp), summary in chunk])
+        inserted = statement.inserted
+        statement = statement.on_duplicate_key_update([
+            ('minimum', func.least(table.c.minimum, inserted.minimum)),
+            ('maximum', func.greatest(table.c.maximum, inserted.maximum)),
+            ('total', table.c.total + inserted.total),
+            ('count', table.c['count'] + inserted['count']),
+            ('last', func.if_(
+                literal_column('VALUES(last_timestamp)') >= (
+                    table.c.last_timestamp),
+                inserted.last, table.c.last)),
+            ('last_timestamp', func.greatest(
+                table.c.last_timestamp, inserted.last_timestamp))])
+        session.execute(statement)
+
+
+def backfill():
+    """Create the rollups of the data in the Data table.
+
+    Used when the rollups are added to an existing database. DataPoints are
+    processed one at a time. Only those with data missing from their
+    rollups are processed, so this can be run again after a failure.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Replace the rollups of each DataPoint. The last value of each bucket
+    # is that of the row with the bucket's most recent timestamp.
+    for idx_datapoint in _pending():
+        with db.db_modify(20187, die=True) as session:
+            for resolution in ROLLUP_RESOLUTIONS:
+                session.execute(
+                    text('''\
+INSERT INTO {0} (idx_datapoint, resolution, timestamp, minimum, maximum, \
+total, count, last, last_timestamp) \
+SELECT summary.idx_datapoint, :resolution, summary.bucket, \
+summary.minimum_value, summary.maximum_value, summary.total_value, \
+summary.row_count, {1}.value, summary.timestamp_last FROM (\
+SELECT idx_datapoint, timestamp - (timestamp % :resolution) AS bucket, \
+MIN(value) AS minimum_value, MAX(value) AS maximum_value, \
+SUM(value) AS total_value, COUNT(*) AS row_count, \
+MAX(timestamp) AS timestamp_last FROM {1} \
+WHERE idx_datapoint = :idx_datapoint \
+GROUP BY idx_datapoint, timestamp - (timestamp % :resolution)) AS summary \
+INNER JOIN {1} ON {1}.idx_datapoint = summary.idx_datapoint \
+AND {1}.timestamp = summary.timestamp_last \
+ON DUPLICATE KEY UPDATE minimum = VALUES(minimum), \
+maximum = VALUES(maximum), total = VALUES(total), count = VALUES(count), \
+last = VALUES(last), last_timestamp = VALUES(last_timestamp)\
+'''.format(DataRollup.__tablename__, Data.__tablename__)),
+                    {'resolution': resolution,
+                     'idx_datapoint': idx_datapoint})
+
+
+def _pending():
+    """Get the DataPoints with data that isn't in their rollups.
+
+    Args:
+        None
+
+    Returns:
+        result: List of DataPoint.idx_datapoint values
+
+    """
+    # Compare the number of rows of each DataPoint with the number in its
+    # rollups. Use the same transaction for a consistent result.
+    with db.db_query(20195) as session:
+        rows = session.query(
+            Data.idx_datapoint, func.count()).group_by(
+                Data.idx_datapoint).all()
+        counts = dict(session.query(
+            DataRollup.idx_datapoint, func.sum(DataRollup.count)).filter(
+                DataRollup.resolution == min(ROLLUP_RESOLUTIONS)).group_by(
+                    DataRollup.idx_datapoint).all())
+
+    # Return
+    result = [
+        idx_datapoint for idx_datapoint, count in rows
+        if counts.get(idx_datapoint, 0) != count]
+    return result
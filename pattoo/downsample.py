@@ -0,0 +1,140 @@
+"""Reduce the number of values in DataPoint time series.
+
+Charts can't draw more values than they have pixels. Time series are
+reduced to a requested number of points before they are sent to clients.
+
+"""
+
+# Standard imports
+import math
+import warnings
+
+# PIP3 imports
+import numpy as np
+
+# Modes of downsampling. Time bucketed modes are applied to the values of
+# consecutive timestamps.
+MODES = ('avg', 'min', 'max', 'lttb')
+_BUCKETED = {'avg': np.nanmean, 'min': np.nanmin, 'max': np.nanmax}
+
+
+def downsample(values, points=None, mode=None):
+    """Reduce the number of values in a time series.
+
+    Args:
+        values: List of {'timestamp': timestamp, 'value': value} dicts sorted
+            by timestamp. Missing values are None
+        points: Maximum number of values to return. All values are returned
+            if None
+        mode: Mode of downsampling from MODES. Defaults to 'avg'. Unknown
+            modes are treated as 'avg'
+
+    Returns:
+        result: List of {'timestamp': timestamp, 'value': value} dicts
+
+    """
+    # Return everything if no reduction is required
+    if bool(points) is False or points < 1 or len(values) <= points:
+        return values
+
+    # Downsample
+    if mode == 'lttb':
+        result = _lttb(values, points)
+    else:
+        result = _bucketed(values, points, _BUCKETED.get(mode, np.nanmean))
+    return result
+
+
+def _bucketed(values, points, function):
+    """Summarize the values of consecutive timestamps.
+
+    Args:
+        values: List of {'timestamp': timestamp, 'value': value} dicts
+        points: Maximum number of values to return
+        function: numpy function that ignores NaN values used to summarize
+            each bucket
+
+    Returns:
+        result: List of {'timestamp': timestamp, 'value': value} dicts. The
+            timestamp of each value is the first timestamp of its bucket
+
+    """
+    # Initialize key variables
+    result = []
+    size = int(math.ceil(len(values) / points))
+    array = np.array(
+        [_['value'] for _ in values], dtype=float)
+
+    # Pad the array with NaN values so that each bucket is the same size
+    padding = (size - (len(array) % size)) % size
+    array = np.append(array, np.full(padding, np.nan)).reshape(-1, size)
+
+    # Summarize. Buckets without values produce NaN and a warning.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        summaries = function(array, axis=1)
+
+    # Create the result
+    for index, summary in enumerate(summaries.tolist()):
+        result.append({
+            'timestamp': values[index * size]['timestamp'],
+            'value': None if math.isnan(summary) else round(summary, 10)})
+    return result
+
+
+def _lttb(values, points):
+    """Select values using the Largest-Triangle-Three-Buckets algorithm.
+
+    The shape of the time series is preserved by selecting the value of each
+    bucket that forms the largest triangle with the values selected for the
+    buckets on either side. Missing values are ignored.
+
+    Args:
+        values: List of {'timestamp': timestamp, 'value': value} dicts
+        points: Maximum number of values to return
+
+    Returns:
+        result: List of {'timestamp': timestamp, 'value': value} dicts
+
+    """
+    # Ignore missing values
+    values = [_ for _ in values if _['value'] is not None]
+    if len(values) <= points or len(values) < 3:
+        return values
+    if points < 3:
+        return [values[0], values[-1]][:points]
+
+    # Initialize key variables
+    timestamps = np.array([_['timestamp'] for _ in values], dtype=float)
+    _values = np.array([_['value'] for _ in values], dtype=float)
+    edges = np.linspace(1, len(values) - 1, points - 1).astype(int)
+    selected = [0]
+
+    # The first and last values are always selected. The remaining values
+    # are divided into points - 2 buckets.
+    for bucket in range(points - 2):
+        (start, stop) = (edges[bucket], edges[bucket + 1])
+
+        # Average of the next bucket, or the last value
+        if bucket + 2 < len(edges):
+            (_start, _stop) = (edges[bucket + 1], edges[bucket + 2])
+            next_timestamp = timestamps[_start:_stop].mean()
+            next_value = _values[_start:_stop].mean()
+        else:
+            next_timestamp = timestamps[-1]
+            next_value = _values[-1]
+
+        # Select the value forming the largest triangle with the previously
+        # selected value and the average of the next bucket
+        previous = selected[-1]
+        areas = np.abs(
+            (timestamps[previous] - next_timestamp) * (
+                _values[start:stop] - _values[previous]) - (
+                    timestamps[previous] - timestamps[start:stop]) * (
+                        next_value - _values[previous]))
+        selected.append(start + int(np.argmax(areas)))
+
+    # Return
+    selected.append(len(values) - 1)
+    result = [values[_] for _ in selected]
+    return result
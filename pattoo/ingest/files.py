@@ -3,25 +3,35 @@
 
 # Standard imports
 import os
+import sys
 import time
+import queue
+import threading
 
 
 # Import project libraries
 from pattoo_shared import log, files, converter
 from pattoo.configuration import ConfigIngester as Config
 from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
+from pattoo import spool
 from .records import Records
 
 
 class Cache():
     """Process ingest cache data."""
 
-    def __init__(self, batch_size=500, age=0):
+    def __init__(self, batch_size=500, age=0, pool=None, spool_reader=None,
+                 stream=False):
         """Initialize the class.
 
         Args:
             batch_size: Number of files to read
             age: Minimum age of files to be read per batch
+            pool: WorkerPool object to use for multiprocessing
+            spool_reader: spool.Reader object from which batch_size posts
+                are also read
+            stream: Read the data as it is ingested instead of all at once
+                if True
 
         Returns:
             None
@@ -31,13 +41,33 @@ class Cache():
         config = Config()
         directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
         self._batch_id = int(time.time() * 1000)
+        self._batch_size = batch_size
+        self._pool = pool
+        self._spool_reader = spool_reader
+        self._stream = bool(stream)
+        self._marker = {}
 
         # Read data from cache. Stop if there is no data found.
-        self._data = files.read_json_files(
-            directory, die=False, age=age, count=batch_size)
+        if self._stream is True:
+            self._data = []
+            self._filepaths = _list(directory, age, batch_size)
+        else:
+            self._data = files.read_json_files(
+                directory, die=False, age=age, count=batch_size)
+            self._filepaths = [filepath for filepath, _ in self._data]
 
         # Save the number of files read
-        self.files = len(self._data)
+        self.files = len(self._filepaths)
+
+        # Read data from the spool
+        self.spooled = 0
+        if spool_reader is not None and self._stream is False:
+            (spooled, self._marker) = spool_reader.read(batch_size)
+            self._data.extend(spooled)
+            self.spooled = len(spooled)
+
+        # Number of Data table rows inserted
+        self.rows = 0
 
     def records(self):
         """Create PattooDBrecord objects from cache directory.
@@ -49,35 +79,71 @@ class Cache():
             result: List of list of PattooDBrecord objects grouped by agent_id
 
         """
-        # Initialize list of files that have been processed
-        _cache = {}
-        result = []
+        # Return
+        result = _records(self._data)
+        return result
 
-        # Read data from files
-        for filepath, json_data in sorted(self._data):
-            # Get data from JSON file. Convert to rows of key-pairs
-            if bool(json_data) is True and isinstance(json_data, dict) is True:
-                pdbrs = converter.cache_to_keypairs(json_data)
-                if bool(pdbrs) is False:
-                    log_message = ('''\
-File {} has invalid data. It will not be processed'''.format(filepath))
-                    log.log2info(20026, log_message)
-                    continue
+    def stream(self, memory_limit=None):
+        """Create PattooDBrecord objects from the cache as it is read.
 
-                # Group data by agent_id
-                pattoo_agent_id = pdbrs[0].pattoo_agent_id
-                if pattoo_agent_id in _cache:
-                    _cache[pattoo_agent_id].extend(pdbrs)
-                else:
-                    _cache[pattoo_agent_id] = pdbrs
+        Args:
+            memory_limit: Approximate size in bytes of the cache data to
+                read before yielding its records. Defaults to the configured
+                stream_memory_limit
 
-        # Aggregate data
-        if bool(_cache) is True:
-            for _, item in sorted(_cache.items()):
-                result.append(item)
+        Yields:
+            result: Tuple of a list of list of PattooDBrecord objects grouped
+                by agent_id, the list of cache filepaths read and a dict of
+                spool.Reader offsets to commit once these are processed
 
-        # Return
-        return result
+        """
+        # Initialize key variables
+        if memory_limit is None:
+            memory_limit = Config().stream_memory_limit()
+        _cache = {}
+        filepaths = []
+        marker = {}
+        size = 0
+
+        # Read data from files
+        for filepath in self._filepaths:
+            try:
+                size += os.path.getsize(filepath)
+            except FileNotFoundError:
+                continue
+            _group(
+                _cache, filepath, files.read_json_file(filepath, die=False))
+            filepaths.append(filepath)
+
+            # Yield when the limit is reached
+            if size >= memory_limit:
+                yield (
+                    [item for _, item in sorted(_cache.items())],
+                    filepaths, {})
+                (_cache, filepaths, size) = ({}, [], 0)
+
+        # Read data from the spool
+        if self._spool_reader is not None:
+            for key, json_data, (basename, position) in (
+                    self._spool_reader.records(self._batch_size)):
+                # Keys end with the offset of the start of the record
+                size += position - int(key.split(':')[-1])
+                _group(_cache, key, json_data)
+                marker[basename] = position
+                self.spooled += 1
+
+                # Yield when the limit is reached
+                if size >= memory_limit:
+                    yield (
+                        [item for _, item in sorted(_cache.items())],
+                        filepaths, marker)
+                    (_cache, filepaths, marker, size) = ({}, [], {}, 0)
+
+        # Yield the remainder
+        if bool(filepaths) is True or bool(marker) is True:
+            yield (
+                [item for _, item in sorted(_cache.items())],
+                filepaths, marker)
 
     def purge(self):
         """Purge cache files.
@@ -89,18 +155,12 @@ File {} has invalid data. It will not be processed'''.format(filepath))
             None
 
         """
-        # Initialize key variables
-        filepaths = [filepath for filepath, _ in self._data]
-
         # Delete cache files after processing
-        for filepath in filepaths:
-            if os.path.exists(filepath):
-                try:
-                    os.remove(filepath)
-                except:
-                    log_message = ('''\
-Error deleting cache file {}.'''.format(filepath))
-                    log.log2warning(20110, log_message)
+        _purge(self._filepaths)
+
+        # Record the spooled data that has been processed
+        if self._spool_reader is not None:
+            self._spool_reader.commit(self._marker)
 
     def ingest(self):
         """Ingest cache data into the database.
@@ -112,6 +172,10 @@ Error deleting cache file {}.'''.format(filepath))
             records: Number of records processed
 
         """
+        # Process the data as it is read
+        if self._stream is True:
+            return self._ingest_stream()
+
         # Process
         _data = self.records()
         if bool(_data) is True:
@@ -121,8 +185,8 @@ Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
             log.log2debug(20004, log_message)
 
             # Add records to the database
-            _records = Records(_data)
-            _records.ingest()
+            _records = Records(_data, pool=self._pool)
+            self.rows = _records.ingest()
             self.purge()
 
             # Log
@@ -130,20 +194,303 @@ Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
 Finished processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
             log.log2debug(20117, log_message)
 
+        elif self._spool_reader is not None:
+            # Don't read invalid spooled data again
+            self._spool_reader.commit(self._marker)
+
         # Determine the number of key pairs read
         records = 0
         for item in _data:
             records += len(item)
         return records
 
+    def _ingest_stream(self):
+        """Ingest cache data into the database as it is read.
+
+        Args:
+            None
+
+        Returns:
+            records: Number of records processed
+
+        """
+        # Initialize key variables
+        records = 0
+
+        for _data, filepaths, marker in self.stream():
+            # Add records to the database
+            if bool(_data) is True:
+                log_message = ('Processing ingest cache stream. Batch ID: {}'
+                               ''.format(self._batch_id))
+                log.log2debug(20175, log_message)
+                self.rows += Records(_data, pool=self._pool).ingest()
+
+            # Delete the data that has been processed
+            _purge(filepaths)
+            if self._spool_reader is not None:
+                self._spool_reader.commit(marker)
+
+            # Determine the number of key pairs read
+            for item in _data:
+                records += len(item)
+
+        # Return
+        return records
+
+
+class Pipeline():
+    """Ingest cache data using concurrent reader, decoder and writer stages.
+
+    Cache files are read by one thread and converted to PattooDBrecord
+    objects by another while the previous batch is written to the database.
+    The stages are connected by bounded queues so that a slow database
+    limits the amount of data read ahead of it.
+
+    """
+
+    def __init__(self, batch_size=500, age=0, queue_size=2, pool=None,
+                 spool_reader=None):
+        """Initialize the class.
+
+        Args:
+            batch_size: Number of files to read per batch
+            age: Minimum age of files to be read
+            queue_size: Maximum number of batches waiting between stages
+            pool: WorkerPool object to use for multiprocessing
+            spool_reader: spool.Reader object from which batch_size posts
+                are also read per batch
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        config = Config()
+        self._directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        self._batch_size = batch_size
+        self._age = age
+        self._pool = pool
+        self._spool_reader = spool_reader
+        self._read_queue = queue.Queue(maxsize=max(1, queue_size))
+        self._write_queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+
+        # Statistics
+        self.files = 0
+        self.spooled = 0
+        self.records = 0
+        self.rows = 0
+
+    def run(self, max_duration=3600, max_files=None):
+        """Run the pipeline until there are no more files to process.
+
+        Args:
+            max_duration: Maximum duration in seconds
+            max_files: Stop reading after this number of files
+
+        Returns:
+            None
+
+        """
+        # Start the reader and decoder stages
+        threads = [
+            threading.Thread(
+                target=self._reader, args=(max_duration, max_files),
+                daemon=True),
+            threading.Thread(target=self._decoder, daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        # Write to the database in this thread
+        try:
+            self._writer()
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _reader(self, max_duration, max_files):
+        """Read batches of cache files.
+
+        Args:
+            max_duration: Maximum duration in seconds
+            max_files: Stop reading after this number of files
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        start = time.time()
+        claimed = set()
+        files_read = 0
+
+        try:
+            while self._stop.is_set() is False:
+                # Automatically stop if we are going on too long.
+                if time.time() - start > max_duration:
+                    log_message = ('''\
+Stopping ingester after exceeding the maximum runtime duration of {}s. \
+This can be adjusted on the CLI.'''.format(max_duration))
+                    log.log2info(20160, log_message)
+                    break
+
+                # Stop if we have read all the files found on startup
+                if max_files is not None and files_read >= max_files and (
+                        self._pending() is False):
+                    break
+
+                # Read data from cache. Claim the files so that they aren't
+                # read again before the writer purges them.
+                _data = _read(
+                    self._directory, claimed, self._age, self._batch_size)
+                files_read += len(_data)
+
+                # Read data from the spool
+                marker = {}
+                if self._spool_reader is not None:
+                    (spooled, marker) = self._spool_reader.read(
+                        self._batch_size)
+                    _data.extend(spooled)
+
+                # Stop if there is no data found.
+                if bool(_data) is False:
+                    break
+                self._put(self._read_queue, (_data, marker))
+
+        except:
+            _exception = sys.exc_info()
+            log.log2exception(20161, _exception)
+            self._stop.set()
+
+        # Signal the end of the data
+        self._put(self._read_queue, None, force=True)
+
+    def _decoder(self):
+        """Convert batches of cache file data to PattooDBrecord objects.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        while True:
+            item = self._read_queue.get()
+            if item is None:
+                break
+            (_data, marker) = item
+
+            try:
+                item = (
+                    [filepath for filepath, _ in _data], _records(_data),
+                    marker)
+            except:
+                _exception = sys.exc_info()
+                log.log2exception(20162, _exception)
+                self._stop.set()
+                break
+
+            self._put(self._write_queue, item)
+
+        # Signal the end of the data
+        self._put(self._write_queue, None, force=True)
+
+    def _writer(self):
+        """Write batches of PattooDBrecord objects to the database.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            (keys, _data, marker) = item
+            filepaths = [_ for _ in keys if _.endswith('.json')]
+
+            # Add records to the database
+            if bool(_data) is True:
+                self.rows += Records(_data, pool=self._pool).ingest()
+            _purge(filepaths)
+            if self._spool_reader is not None:
+                self._spool_reader.commit(marker)
+
+            # Update statistics
+            self.files += len(filepaths)
+            self.spooled += len(keys) - len(filepaths)
+            for records in _data:
+                self.records += len(records)
+
+            # Log
+            log_message = ('''\
+Pipeline batch complete. {} files and {} spooled posts processed. Queued \
+batches: {} read, {} decoded'''.format(len(filepaths),
+                                       len(keys) - len(filepaths),
+                                       self._read_queue.qsize(),
+                                       self._write_queue.qsize()))
+            log.log2debug(20163, log_message)
+
+    def _pending(self):
+        """Determine whether there is unread spooled data.
+
+        Args:
+            None
+
+        Returns:
+            result: True if there is unread spooled data
+
+        """
+        # Return
+        result = False
+        if self._spool_reader is not None:
+            result = self._spool_reader.pending()
+        return result
+
+    def _put(self, _queue, item, force=False):
+        """Add an item to a queue, blocking while the queue is full.
 
-def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
+        Args:
+            _queue: Queue object
+            item: Item to add
+            force: Add the item even if the pipeline has been stopped
+
+        Returns:
+            None
+
+        """
+        while True:
+            # Give up if the consumer has stopped
+            if self._stop.is_set() is True and force is False:
+                return
+            try:
+                _queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                if self._stop.is_set() is True and force is True:
+                    # Make space for the end of data marker
+                    try:
+                        _queue.get_nowait()
+                    except queue.Empty:
+                        pass
+
+
+def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False,
+                  pool=None):
     """Ingest data.
 
     Args:
         batch_size: Number of files to process at a time
         max_duration: Maximum duration
         fileage: Minimum age of files to be processed in seconds
+        script: True if running as a script
+        pool: WorkerPool object to use for multiprocessing. A new pool of
+            sub processes is created for each batch of files if None.
 
     Returns:
         success: True if successful
@@ -160,9 +507,11 @@ def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
     """
     # Initialize key variables
     records = 0
+    rows = 0
     start = time.time()
     looptime = 0
     files_read = 0
+    spooled = 0
     success = True
 
     # Get cache directory
@@ -177,6 +526,9 @@ def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
     files_found = len(
         [_ for _ in os.listdir(directory) if _.endswith('.json')])
 
+    # Only read the data spooled before now
+    spool_reader = spool.Reader(spool.directory())
+
     # Create lockfile only if running as a script.
     # The daemon has its own locking mechanism
     if bool(script) is True:
@@ -184,50 +536,69 @@ def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
         if bool(success) is False:
             return bool(success)
 
-    # Process the files in batches to reduce the database connection count
-    # This can cause errors
-    while True:
-        # Agents constantly update files. We don't want an infinite loop
-        # situation where we always have files available that are newer than
-        # the desired fileage.
-        loopstart = time.time()
-        fileage = fileage + looptime
-
-        # Automatically stop if we are going on too long.(1 of 2)
-        duration = loopstart - start
-        if duration > max_duration:
-            log_message = ('''\
+    if config.pipeline() is True:
+        # Read, decode and write batches of files concurrently
+        pipeline = Pipeline(
+            batch_size=batch_size, age=fileage,
+            queue_size=config.pipeline_queue_size(), pool=pool,
+            spool_reader=spool_reader)
+        pipeline.run(max_duration=max_duration, max_files=files_found)
+        records = pipeline.records
+        rows = pipeline.rows
+        files_read = pipeline.files
+        spooled = pipeline.spooled
+
+    else:
+        # Process the files in batches to reduce the database connection
+        # count. This can cause errors
+        while True:
+            # Agents constantly update files. We don't want an infinite loop
+            # situation where we always have files available that are newer
+            # than the desired fileage.
+            loopstart = time.time()
+            fileage = fileage + looptime
+
+            # Automatically stop if we are going on too long.(1 of 2)
+            duration = loopstart - start
+            if duration > max_duration:
+                log_message = ('''\
 Stopping ingester after exceeding the maximum runtime duration of {}s. \
 This can be adjusted on the CLI.'''.format(max_duration))
-            log.log2info(20022, log_message)
-            break
-
-        # Automatically stop if we are going on too long.(2 of 2)
-        if files_read >= files_found:
-            # No need to log. This is an expected outcome.
-            break
-
-        # Read data from cache. Stop if there is no data found.
-        cache = Cache(batch_size=batch_size, age=fileage)
-        count = cache.ingest()
-
-        # Automatically stop if we are going on too long.(2 of 2)
-        if bool(cache.files) is False:
-            # No need to log. This is an expected outcome.
-            break
-
-        # Get the records processed, looptime and files read
-        records += count
-        files_read += cache.files
-        looptime = max(time.time() - loopstart, looptime)
+                log.log2info(20022, log_message)
+                break
+
+            # Automatically stop if we are going on too long.(2 of 2)
+            if files_read >= files_found and spool_reader.pending() is False:
+                # No need to log. This is an expected outcome.
+                break
+
+            # Read data from cache. Stop if there is no data found.
+            cache = Cache(
+                batch_size=batch_size, age=fileage, pool=pool,
+                spool_reader=spool_reader, stream=config.stream())
+            count = cache.ingest()
+
+            # Automatically stop if we are going on too long.(2 of 2)
+            if bool(cache.files) is False and bool(cache.spooled) is False:
+                # No need to log. This is an expected outcome.
+                break
+
+            # Get the records processed, looptime and files read
+            records += count
+            rows += cache.rows
+            files_read += cache.files
+            spooled += cache.spooled
+            looptime = max(time.time() - loopstart, looptime)
 
     # Print result
     duration = time.time() - start
     if bool(records) is True and bool(duration) is True:
         log_message = ('''\
 Agent cache ingest completed. {0} records processed in {1:.2f} seconds, \
-{2:.2f} records / second. {3} files read. \
-'''.format(records, duration, records / duration, files_read))
+{2:.2f} records / second. {3} rows inserted, {4:.2f} rows / second. \
+{5} files read. {6} spooled posts read. \
+'''.format(records, duration, records / duration, rows, rows / duration,
+           files_read, spooled))
         log.log2info(20084, log_message)
     else:
         log_message = 'No files found to ingest'
@@ -284,3 +655,168 @@ instance running? If not, delete the lockfile and rerun this script.\
             log.log2warning(20108, log_message)
 
     return success
+
+
+def _read(directory, claimed, age, count):
+    """Read cache files that haven't already been claimed.
+
+    Args:
+        directory: Cache directory
+        claimed: Set of filepaths already read. Updated with the new
+            filepaths.
+        age: Minimum age of files in seconds
+        count: Maximum number of files to read
+
+    Returns:
+        result: Sorted list of (filepath, JSON) tuples
+
+    """
+    # Initialize key variables
+    result = []
+    now = time.time()
+    filepaths = set()
+
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.json') is False:
+            continue
+        filepath = '{}{}{}'.format(directory, os.sep, filename)
+        filepaths.add(filepath)
+
+        # Skip files already claimed and files that are too new
+        if filepath in claimed:
+            continue
+        try:
+            fileage = now - os.stat(filepath).st_mtime
+        except FileNotFoundError:
+            continue
+        if fileage <= age:
+            continue
+
+        # Read the file
+        claimed.add(filepath)
+        json_data = files.read_json_file(filepath, die=False)
+        if bool(json_data) is True:
+            result.append((filepath, json_data))
+        if len(result) >= count:
+            break
+
+    # Forget about files that have been purged
+    claimed.intersection_update(filepaths)
+
+    # Return
+    result.sort()
+    return result
+
+
+def _list(directory, age, count):
+    """List cache files without reading them.
+
+    Args:
+        directory: Cache directory
+        age: Minimum age of files in seconds
+        count: Maximum number of files to list
+
+    Returns:
+        result: Sorted list of filepaths
+
+    """
+    # Initialize key variables
+    result = []
+    now = time.time()
+
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.json') is False:
+            continue
+        filepath = '{}{}{}'.format(directory, os.sep, filename)
+
+        # Skip files that are too new
+        try:
+            fileage = now - os.stat(filepath).st_mtime
+        except FileNotFoundError:
+            continue
+        if fileage <= age:
+            continue
+
+        result.append(filepath)
+        if len(result) >= count:
+            break
+
+    # Return
+    return result
+
+
+def _records(_data):
+    """Create PattooDBrecord objects from cache file data.
+
+    Args:
+        _data: List of (filepath, JSON) tuples
+
+    Returns:
+        result: List of list of PattooDBrecord objects grouped by agent_id
+
+    """
+    # Initialize list of files that have been processed
+    _cache = {}
+    result = []
+
+    # Read data from files
+    for filepath, json_data in sorted(_data):
+        _group(_cache, filepath, json_data)
+
+    # Aggregate data
+    if bool(_cache) is True:
+        for _, item in sorted(_cache.items()):
+            result.append(item)
+
+    # Return
+    return result
+
+
+def _group(_cache, filepath, json_data):
+    """Add PattooDBrecord objects from cache file data to a dict.
+
+    Args:
+        _cache: Dict of PattooDBrecord object lists keyed by agent_id
+        filepath: Cache filepath or spool key of the data
+        json_data: JSON from the file
+
+    Returns:
+        None
+
+    """
+    # Get data from JSON file. Convert to rows of key-pairs
+    if bool(json_data) is True and isinstance(json_data, dict) is True:
+        pdbrs = converter.cache_to_keypairs(json_data)
+        if bool(pdbrs) is False:
+            log_message = ('''\
+File {} has invalid data. It will not be processed'''.format(filepath))
+            log.log2info(20026, log_message)
+            return
+
+        # Group data by agent_id
+        pattoo_agent_id = pdbrs[0].pattoo_agent_id
+        if pattoo_agent_id in _cache:
+            _cache[pattoo_agent_id].extend(pdbrs)
+        else:
+            _cache[pattoo_agent_id] = pdbrs
+
+
+def _purge(filepaths):
+    """Purge cache files.
+
+    Args:
+        filepaths: List of cache filepaths
+
+    Returns:
+        None
+
+    """
+    # Delete cache files after processing
+    for filepath in filepaths:
+        if os.path.exists(filepath):
+            try:
+                os.remove(filepath)
+            except:
+                log_message = ('''\
+Error deleting cache file {}.'''.format(filepath))
+                log.log2warning(20110, log_message)
@@ -21,9 +21,8 @@ def pairs(pattoo_db_record):
     # Get key-values
     _pairs = key_value_pairs(pattoo_db_record)
 
-    # Get list of pairs in the database
-    pair.insert_rows(_pairs)
-    result = pair.idx_pairs(_pairs)
+    # Get list of pairs in the database, creating them if necessary
+    result = sorted(pair.insert_rows(_pairs).values())
 
     # Return
     return result
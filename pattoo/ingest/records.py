@@ -5,8 +5,6 @@
 from multiprocessing import get_context, cpu_count
 
 import sys
-import time
-import random
 
 # PIP3 imports
 import tblib.pickling_support
@@ -68,13 +66,15 @@ class ExceptionWrapper():
 class Records():
     """Process data using multiprocessing."""
 
-    def __init__(self, pattoo_db_records_lists):
+    def __init__(self, pattoo_db_records_lists, pool=None):
         """Initialize the class.
 
         Args:
             pattoo_db_records_lists: List of PattooDBrecord oject lists
                 grouped by source and sorted by timestamp. This data is
                 obtained from PattooShared.converter.extract
+            pool: WorkerPool object to use for multiprocessing. A new pool of
+                sub processes is created for each step if None.
 
         Returns:
             None
@@ -86,43 +86,10 @@ class Records():
         # Setup the arguments for multiprocessing
         self._arguments = [
             (_, ) for _ in pattoo_db_records_lists if bool(_) is True]
+        self._keys = [_[0][0].pattoo_agent_id for _ in self._arguments]
         self._multiprocess = config.multiprocessing()
         self._pool_size = cpu_count()
-
-    def multiprocess_pairs(self):
-        """Update rows in the Pair database table if necessary.
-
-        Do all multiprocessing outside of the class for consistent results
-        without unexpected hanging waiting for pool.join() to happen.
-
-        Args:
-            None
-
-        Returns:
-            None
-
-        """
-        # Initialize key variables
-        pattoo_db_records_lists_tuple = self._arguments
-        pool_size = self._pool_size
-
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
-
-            # Create sub processes from the pool
-            per_process_key_value_pairs = pool.starmap(
-                _process_kvps_exception, pattoo_db_records_lists_tuple)
-
-        # Wait for all the processes to end and get results
-        pool.join()
-
-        # Test for exceptions
-        for result in per_process_key_value_pairs:
-            if isinstance(result, ExceptionWrapper):
-                result.re_raise()
-
-        # Update the database with key value pairs
-        pair.insert_rows(per_process_key_value_pairs)
+        self._pool = pool
 
     def multiprocess_data(self):
         """Insert rows into the Data and DataPoint tables as necessary.
@@ -134,52 +101,42 @@ class Records():
             None
 
         Returns:
-            None
+            rows: Number of Data table rows inserted
 
         """
         # Initialize key variables
         pattoo_db_records_lists_tuple = self._arguments
         pool_size = self._pool_size
+        rows = 0
 
         # Troubleshooting log
         log_message = 'Processing {} agents from cache'.format(
             len(pattoo_db_records_lists_tuple))
         log.log2debug(20009, log_message)
 
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
+        if self._pool is not None:
+            # Use the persistent pool of sub processes
+            results = self._pool.starmap(
+                _process_data_exception, pattoo_db_records_lists_tuple,
+                keys=self._keys)
+
+        else:
+            # Create a pool of sub process resources
+            with get_context('spawn').Pool(processes=pool_size) as pool:
 
-            # Create sub processes from the pool
-            results = pool.starmap(
-                _process_data_exception, pattoo_db_records_lists_tuple)
+                # Create sub processes from the pool
+                results = pool.starmap(
+                    _process_data_exception, pattoo_db_records_lists_tuple)
 
-        # Wait for all the processes to end and get results
-        pool.join()
+            # Wait for all the processes to end and get results
+            pool.join()
 
         # Test for exceptions
         for result in results:
             if isinstance(result, ExceptionWrapper):
                 result.re_raise()
-
-    def singleprocess_pairs(self):
-        """Update rows in the Pair database table if necessary.
-
-        Args:
-            None
-
-        Returns:
-            None
-
-        """
-        # Process data
-        pairs = []
-        for item in self._arguments:
-            row = item[0]
-            per_process_key_value_pairs = get.key_value_pairs(row)
-            pairs.append(per_process_key_value_pairs)
-
-        # Insert
-        pair.insert_rows(pairs)
+            rows += result
+        return rows
 
     def singleprocess_data(self):
         """Insert rows into the Data and DataPoint tables as necessary.
@@ -188,83 +145,40 @@ class Records():
             None
 
         Returns:
-            None
+            rows: Number of Data table rows inserted
 
         """
+        # Initialize key variables
+        rows = 0
+
         # Process data
         for item in self._arguments:
             row = item[0]
-            process_db_records(row)
+            rows += process_db_records(row)
+        return rows
 
     def ingest(self):
         """Insert rows into the Data and DataPoint tables as necessary.
 
+        Pair table rows are created while processing the data, and only for
+        DataPoints not yet in the database.
+
         Args:
             None
 
         Returns:
-            None
+            rows: Number of Data table rows inserted
 
         """
         # Update
         if self._multiprocess is True:
-            # Process pairs
-            self.multiprocess_pairs()
-
             # Process data
-            self.multiprocess_data()
+            rows = self.multiprocess_data()
 
         else:
-            # Process pairs
-            self.singleprocess_pairs()
-
             # Process data
-            self.singleprocess_data()
-
-
-def _process_kvps_exception(pattoo_db_records):
-    """Get all the key-value pairs found.
-
-    Traps any exceptions and return them for processing. Very helpful in
-    troubleshooting multiprocessing
-
-    Args:
-        pattoo_db_records: List of dicts read from cache files.
-
-    Returns:
-        None
-
-    """
-    # Initialize key variables
-    result = []
-
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-
-    Though SQLAlchemy isn't used by key_value_pairs. It's added as a
-    future precaution in case it does.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
-
-    # Execute
-    try:
-        result = get.key_value_pairs(pattoo_db_records)
-    except Exception as error:
-        _exception = sys.exc_info()
-        log.log2exception(20133, _exception)
-        return ExceptionWrapper(error)
-    except:
-        _exception = sys.exc_info()
-        log.log2exception_die(20111, _exception)
-
-    # Return
-    return result
+            rows = self.singleprocess_data()
+        return rows
 
 
 def _process_data_exception(pattoo_db_records):
@@ -277,25 +191,15 @@ def _process_data_exception(pattoo_db_records):
         pattoo_db_records: List of dicts read from cache files.
 
     Returns:
-        None
+        result: Number of Data table rows inserted
 
     """
     # Initialize
-
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
+    result = 0
 
     # Execute
     try:
-        process_db_records(pattoo_db_records)
+        result = process_db_records(pattoo_db_records)
     except Exception as error:
         _exception = sys.exc_info()
         log.log2exception(20132, _exception)
@@ -305,7 +209,7 @@ def _process_data_exception(pattoo_db_records):
         log.log2exception_die(20109, _exception)
 
     # Return
-    return None
+    return result
 
 
 def process_db_records(pattoo_db_records):
@@ -315,7 +219,7 @@ def process_db_records(pattoo_db_records):
         pattoo_db_records: List of dicts read from cache files.
 
     Returns:
-        None
+        rows: Number of Data table rows inserted
 
     Method:
         1) Get all the idx_datapoint and idx_pair values that exist in the
@@ -324,23 +228,26 @@ def process_db_records(pattoo_db_records):
         2) Add these idx values to tracking memory variables for speedy lookup
         3) Ignore non numeric data values sent
         4) Add data to the database. If new checksum values are found in the
-           PattooDBrecord data, then create the new index values to the
-           database, update the tracking memory variables before hand.
+           PattooDBrecord data, then create the new index values in the
+           database in bulk and update the tracking memory variables.
 
     """
     # Initialize key variables
     _data = {}
+    rows = 0
+    glue_batch = glue.Batch()
 
     # Return if there is nothint to process
     if bool(pattoo_db_records) is False:
-        return
+        return rows
 
     # Get DataPoint.idx_datapoint and idx_pair values from db. This is used to
     # speed up the process by reducing the need for future database access.
     agent_id = pattoo_db_records[0].pattoo_agent_id
     checksum_table = misc.agent_checksums(agent_id)
 
-    # Process data
+    # Only insert numeric values
+    items = []
     for pdbr in pattoo_db_records:
         # We only want to insert non-string, non-None values
         if pdbr.pattoo_data_type in [DATA_NONE, DATA_STRING]:
@@ -351,30 +258,44 @@ def process_db_records(pattoo_db_records):
             float_value = float(pdbr.pattoo_value)
         except:
             continue
+        items.append((pdbr, float_value))
+
+    # Entries not in database. Update the database in bulk and get the
+    # required idx_datapoint values
+    _new = [pdbr for pdbr, _ in items if (
+        pdbr.pattoo_checksum not in checksum_table)]
+    if bool(_new) is True:
+        idx_datapoints = datapoint.idx_datapoints(_new)
+        kvps = {}
+        for pdbr in _new:
+            if pdbr.pattoo_checksum not in idx_datapoints:
+                continue
+            if pdbr.pattoo_checksum in checksum_table:
+                continue
+
+            # Update the lookup table
+            checksum_table[
+                pdbr.pattoo_checksum] = ChecksumLookup(
+                    idx_datapoint=idx_datapoints[pdbr.pattoo_checksum],
+                    polling_interval=int(
+                        pdbr.pattoo_agent_polling_interval),
+                    last_timestamp=1)
+            kvps[pdbr.pattoo_checksum] = get.key_value_pairs(pdbr)
+
+        # Queue updates to the Glue table
+        idx_pairs = pair.insert_rows(
+            [_ for values in kvps.values() for _ in values])
+        for checksum, values in kvps.items():
+            glue_batch.add(
+                idx_datapoints[checksum],
+                sorted([idx_pairs[_] for _ in values]))
 
+    # Process data
+    for pdbr, float_value in items:
         # Get the idx_datapoint value for the PattooDBrecord
-        if pdbr.pattoo_checksum in checksum_table:
-            # Get last_timestamp for existing idx_datapoint entry
-            idx_datapoint = checksum_table[
-                pdbr.pattoo_checksum].idx_datapoint
-        else:
-            # Entry not in database. Update the database and get the
-            # required idx_datapoint
-            idx_datapoint = datapoint.idx_datapoint(pdbr)
-            if bool(idx_datapoint) is True:
-                # Update the lookup table
-                checksum_table[
-                    pdbr.pattoo_checksum] = ChecksumLookup(
-                        idx_datapoint=idx_datapoint,
-                        polling_interval=int(
-                            pdbr.pattoo_agent_polling_interval),
-                        last_timestamp=1)
-
-                # Update the Glue table
-                idx_pairs = get.pairs(pdbr)
-                glue.insert_rows(idx_datapoint, idx_pairs)
-            else:
-                continue
+        if pdbr.pattoo_checksum not in checksum_table:
+            continue
+        idx_datapoint = checksum_table[pdbr.pattoo_checksum].idx_datapoint
 
         # Append item to items
         if pdbr.pattoo_timestamp > checksum_table[
@@ -397,11 +318,16 @@ def process_db_records(pattoo_db_records):
                     timestamp=pdbr.pattoo_timestamp,
                     value=float_value)
 
+    # Update the Glue table
+    glue_batch.flush()
+
     # Update the data table
     if bool(_data) is True:
-        data.insert_rows(list(_data.values()))
+        rows = data.insert_rows(list(_data.values()))
 
     # Log message
     log_message = ('''\
-Finished cache data processing for agent_id: {}'''.format(agent_id))
+Finished cache data processing for agent_id: {}. Checksum cache hits: {}, \
+misses: {}'''.format(agent_id, misc.CACHE.hits, misc.CACHE.misses))
     log.log2debug(20113, log_message)
+    return rows
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Pattoo classes that manage a persistent pool of ingest processes."""
+
+# Standard imports
+from multiprocessing import get_context, cpu_count
+import importlib
+import zlib
+import queue
+
+# Import project libraries
+from pattoo_shared import log
+
+
+class WorkerPool():
+    """Long lived pool of ingest sub processes.
+
+    Work is sent to each sub process over its own queue. Work with the same
+    key is always sent to the same sub process, which allows data cached by a
+    sub process for an agent to be reused.
+
+    """
+
+    def __init__(self, processes=None):
+        """Initialize the class.
+
+        Args:
+            processes: Number of sub processes. Defaults to the CPU count
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._context = get_context('spawn')
+        self._size = max(1, processes or cpu_count())
+        self._tasks = []
+        self._workers = []
+        self._results = None
+
+    def start(self):
+        """Start the sub processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Do nothing if already started
+        if bool(self._workers) is True:
+            return
+
+        # Start
+        self._results = self._context.Queue()
+        for _ in range(self._size):
+            tasks = self._context.Queue()
+            worker = self._context.Process(
+                target=_worker, args=(tasks, self._results), daemon=True)
+            worker.start()
+            self._tasks.append(tasks)
+            self._workers.append(worker)
+
+    def stop(self, timeout=10):
+        """Stop the sub processes.
+
+        Args:
+            timeout: Time to wait for each sub process to stop
+
+        Returns:
+            None
+
+        """
+        # Tell the sub processes to stop
+        for tasks in self._tasks:
+            tasks.put(None)
+
+        # Wait for them
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive() is True:
+                worker.terminate()
+                worker.join()
+
+        # Reset
+        self._tasks = []
+        self._workers = []
+        self._results = None
+
+        # Log
+        log_message = 'Ingester worker pool stopped.'
+        log.log2debug(20164, log_message)
+
+    def starmap(self, function, arguments, keys=None):
+        """Apply a function to each tuple of arguments using the sub processes.
+
+        Args:
+            function: Module level function to run
+            arguments: List of argument tuples
+            keys: List of strings used to select the sub process for each
+                tuple of arguments. Tuples are evenly spread over the sub
+                processes if None.
+
+        Returns:
+            result: List of function results in the order of arguments
+
+        """
+        # Start if necessary
+        self.start()
+
+        # Send the work to the sub processes
+        for index, args in enumerate(arguments):
+            if keys is None:
+                worker = index % self._size
+            else:
+                worker = zlib.crc32(keys[index].encode()) % self._size
+            self._tasks[worker].put((index, function, args))
+
+        # Get the results
+        result = [None] * len(arguments)
+        for _ in range(len(arguments)):
+            while True:
+                try:
+                    (index, value) = self._results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    self._check()
+            result[index] = value
+        return result
+
+    def _check(self):
+        """Make sure all the sub processes are running.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        for worker in self._workers:
+            if worker.is_alive() is False:
+                log_message = ('''\
+Ingester worker process {} unexpectedly stopped with exit code {}\
+'''.format(worker.pid, worker.exitcode))
+                log.log2die(20165, log_message)
+
+
+def _worker(tasks, results):
+    """Process work sent by a WorkerPool.
+
+    Args:
+        tasks: Queue of (index, function, arguments) tuples
+        results: Queue of (index, result) tuples
+
+    Returns:
+        None
+
+    """
+    # Create the database engine once for the life of the process
+    importlib.import_module('pattoo.db')
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        (index, function, args) = task
+        results.put((index, function(*args)))
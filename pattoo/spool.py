@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Pattoo classes that manage the spool of posted agent data.
+
+Posted data is appended to segment files as length prefixed JSON records.
+Each writing process has its own active segment which is renamed when it is
+rotated. The ingester reads the segments and records how far it has read in
+an offset file for each segment. Completely read segments are deleted after
+rotation.
+
+"""
+
+# Standard imports
+import os
+import json
+import time
+import struct
+import threading
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigAgent
+from pattoo.constants import (
+    PATTOO_API_AGENT_NAME, SPOOL_DIRECTORY_NAME, SPOOL_SEGMENT_AGE)
+
+# Record header containing the length of the record
+_HEADER = struct.Struct('>I')
+
+# File extensions
+_ACTIVE = '.active'
+_ROTATED = '.spool'
+_OFFSET = '.offset'
+
+# Writers used by this process keyed by spool directory
+_WRITERS = {}
+_LOCK = threading.Lock()
+
+
+class Writer():
+    """Append records to the spool."""
+
+    def __init__(self, _directory, segment_size=67108864, fsync_interval=1):
+        """Initialize the class.
+
+        Args:
+            _directory: Spool directory
+            segment_size: Size in bytes after which segments are rotated
+            fsync_interval: Minimum time in seconds between each fsync of
+                the segment file
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = _directory
+        self._segment_size = segment_size
+        self._fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fp = None
+        self._basename = None
+        self._milliseconds = 0
+        self._created = 0
+        self._synced = 0
+
+    def append(self, data):
+        """Append a record to the spool.
+
+        Args:
+            data: JSON serializable object
+
+        Returns:
+            None
+
+        """
+        # Append
+        self.extend([data])
+
+    def extend(self, items):
+        """Append records to the spool using a single write.
+
+        Args:
+            items: List of JSON serializable objects
+
+        Returns:
+            None
+
+        """
+        # Create records
+        records = []
+        for data in items:
+            payload = json.dumps(data).encode()
+            records.append(_HEADER.pack(len(payload)) + payload)
+        if bool(records) is False:
+            return
+        record = b''.join(records)
+
+        with self._lock:
+            # Rotate the segment if necessary
+            now = time.time()
+            if self._fp is not None:
+                if (self._fp.tell() >= self._segment_size) or (
+                        now - self._created >= SPOOL_SEGMENT_AGE):
+                    self._rotate()
+
+            # Create a new segment if necessary
+            if self._fp is None:
+                # Segment names must be unique even if rotated quickly
+                self._milliseconds = max(
+                    int(now * 1000), self._milliseconds + 1)
+                self._basename = '{}_{}'.format(
+                    str(self._milliseconds).zfill(13), os.getpid())
+                self._fp = open(
+                    _filepath(self._directory, self._basename, _ACTIVE), 'ab')
+                self._created = now
+
+            # Write the record. It is readable by the ingester once flushed
+            self._fp.write(record)
+            self._fp.flush()
+
+            # Sync to disk in batches
+            if now - self._synced >= self._fsync_interval:
+                os.fsync(self._fp.fileno())
+                self._synced = now
+
+    def close(self):
+        """Close the active segment.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            if self._fp is not None:
+                self._rotate()
+
+    def _rotate(self):
+        """Close the active segment and mark it as rotated.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.close()
+        self._fp = None
+
+        # Rename. The ingester may have deleted an idle segment.
+        try:
+            os.rename(
+                _filepath(self._directory, self._basename, _ACTIVE),
+                _filepath(self._directory, self._basename, _ROTATED))
+        except FileNotFoundError:
+            pass
+
+
+class Reader():
+    """Read records from the spool.
+
+    Only data present in the spool when the class is instantiated is read.
+    This prevents a continuous stream of new data from stopping the reader.
+
+    """
+
+    def __init__(self, _directory):
+        """Initialize the class.
+
+        Args:
+            _directory: Spool directory
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = _directory
+        self._limits = {}
+        self._positions = {}
+
+        # Get the amount of data in each segment
+        for basename, (filepath, _) in sorted(
+                _segments(_directory).items()):
+            self._limits[basename] = os.path.getsize(filepath)
+            self._positions[basename] = _offset(_directory, basename)
+
+    def pending(self):
+        """Determine whether there is unread data.
+
+        Args:
+            None
+
+        Returns:
+            result: True if there is unread data
+
+        """
+        # Return
+        for basename, limit in self._limits.items():
+            if self._positions[basename] < limit:
+                return True
+        return False
+
+    def read(self, count):
+        """Read records from the spool.
+
+        Args:
+            count: Maximum number of records to read
+
+        Returns:
+            result: Tuple of a sorted list of (key, JSON) tuples and a dict
+                of segment offsets to pass to commit() after the records
+                have been processed
+
+        """
+        # Initialize key variables
+        records = []
+        marker = {}
+
+        # Read
+        for key, data, (basename, position) in self.records(count):
+            if data is not None:
+                records.append((key, data))
+            marker[basename] = position
+
+        # Return
+        return (records, marker)
+
+    def records(self, count):
+        """Read records from the spool one at a time.
+
+        Args:
+            count: Maximum number of records to read
+
+        Yields:
+            result: Tuple of the record key, the record JSON and a tuple of
+                the segment name and the offset after the record. The JSON
+                is None if the record is invalid
+
+        """
+        # Initialize key variables
+        found = 0
+
+        for basename, limit in sorted(self._limits.items()):
+            # Skip segments that have been read
+            position = self._positions[basename]
+            if position >= limit or found >= count:
+                continue
+
+            # Read data from the segment
+            filepath = _segments(self._directory).get(basename, (None,))[0]
+            if filepath is None:
+                continue
+            with open(filepath, 'rb') as f_handle:
+                f_handle.seek(position)
+
+                while found < count:
+                    # Stop at partially written records
+                    if position + _HEADER.size > limit:
+                        break
+                    (length,) = _HEADER.unpack(f_handle.read(_HEADER.size))
+                    end = position + _HEADER.size + length
+                    if end > limit:
+                        break
+                    payload = f_handle.read(length)
+
+                    # Read the record
+                    key = '{}:{}'.format(basename, str(position).zfill(20))
+                    try:
+                        data = json.loads(payload.decode())
+                    except:
+                        log_message = ('''\
+Invalid record in spool segment {} at offset {}. Ignoring.\
+'''.format(filepath, position))
+                        log.log2warning(20173, log_message)
+                        data = None
+
+                    # Update the position
+                    position = end
+                    self._positions[basename] = position
+                    found += 1
+                    yield (key, data, (basename, position))
+
+    def commit(self, marker):
+        """Record that records have been processed.
+
+        Args:
+            marker: Dict of segment offsets returned by read()
+
+        Returns:
+            None
+
+        """
+        # Get the latest segment data
+        segments = _segments(self._directory)
+        now = time.time()
+
+        for basename, position in sorted(marker.items()):
+            # Save the offset
+            filepath = _filepath(self._directory, basename, _OFFSET)
+            temp_filepath = '{}.tmp'.format(filepath)
+            with open(temp_filepath, 'w') as f_handle:
+                f_handle.write(str(position))
+            os.replace(temp_filepath, filepath)
+
+            # Nothing more to do if the segment doesn't exist
+            if basename not in segments:
+                continue
+            (segment, extension) = segments[basename]
+
+            # Delete segments that have been completely read. Active
+            # segments that have been idle for too long belong to writers
+            # that have stopped. Writers rotate these before writing again.
+            if position < os.path.getsize(segment):
+                continue
+            if extension == _ACTIVE and (
+                    now - os.path.getmtime(segment) < 2 * SPOOL_SEGMENT_AGE):
+                continue
+            for _filepath_ in [segment, filepath]:
+                try:
+                    os.remove(_filepath_)
+                except FileNotFoundError:
+                    pass
+
+
+def directory(config=None):
+    """Get the spool directory, creating it if necessary.
+
+    Args:
+        config: ConfigAgent object
+
+    Returns:
+        result: Spool directory
+
+    """
+    # Get directory
+    if config is None:
+        config = ConfigAgent()
+    result = '{}{}{}'.format(
+        config.agent_cache_directory(PATTOO_API_AGENT_NAME), os.sep,
+        SPOOL_DIRECTORY_NAME)
+    os.makedirs(result, mode=0o775, exist_ok=True)
+    return result
+
+
+def append(data, config=None):
+    """Append posted agent data to the spool.
+
+    Args:
+        data: JSON serializable object
+        config: ConfigAgent object
+
+    Returns:
+        None
+
+    """
+    # Append
+    extend([data], config=config)
+
+
+def extend(items, config=None):
+    """Append a list of posted agent data to the spool in a single write.
+
+    Args:
+        items: List of JSON serializable objects
+        config: ConfigAgent object
+
+    Returns:
+        None
+
+    """
+    # Get the writer for this process. Don't reuse writers created by a
+    # parent process.
+    if config is None:
+        config = ConfigAgent()
+    _directory = directory(config=config)
+    key = (_directory, os.getpid())
+    with _LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None:
+            writer = Writer(
+                _directory,
+                segment_size=config.spool_segment_size(),
+                fsync_interval=config.spool_fsync_interval())
+            _WRITERS[key] = writer
+
+    # Append
+    writer.extend(items)
+
+
+def close():
+    """Close the spool segments written by this process.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Close
+    with _LOCK:
+        for writer in _WRITERS.values():
+            writer.close()
+        _WRITERS.clear()
+
+
+def _segments(_directory):
+    """Get the segments in the spool directory.
+
+    Args:
+        _directory: Spool directory
+
+    Returns:
+        result: Dict of (filepath, extension) tuples keyed by segment name
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Get segments
+    if os.path.isdir(_directory) is False:
+        return result
+    for filename in os.listdir(_directory):
+        (basename, extension) = os.path.splitext(filename)
+        if extension in [_ACTIVE, _ROTATED]:
+            result[basename] = (
+                '{}{}{}'.format(_directory, os.sep, filename), extension)
+    return result
+
+
+def _offset(_directory, basename):
+    """Get the number of bytes of a segment that have been read.
+
+    Args:
+        _directory: Spool directory
+        basename: Segment name
+
+    Returns:
+        result: Offset
+
+    """
+    # Read file
+    try:
+        with open(_filepath(_directory, basename, _OFFSET), 'r') as f_handle:
+            result = int(f_handle.read().strip())
+    except:
+        result = 0
+    return result
+
+
+def _filepath(_directory, basename, extension):
+    """Create a spool filepath.
+
+    Args:
+        _directory: Spool directory
+        basename: Segment name
+        extension: File extension
+
+    Returns:
+        result: Filepath
+
+    """
+    # Return
+    result = '{}{}{}{}'.format(_directory, os.sep, basename, extension)
+    return result
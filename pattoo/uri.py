@@ -18,11 +18,27 @@ def chart_timestamp_args(idx_datapoint, secondsago=None):
     Returns:
         result: Starting time
 
+    """
+    # Calculate start
+    datapoint = DataPoint(idx_datapoint)
+    result = timestamp_start(datapoint.polling_interval(), secondsago)
+    return result
+
+
+def timestamp_start(polling_interval, secondsago=None):
+    """Calculate the starting time of charts.
+
+    Args:
+        polling_interval: Polling interval of the DataPoint
+        secondsago: Number of seconds in the past to calculate start and
+            stop times for charts
+
+    Returns:
+        result: Starting time
+
     """
     # Calculate stop. This takes into account the ingester cycle and subtracts
     # a few extra seconds to prevent zero values at the end.
-    datapoint = DataPoint(idx_datapoint)
-    polling_interval = datapoint.polling_interval()
     now = normalized_timestamp(polling_interval, int(time.time() * 1000))
 
     # Calculate start
@@ -34,3 +50,28 @@ def chart_timestamp_args(idx_datapoint, secondsago=None):
 
     # Return
     return result
+
+
+def resolution(secondsago=None, points=None):
+    """Calculate the interval between the values of charts.
+
+    Args:
+        secondsago: Number of seconds in the past to calculate start and
+            stop times for charts
+        points: Number of values required by the chart
+
+    Returns:
+        result: Interval in milliseconds. None if points isn't specified
+
+    """
+    # Return nothing if the number of values isn't limited
+    if isinstance(points, int) is False or points < 1:
+        return None
+
+    # Calculate the interval using the same default as timestamp_start
+    if bool(secondsago) is True and isinstance(secondsago, int) is True:
+        seconds = abs(secondsago)
+    else:
+        seconds = 3600 * 24 * 7
+    result = (seconds * 1000) // points
+    return result
@@ -15,7 +15,8 @@ from pattoo.configuration import ConfigPattoo as Config
 from pattoo.db import URL
 from pattoo.db.models import BASE
 from pattoo.db.table import (
-   language, pair_xlate_group, pair_xlate, agent_xlate, user, chart, favorite)
+   language, pair_xlate_group, pair_xlate, agent_xlate, user, chart, favorite,
+   rollup)
 from pattoo.constants import DbRowUser, DbRowChart, DbRowFavorite
 
 
@@ -434,6 +435,11 @@ authentication is correct.'''.format(config.db_name(), config.db_hostname()))
     print('Creating database tables.')
     BASE.metadata.create_all(engine)
 
+    # Create the rollups of data ingested before they existed. This also
+    # finishes backfills that failed.
+    print('Creating rollups of existing data.')
+    rollup.backfill()
+
 
 def install():
     """
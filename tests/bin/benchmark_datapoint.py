@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmark the conversion of Data table rows into DataPoint time series.
+
+Reports the time needed to convert a day, a week and a month of rows into
+the JSON returned by the API. Rows are created in memory, the database
+isn't used.
+
+"""
+
+from __future__ import print_function
+import os
+import sys
+import time
+import json
+import argparse
+import collections
+from decimal import Decimal
+from random import random
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# PIP3 imports
+import numpy as np
+
+# pattoo libraries
+from pattoo_shared import times
+from pattoo_shared.constants import (
+    DATA_INT, DATA_FLOAT, DATA_COUNT64, DATA_COUNT)
+from pattoo.db.table import datapoint
+
+# Rows returned by the database
+Row = collections.namedtuple('Row', 'timestamp value')
+
+
+def main():
+    """Run the benchmark.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    args = arguments()
+    polling_interval = args.polling_interval * 1000
+    ranges = [('day', 86400), ('week', 604800), ('month', 2592000)]
+    methods = [('dict', _legacy_values), ('current', datapoint._values)]
+
+    # Print header
+    print('''
+Polling interval: {}s, Repeats: {}
+'''.format(args.polling_interval, args.repeats))
+    print('{:<8} {:<10} {:<10} {:>10} {:>10}'.format(
+        'Range', 'Data Type', 'Method', 'Values', 'Seconds'))
+
+    # Do the benchmark
+    for name, seconds in ranges:
+        ts_stop = times.normalized_timestamp(
+            polling_interval, int(time.time() * 1000))
+        ts_start = ts_stop - (seconds * 1000)
+        rows = _rows(ts_start, ts_stop, polling_interval)
+
+        for data_type in [DATA_FLOAT, DATA_COUNT64]:
+            for method_name, method in methods:
+                # Convert rows to JSON
+                start = time.time()
+                for _ in range(args.repeats):
+                    result = method(
+                        rows, data_type, polling_interval, ts_start, ts_stop)
+                    json.dumps(result)
+                duration = (time.time() - start) / args.repeats
+
+                print('{:<8} {:<10} {:<10} {:>10} {:>10.3f}'.format(
+                    name, 'counter' if data_type == DATA_COUNT64 else 'float',
+                    method_name, len(result), duration))
+
+
+def arguments():
+    """Get the CLI arguments.
+
+    Args:
+        None
+
+    Returns:
+        args: NamedTuple of argument values
+
+    """
+    # Get arguments
+    parser = argparse.ArgumentParser(
+        description='Benchmark the creation of DataPoint time series.')
+    parser.add_argument(
+        '-p', '--polling_interval',
+        default=10,
+        type=int,
+        help='The polling interval in seconds. Default=10')
+    parser.add_argument(
+        '-r', '--repeats',
+        default=3,
+        type=int,
+        help='The number of times to repeat each test. Default=3')
+
+    # Return
+    args = parser.parse_args()
+    return args
+
+
+def _rows(ts_start, ts_stop, polling_interval):
+    """Create Data table rows with a few gaps.
+
+    Args:
+        ts_start: Start time
+        ts_stop: Stop time
+        polling_interval: Polling interval
+
+    Returns:
+        result: List of Row objects
+
+    """
+    # Return
+    result = []
+    value = 0
+    for timestamp in range(ts_start, ts_stop + 1, polling_interval):
+        value += int(random() * 1000)
+        if random() > 0.01:
+            result.append(
+                Row(timestamp=timestamp + 17, value=Decimal(value) / 7))
+    return result
+
+
+def _legacy_values(rows, data_type, polling_interval, ts_start, ts_stop):
+    """Convert rows using dicts keyed by timestamp.
+
+    This is how pattoo.db.table.datapoint._values worked before it used
+    numpy arrays throughout. It is kept for comparison.
+
+    Args:
+        rows: Data table rows sorted by timestamp
+        data_type: Type of data
+        polling_interval: Polling interval
+        ts_start: Normalized start time
+        ts_stop: Stop time
+
+    Returns:
+        result: List of key-value pair dicts
+
+    """
+    # Initialize key variables
+    places = 10
+    result = []
+
+    # Make sure we have entries for entire time range
+    timestamps = times.timestamps(ts_start, ts_stop, polling_interval)
+    nones = {_key: None for _key in timestamps}
+
+    # Put values into a dict for ease of processing
+    for row in rows:
+        timestamp = times.normalized_timestamp(
+            polling_interval, row.timestamp)
+        nones[timestamp] = round(float(row.value), places)
+
+    if data_type in [DATA_INT, DATA_FLOAT]:
+        for timestamp, value in sorted(nones.items()):
+            result.append({'timestamp': timestamp, 'value': value})
+
+    elif data_type in [DATA_COUNT64, DATA_COUNT] and len(rows) > 1:
+        _timestamps = []
+        values = []
+        for timestamp, value in sorted(nones.items()):
+            _timestamps.append(timestamp)
+            values.append(value)
+        deltas = np.abs(np.diff(np.array(values).astype(float)))
+        for key, delta in enumerate(deltas):
+            if np.isnan(delta):
+                tps = None
+            else:
+                tps = round((delta / polling_interval) * 1000, places)
+            result.append({'timestamp': _timestamps[key + 1], 'value': tps})
+
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Benchmark the insertion of ingested data into the database.
+
+Reports the number of database transactions and the time needed to insert
+a single ingest cycle's worth of data for a number of datapoints.
+
+The unittest database is used. Run the unittest_setup.py script first.
+
+"""
+
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+from random import random
+from operator import attrgetter
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# PIP3 imports
+from sqlalchemy import and_, event
+
+# pattoo libraries
+from pattoo_shared import data as lib_data
+from pattoo_shared.constants import DATA_FLOAT
+from pattoo.constants import IDXTimestampValue
+from pattoo.db import POOL
+from pattoo.db import db
+from pattoo.db.models import Data, DataPoint
+from pattoo.db.table import agent, datapoint, data
+
+
+class Transactions():
+    """Count the database transactions committed."""
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.count = 0
+        event.listen(POOL, 'after_commit', self._increment)
+
+    def _increment(self, _):
+        """Increment the counter.
+
+        Args:
+            _: Session object
+
+        Returns:
+            None
+
+        """
+        self.count += 1
+
+
+def main():
+    """Run the benchmark.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    args = arguments()
+    polling_interval = 300000
+    timestamp = int(time.time() * 1000) - (
+        2 * args.samples * polling_interval)
+    transactions = Transactions()
+    methods = [
+        ('per-datapoint', _legacy_insert_rows),
+        ('current', data.insert_rows)]
+
+    # Create the datapoints
+    idx_datapoints = _datapoints(args.datapoints, polling_interval)
+
+    # Print header
+    print('''
+Datapoints: {}, Samples per datapoint: {}
+'''.format(args.datapoints, args.samples))
+    print('{:<15} {:>12} {:>10} {:>15}'.format(
+        'Method', 'Transactions', 'Seconds', 'Rows / Second'))
+
+    # Do the benchmark
+    for name, method in methods:
+        items = _items(
+            idx_datapoints, timestamp, args.samples, polling_interval)
+        timestamp += args.samples * polling_interval
+
+        # Insert
+        transactions.count = 0
+        start = time.time()
+        method(items)
+        duration = time.time() - start
+
+        print('{:<15} {:>12} {:>10.3f} {:>15.0f}'.format(
+            name, transactions.count, duration, len(items) / duration))
+
+
+def arguments():
+    """Get the CLI arguments.
+
+    Args:
+        None
+
+    Returns:
+        args: NamedTuple of argument values
+
+    """
+    # Get arguments
+    parser = argparse.ArgumentParser(
+        description='Benchmark the insertion of ingested data.')
+    parser.add_argument(
+        '-d', '--datapoints',
+        default=1000,
+        type=int,
+        help='The number of datapoints to create. Default=1000')
+    parser.add_argument(
+        '-s', '--samples',
+        default=10,
+        type=int,
+        help='The number of samples per datapoint to insert. Default=10')
+
+    # Return
+    args = parser.parse_args()
+    return args
+
+
+def _datapoints(count, polling_interval):
+    """Create DataPoint table entries for the benchmark.
+
+    Args:
+        count: Number of entries to create
+        polling_interval: Polling interval
+
+    Returns:
+        result: List of idx_datapoint values
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Create a new Agent entry
+    agent_id = lib_data.hashstring(str(random()))
+    agent_target = lib_data.hashstring(str(random()))
+    agent_program = lib_data.hashstring(str(random()))
+    idx_agent = agent.idx_agent(agent_id, agent_target, agent_program)
+
+    # Create the datapoints
+    for _ in range(count):
+        checksum = lib_data.hashstring(str(random()))
+        datapoint.insert_row(
+            checksum, DATA_FLOAT, polling_interval, idx_agent)
+        result.append(datapoint.checksum_exists(checksum))
+    return result
+
+
+def _items(idx_datapoints, timestamp, samples, polling_interval):
+    """Create data to insert.
+
+    Args:
+        idx_datapoints: List of idx_datapoint values
+        timestamp: Starting timestamp
+        samples: Number of samples per datapoint
+        polling_interval: Polling interval
+
+    Returns:
+        result: List of IDXTimestampValue objects
+
+    """
+    # Return
+    result = []
+    for idx_datapoint in idx_datapoints:
+        for sample in range(samples):
+            result.append(
+                IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=polling_interval,
+                    timestamp=timestamp + (sample * polling_interval),
+                    value=random() * 100))
+    return result
+
+
+def _legacy_insert_rows(items):
+    """Insert data using one last_timestamp transaction per datapoint.
+
+    This is how pattoo.db.table.data.insert_rows worked before the
+    last_timestamp updates were combined. It is kept for comparison.
+
+    Args:
+        items: List of IDXTimestampValue objects
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _rows = []
+    last_timestamps = {}
+    polling_intervals = {}
+
+    # Update the data
+    for item in sorted(items, key=attrgetter('timestamp')):
+        _rows.append(
+            Data(idx_datapoint=item.idx_datapoint,
+                 timestamp=item.timestamp,
+                 value=round(item.value, 10)))
+        last_timestamps[item.idx_datapoint] = max(
+            item.timestamp, last_timestamps.get(item.idx_datapoint, 0))
+        polling_intervals[item.idx_datapoint] = item.polling_interval
+
+    # Update the last_timestamp
+    for idx_datapoint, timestamp in last_timestamps.items():
+        with db.db_modify(20158, die=False) as session:
+            session.query(DataPoint).filter(
+                and_(DataPoint.idx_datapoint == idx_datapoint,
+                     DataPoint.enabled == 1)).update(
+                         {'last_timestamp': timestamp,
+                          'polling_interval': int(
+                            polling_intervals[idx_datapoint])}
+                     )
+
+    # Insert the data
+    with db.db_modify(20159, die=True) as session:
+        session.add_all(_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Test pattoo agent API admission control."""
+
+import os
+import unittest
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.api.agents import admission, dedup
+from pattoo.configuration import ConfigAgent
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Config(ConfigAgent):
+    """ConfigAgent with a small cache limit in a temporary directory."""
+
+    def __init__(self, directory):
+        """Initialize the class."""
+        ConfigAgent.__init__(self)
+        self.directory = directory
+
+    def agent_cache_directory(self, agent_program):
+        """Get agent_cache_directory.
+
+        Args:
+            agent_program: Name of agent program
+
+        Returns:
+            result: result
+
+        """
+        return self.directory
+
+    def cache_high_water_files(self):
+        """Get cache_high_water_files.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 4
+
+
+def _write(directory, count):
+    """Create files of 10 bytes in a directory."""
+    for index in range(count):
+        with open('{}{}{}.json'.format(
+                directory, os.sep, index), 'w') as f_handle:
+            f_handle.write('0123456789')
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Reset the admission state."""
+        admission._STATE.update(
+            {'throttled': False, 'depth': (0, 0), 'timestamp': 0,
+             'scanning': False})
+
+    def tearDown(self):
+        """Reset the admission state."""
+        self.setUp()
+
+    def test_admit(self):
+        """Testing function admit."""
+        # No limits by default
+        self.assertTrue(admission.admit(ConfigAgent()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            config = _Config(directory)
+            _write(directory, 4)
+            self.assertTrue(admission.admit(config))
+
+            # Posts are refused above the high water mark
+            _write(directory, 5)
+            admission._STATE['timestamp'] = 0
+            self.assertFalse(admission.admit(config))
+
+            # Posts are refused until the low water mark is reached
+            os.remove('{}{}4.json'.format(directory, os.sep))
+            admission._STATE['timestamp'] = 0
+            self.assertFalse(admission.admit(config))
+            os.remove('{}{}3.json'.format(directory, os.sep))
+            admission._STATE['timestamp'] = 0
+            self.assertTrue(admission.admit(config))
+
+    def test_depth(self):
+        """Testing function depth."""
+        with tempfile.TemporaryDirectory() as directory:
+            config = _Config(directory)
+            _write(directory, 2)
+            self.assertEqual(admission.depth(config), (2, 20))
+
+            # Measurements are reused for a short time
+            _write(directory, 3)
+            self.assertEqual(admission.depth(config), (2, 20))
+            admission._STATE['timestamp'] = 0
+            self.assertEqual(admission.depth(config), (3, 30))
+
+    def test_depth_scanning(self):
+        """Testing function depth."""
+        # Initialize key variables
+        results = []
+
+        def _depth(directory):
+            """Measure the cache while recording the state."""
+            results.append(admission._LOCK.locked())
+            results.append(admission.depth(config))
+            return (2, 20)
+
+        # The cache is measured without holding the lock. Other threads
+        # get the last measurement meanwhile.
+        with tempfile.TemporaryDirectory() as directory:
+            config = _Config(directory)
+            admission._STATE['depth'] = (1, 10)
+            with patch('pattoo.api.agents.admission._depth', new=_depth):
+                before = time.time()
+                self.assertEqual(admission.depth(config), (2, 20))
+            self.assertEqual(results, [False, (1, 10)])
+
+            # The time of the measurement is when it finished
+            self.assertGreaterEqual(admission._STATE['timestamp'], before)
+            self.assertFalse(admission._STATE['scanning'])
+
+    def test_status(self):
+        """Testing function status."""
+        dedup._HITS.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            _write(directory, 2)
+            result = admission.status(_Config(directory))
+            self.assertEqual(result, '''\
+The Pattoo Agent API is Operational.
+Cache files: 2
+Cache bytes: 20
+Duplicate posts: 0
+''')
+
+    def test__depth(self):
+        """Testing function _depth."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Subdirectories, such as the spool, are included
+            subdirectory = '{}{}spool'.format(directory, os.sep)
+            os.mkdir(subdirectory)
+            _write(directory, 2)
+            _write(subdirectory, 1)
+            self.assertEqual(admission._depth(directory), (3, 30))
+            self.assertEqual(
+                admission._depth('{}{}missing'.format(directory, os.sep)),
+                (0, 0))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
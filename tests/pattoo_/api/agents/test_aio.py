@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Test pattoo asyncio agent API server."""
+
+import os
+import unittest
+import sys
+import json
+import gzip
+
+# PIP3 imports
+from aiohttp.test_utils import AioHTTPTestCase
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import converter, files
+from pattoo_shared.constants import PATTOO_API_AGENT_PREFIX
+from pattoo.api.agents import aio
+from pattoo.configuration import ConfigAgent
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from tests.libraries.configuration import UnittestConfig
+from tests.pattoo_.api.agents.test_post import _create_apd
+
+
+class _ConfigSmall(ConfigAgent):
+    """ConfigAgent that only accepts small posts."""
+
+    def max_post_size(self):
+        """Get max_post_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 1048576
+
+    def max_decoded_size(self):
+        """Get max_decoded_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 1048576
+
+
+class TestBasicFunctions(AioHTTPTestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    async def get_application(self):
+        """Create the test application.
+
+        Args:
+            None
+
+        Returns:
+            app: aiohttp.web.Application object
+
+        """
+        # Return
+        return aio.create_app(config=_ConfigSmall())
+
+    def test_create_app(self):
+        """Testing method / function create_app."""
+        # Tested by the route tests
+        pass
+
+    def test_run(self):
+        """Testing method / function run."""
+        # Tested by the route tests
+        pass
+
+    async def test_receive(self):
+        """Testing method / function receive."""
+        # Initialize key variables
+        config = ConfigAgent()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        apd = _create_apd()
+        expected = json.loads(json.dumps(converter.posting_data_points(
+            converter.agentdata_to_post(apd))))
+        uri = '{}/receive/{}'.format(
+            PATTOO_API_AGENT_PREFIX, apd.agent_id)
+
+        # Post data
+        response = await self.client.request('POST', uri, json=expected)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.text(), 'OK')
+
+        # Test
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 1)
+        self.assertEqual(cache_data[0][1], expected)
+
+        # Invalid data is rejected
+        response = await self.client.request('POST', uri, data='{"a": 1}')
+        self.assertEqual(response.status, 404)
+        response = await self.client.request('POST', uri, data='invalid')
+        self.assertEqual(response.status, 404)
+        self.assertEqual(len(files.read_json_files(cache_directory)), 1)
+
+        # Revert cache_directory
+        for filepath, _ in cache_data:
+            os.remove(filepath)
+
+    async def test_receive_bulk(self):
+        """Testing method / function receive_bulk."""
+        # Initialize key variables
+        config = ConfigAgent()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        expected = []
+        for _ in range(2):
+            expected.append(json.loads(json.dumps(
+                converter.posting_data_points(
+                    converter.agentdata_to_post(_create_apd())))))
+        uri = '{}/bulk/relay'.format(PATTOO_API_AGENT_PREFIX)
+
+        # Post compressed data
+        response = await self.client.request(
+            'POST', uri, data=gzip.compress(json.dumps(expected).encode()))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.text(), 'OK')
+
+        # Test
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 2)
+        self.assertEqual(
+            sorted([json.dumps(_data) for _, _data in cache_data]),
+            sorted([json.dumps(_data) for _data in expected]))
+
+        # Invalid data is rejected
+        response = await self.client.request('POST', uri, data='invalid')
+        self.assertEqual(response.status, 404)
+        response = await self.client.request('POST', uri, data='{"a": 1}')
+        self.assertEqual(response.status, 404)
+
+        # Large posts are rejected, whether compressed or not
+        body = json.dumps(['0' * 1048576]).encode()
+        for data in [body, gzip.compress(body)]:
+            response = await self.client.request('POST', uri, data=data)
+            self.assertEqual(response.status, 413)
+        self.assertEqual(len(files.read_json_files(cache_directory)), 2)
+
+        # Revert cache_directory
+        for filepath, _ in cache_data:
+            os.remove(filepath)
+
+    async def test_status(self):
+        """Testing method / function status."""
+        # Test
+        response = await self.client.request(
+            'GET', '{}/status'.format(PATTOO_API_AGENT_PREFIX))
+        self.assertEqual(response.status, 200)
+        text = await response.text()
+        self.assertTrue(
+            text.startswith('The Pattoo Agent API is Operational.\n'))
+        self.assertTrue('Cache files: ' in text)
+
+    def test__unavailable(self):
+        """Testing method / function _unavailable."""
+        # Test
+        result = aio._unavailable(ConfigAgent())
+        self.assertEqual(result.status, 503)
+        self.assertEqual(result.headers['Retry-After'], '60')
+
+    def test__receive(self):
+        """Testing method / function _receive."""
+        # Tested by test_receive
+        pass
+
+    def test__receive_bulk(self):
+        """Testing method / function _receive_bulk."""
+        # Tested by test_receive_bulk
+        pass
+
+    def test__cleanup(self):
+        """Testing method / function _cleanup."""
+        # Tested by the route tests
+        pass
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
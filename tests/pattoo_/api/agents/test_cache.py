@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Test pattoo agent API cache functions."""
+
+import os
+import unittest
+import sys
+import json
+import gzip
+from unittest.mock import patch
+
+# PIP3 imports
+import zstandard
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import converter, files
+from pattoo.api.agents import cache, dedup
+from pattoo import spool
+from pattoo.configuration import ConfigAgent
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from tests.libraries.configuration import UnittestConfig
+from tests.pattoo_.api.agents.test_post import _create_apd
+
+
+class _ConfigSpool(ConfigAgent):
+    """ConfigAgent that uses the spool."""
+
+    def spool(self):
+        """Get spool.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return True
+
+
+class _ConfigWriteThrough(ConfigAgent):
+    """ConfigAgent that writes directly to the database."""
+
+    def write_through(self):
+        """Get write_through.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return True
+
+
+class _ConfigDedup(ConfigAgent):
+    """ConfigAgent that ignores duplicate posts."""
+
+    def dedup_window(self):
+        """Get dedup_window.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 60
+
+
+class _ConfigSmall(ConfigAgent):
+    """ConfigAgent that only accepts small posts."""
+
+    def max_decoded_size(self):
+        """Get max_decoded_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 1024
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_validate(self):
+        """Testing method / function validate."""
+        # Initialize key variables
+        posted_data = json.loads(json.dumps(converter.posting_data_points(
+            converter.agentdata_to_post(_create_apd()))))
+
+        # Test
+        self.assertTrue(cache.validate(posted_data))
+        self.assertFalse(cache.validate([]))
+        self.assertFalse(cache.validate({'a': 1}))
+        _data = dict(posted_data)
+        _data.pop('pattoo_agent_timestamp')
+        _data['invalid'] = 1
+        self.assertFalse(cache.validate(_data))
+
+    def test_decode(self):
+        """Testing method / function decode."""
+        # Initialize key variables
+        posted_data = [{'one': 1}]
+        body = json.dumps(posted_data).encode()
+
+        # Test
+        self.assertEqual(cache.decode(body), posted_data)
+        self.assertEqual(cache.decode(gzip.compress(body)), posted_data)
+        self.assertEqual(
+            cache.decode(zstandard.ZstdCompressor().compress(body)),
+            posted_data)
+        self.assertIsNone(cache.decode(b'invalid'))
+        self.assertIsNone(cache.decode(gzip.compress(body)[:-10]))
+
+        # Test data of more than one gzip member
+        self.assertEqual(
+            cache.decode(gzip.compress(body[:5]) + gzip.compress(body[5:])),
+            posted_data)
+
+        # Test data that is too large when decoded
+        config = _ConfigSmall()
+        body = json.dumps(['0' * 1024]).encode()
+        for item in [
+                body, gzip.compress(body),
+                zstandard.ZstdCompressor().compress(body)]:
+            with self.assertRaises(cache.PostTooLarge):
+                cache.decode(item, config=config)
+
+        # Data of the maximum size is decoded. This isn't valid JSON.
+        self.assertIsNone(
+            cache.decode(gzip.compress(body[:1024]), config=config))
+
+        # zstd data can't be decoded without the zstandard package
+        body = zstandard.ZstdCompressor().compress(b'[]')
+        with patch.dict(sys.modules, {'zstandard': None}):
+            self.assertIsNone(cache.decode(body))
+        self.assertEqual(cache.decode(body), [])
+
+    def test_save_bulk(self):
+        """Testing method / function save_bulk."""
+        # Initialize key variables
+        config = ConfigAgent()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        posted_data = []
+        for _ in range(3):
+            posted_data.append(
+                json.loads(json.dumps(converter.posting_data_points(
+                    converter.agentdata_to_post(_create_apd())))))
+
+        # Test saving to files. Invalid data is ignored.
+        self.assertFalse(cache.save_bulk({}, 'relay'))
+        self.assertTrue(cache.save_bulk(posted_data + [{}], 'relay'))
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 3)
+        for filepath, _ in cache_data:
+            os.remove(filepath)
+
+        # Test saving to the spool
+        config = _ConfigSpool()
+        self.assertTrue(cache.save_bulk(posted_data, 'relay', config=config))
+        self.assertFalse(
+            bool(files.read_json_files(cache_directory, die=False)))
+        spool.close()
+        reader = spool.Reader(spool.directory(config=config))
+        records, marker = reader.read(10)
+        self.assertEqual([data for _, data in records], posted_data)
+        reader.commit(marker)
+
+    def test_save(self):
+        """Testing method / function save."""
+        # Initialize key variables
+        config = ConfigAgent()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        apd = _create_apd()
+        posted_data = json.loads(json.dumps(converter.posting_data_points(
+            converter.agentdata_to_post(apd))))
+
+        # Test saving to a file
+        self.assertTrue(cache.save(posted_data, apd.agent_id))
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 1)
+        self.assertEqual(cache_data[0][1], posted_data)
+        self.assertTrue(apd.agent_id in cache_data[0][0])
+        os.remove(cache_data[0][0])
+
+        # Test saving to the spool
+        config = _ConfigSpool()
+        self.assertTrue(
+            cache.save(posted_data, apd.agent_id, config=config))
+        self.assertFalse(
+            bool(files.read_json_files(cache_directory, die=False)))
+        spool.close()
+        reader = spool.Reader(spool.directory(config=config))
+        records, marker = reader.read(10)
+        self.assertEqual([data for _, data in records], [posted_data])
+        reader.commit(marker)
+
+    def test_save_duplicate(self):
+        """Testing method / function save with duplicate posts."""
+        # Initialize key variables
+        config = _ConfigDedup()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        apd = _create_apd()
+        posted_data = json.loads(json.dumps(converter.posting_data_points(
+            converter.agentdata_to_post(apd))))
+
+        # Test. Duplicates are accepted but not saved.
+        for _ in range(2):
+            self.assertTrue(
+                cache.save(posted_data, apd.agent_id, config=config))
+            self.assertTrue(
+                cache.save_bulk([posted_data], 'relay', config=config))
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 1)
+        self.assertEqual(dedup.hits()[apd.agent_id], 3)
+        os.remove(cache_data[0][0])
+        dedup._DIGESTS.clear()
+        dedup._HITS.clear()
+
+    def test_store(self):
+        """Testing method / function store."""
+        # Tested by test_save_bulk
+        pass
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Initialize key variables
+        config = _ConfigWriteThrough()
+
+        # Test
+        buffer = cache._buffer(config)
+        cache.close()
+        self.assertEqual(cache._BUFFERS, {})
+        self.assertFalse(buffer.add([{}]))
+        cache.close()
+
+    def test__buffer(self):
+        """Testing method / function _buffer."""
+        # Initialize key variables
+        config = _ConfigWriteThrough()
+
+        # Test. The buffer is shared by all requests of the process.
+        buffer = cache._buffer(config)
+        self.assertEqual(cache._buffer(_ConfigWriteThrough()), buffer)
+        self.assertEqual(list(cache._BUFFERS.keys()), [os.getpid()])
+        cache.close()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
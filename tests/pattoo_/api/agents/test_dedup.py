@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test pattoo agent API deduplication."""
+
+import os
+import unittest
+import sys
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.api.agents import dedup
+from pattoo.configuration import ConfigAgent
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Config(ConfigAgent):
+    """ConfigAgent that remembers two posts for a short time."""
+
+    def dedup_window(self):
+        """Get dedup_window.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 0.2
+
+    def dedup_size(self):
+        """Get dedup_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 2
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Forget all posts."""
+        dedup._DIGESTS.clear()
+        dedup._HITS.clear()
+
+    def tearDown(self):
+        """Forget all posts."""
+        self.setUp()
+
+    def test_digest(self):
+        """Testing function digest."""
+        # Disabled by default
+        self.assertIsNone(dedup.digest('source', {'a': 1}))
+
+        # Digests don't depend on the order of keys
+        config = _Config()
+        result = dedup.digest('source', {'a': 1, 'b': 2}, config=config)
+        self.assertEqual(
+            result, dedup.digest('source', {'b': 2, 'a': 1}, config=config))
+        self.assertNotEqual(
+            result, dedup.digest('other', {'a': 1, 'b': 2}, config=config))
+        self.assertNotEqual(
+            result, dedup.digest('source', {'a': 2, 'b': 2}, config=config))
+
+    def test_seen(self):
+        """Testing function seen."""
+        # Initialize key variables
+        config = _Config()
+        one = dedup.digest('source', {'a': 1}, config=config)
+
+        # Test
+        self.assertFalse(dedup.seen(None))
+        self.assertFalse(dedup.seen(one))
+        dedup.add([one], config=config)
+        self.assertTrue(dedup.seen(one))
+
+        # Posts are forgotten after dedup_window seconds
+        time.sleep(0.3)
+        self.assertFalse(dedup.seen(one))
+        self.assertEqual(len(dedup._DIGESTS), 0)
+
+    def test_add(self):
+        """Testing function add."""
+        # Initialize key variables
+        config = _Config()
+        digests = [
+            dedup.digest('source', {'a': _}, config=config) for _ in range(3)]
+
+        # Only dedup_size posts are remembered
+        dedup.add([None], config=config)
+        self.assertEqual(len(dedup._DIGESTS), 0)
+        dedup.add(digests, config=config)
+        self.assertEqual(list(dedup._DIGESTS.keys()), digests[1:])
+        self.assertFalse(dedup.seen(digests[0]))
+
+    def test_hits(self):
+        """Testing function hits."""
+        # Initialize key variables
+        config = _Config()
+        one = dedup.digest('one', {'a': 1}, config=config)
+        two = dedup.digest('two', {'a': 1}, config=config)
+        dedup.add([one, two], config=config)
+
+        # Test
+        dedup.seen(one)
+        dedup.seen(one)
+        dedup.seen(two)
+        self.assertEqual(dedup.hits(), {'one': 2, 'two': 1})
+
+    def test__expire(self):
+        """Testing function _expire."""
+        # Tested by test_seen
+        pass
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -4,11 +4,14 @@
 import os
 import unittest
 import sys
+import json
+import gzip
 
 
 # PIP3 imports
 from flask_testing import TestCase, LiveServerTestCase
 from flask_caching import Cache
+import requests
 
 
 # Try to create a working PYTHONPATH
@@ -30,12 +33,14 @@ else:
     sys.exit(2)
 
 from pattoo_shared import data, converter, files
-from pattoo_shared.constants import DATA_INT
+from pattoo_shared.constants import DATA_INT, PATTOO_API_AGENT_PREFIX
 from pattoo_shared.phttp import PostAgent
 from pattoo_shared.configuration import Config, ServerConfig
 from pattoo_shared.variables import (
     DataPoint, TargetDataPoints, AgentPolledData)
 from pattoo.api.agents import PATTOO_API_AGENT as APP
+from pattoo.api.agents import post
+from pattoo.configuration import ConfigAgent
 from pattoo.constants import PATTOO_API_AGENT_NAME
 from tests.libraries.configuration import UnittestConfig
 
@@ -117,6 +122,51 @@ class TestBasicFunctions(LiveServerTestCase):
                 filepath = '{}{}{}'.format(cache_directory, os.sep, filename)
                 os.remove(filepath)
 
+    def test_receive_bulk(self):
+        """Testing method / function receive_bulk."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        expected = []
+        for _ in range(2):
+            expected.append(json.loads(json.dumps(
+                converter.posting_data_points(
+                    converter.agentdata_to_post(_create_apd())))))
+        url = '{}{}/bulk/relay'.format(
+            self.get_server_url(), PATTOO_API_AGENT_PREFIX)
+
+        # Post compressed data
+        response = requests.post(
+            url, data=gzip.compress(json.dumps(expected).encode()))
+        self.assertEqual(response.status_code, 200)
+
+        # Test
+        cache_data = files.read_json_files(cache_directory)
+        self.assertEqual(len(cache_data), 2)
+        self.assertEqual(
+            sorted([json.dumps(_data) for _, _data in cache_data]),
+            sorted([json.dumps(_data) for _data in expected]))
+
+        # Invalid data is rejected
+        response = requests.post(url, data='invalid')
+        self.assertEqual(response.status_code, 404)
+
+        # Large posts are rejected
+        response = requests.post(
+            url, data=b'0' * (APP.config['MAX_CONTENT_LENGTH'] + 1))
+        self.assertEqual(response.status_code, 413)
+
+        # Revert cache_directory
+        for filepath, _ in cache_data:
+            os.remove(filepath)
+
+    def test__unavailable(self):
+        """Testing method / function _unavailable."""
+        # Test
+        result = post._unavailable(ConfigAgent())
+        self.assertEqual(result.status_code, 503)
+        self.assertEqual(result.headers['Retry-After'], '60')
+
 
 def _create_apd():
     """Testing method / function records."""
@@ -81,7 +81,8 @@ class TestBasicFunctions(LiveServerTestCase):
         # Check response
         with requests.get(url) as response:
             result = response.text
-        self.assertEqual(expected, result)
+        self.assertTrue(result.startswith(expected))
+        self.assertTrue('Cache files: ' in result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Test pattoo agent API write-through buffer."""
+
+import os
+import unittest
+import sys
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.api.agents import writethrough
+from pattoo.configuration import ConfigAgent
+from tests.libraries.configuration import UnittestConfig
+
+
+class _Config(ConfigAgent):
+    """ConfigAgent with small write-through batches."""
+
+    def write_through_batch_size(self):
+        """Get write_through_batch_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 2
+
+    def write_through_interval(self):
+        """Get write_through_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        return 0.2
+
+
+class _Buffer(writethrough.Buffer):
+    """Buffer that records batches instead of writing to the database."""
+
+    def __init__(self, fallback, config=None, fail=None):
+        """Initialize the class."""
+        writethrough.Buffer.__init__(self, fallback, config=config)
+        self.batches = []
+        self.fail = set() if fail is None else fail
+
+    def _ingest(self, items):
+        """Record the batch."""
+        if items[0]['pattoo_agent_id'] in self.fail:
+            raise SystemExit(2)
+        self.batches.append([_['value'] for _ in items])
+
+
+def _posts(values, agent_id='agent'):
+    """Create posted agent data."""
+    return [{'pattoo_agent_id': agent_id, 'value': _} for _ in values]
+
+
+class TestBuffer(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def _wait(self, condition):
+        """Wait for a condition to be True."""
+        for _ in range(100):
+            if condition() is True:
+                break
+            time.sleep(0.02)
+
+    def test___init__(self):
+        """Testing function __init__."""
+        pass
+
+    def test_start(self):
+        """Testing function start."""
+        # Batches are written when the batch size is reached
+        buffer = _Buffer(None, config=_Config())
+        buffer._interval = 60
+        buffer.start()
+        self.assertTrue(buffer.add(_posts([1])))
+        self.assertTrue(buffer.add(_posts([2, 3])))
+        self._wait(lambda: bool(buffer.batches))
+        self.assertEqual(buffer.batches, [[1, 2, 3]])
+        buffer.stop()
+
+        # Smaller batches are written after the interval
+        buffer = _Buffer(None, config=_Config())
+        buffer.start()
+        self.assertTrue(buffer.add(_posts([4])))
+        self._wait(lambda: bool(buffer.batches))
+        self.assertEqual(buffer.batches, [[4]])
+        buffer.stop()
+
+    def test_stop(self):
+        """Testing function stop."""
+        # Buffered data is written when stopped
+        buffer = _Buffer(None, config=_Config())
+        buffer._interval = 60
+        buffer.start()
+        buffer.add(_posts([1]))
+        buffer.stop()
+        self.assertEqual(buffer.batches, [[1]])
+        self.assertFalse(buffer._thread.is_alive())
+
+        # Nothing can be added after the buffer is stopped
+        self.assertFalse(buffer.add(_posts([2])))
+        buffer.stop()
+
+    def test_add(self):
+        """Testing function add."""
+        # The buffer is limited to ten times the batch size
+        buffer = _Buffer(None, config=_Config())
+        self.assertTrue(buffer.add(list(range(19))))
+        self.assertTrue(buffer.add([19]))
+        self.assertFalse(buffer.add([20]))
+        self.assertEqual(buffer._items, list(range(20)))
+
+    def test__run(self):
+        """Testing function _run."""
+        # Tested by test_start
+        pass
+
+    def test__flush(self):
+        """Testing function _flush."""
+        # Data is saved to the cache if it can't be written to the database
+        saved = []
+        config = _Config()
+        buffer = _Buffer(
+            lambda items, config=None: saved.append((items, config)),
+            config=config, fail={'one'})
+        buffer._flush(_posts([1, 2], agent_id='one'))
+        self.assertEqual(saved, [(_posts([1, 2], agent_id='one'), config)])
+
+        # Only the data of agents that can't be written is saved
+        saved.clear()
+        buffer._flush(
+            _posts([3], agent_id='one') + _posts([4, 5], agent_id='two'))
+        self.assertEqual(saved, [(_posts([3], agent_id='one'), config)])
+        self.assertEqual(buffer.batches, [[4, 5]])
+
+        # Nothing is saved to the cache if the data is written
+        saved.clear()
+        buffer.fail = set()
+        buffer._flush(_posts([6]))
+        self.assertEqual(saved, [])
+        self.assertEqual(buffer.batches, [[4, 5], [6]])
+
+    def test__ingest(self):
+        """Testing function _ingest."""
+        # Requires a database
+        pass
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Test the pattoo_apid cache."""
+
+import os
+import unittest
+import sys
+import time
+import collections
+from random import random
+
+# PIP3 imports
+from flask import Flask
+from flask_caching import Cache
+from flask_caching.backends.base import BaseCache
+from werkzeug.utils import import_string
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}web'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import data
+from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.api.web import PATTOO_API_WEB as APP
+from pattoo.api.web import cache
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.constants import IDXTimestampValue, PATTOO_API_WEB_NAME
+from pattoo.db.table import datapoint
+from pattoo.db.table import data as lib_data
+
+# Rows returned by pattoo.db.table.datapoint.metadata()
+Row = collections.namedtuple(
+    'Row', 'idx_datapoint data_type polling_interval last_timestamp')
+
+
+class _Config(Config):
+    """Use a redis cache."""
+
+    def cache_type(self):
+        """Get cache_type."""
+        return 'redis'
+
+    def cache_url(self):
+        """Get cache_url."""
+        return 'redis://localhost:6379/0'
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_configuration(self):
+        """Testing method / function configuration."""
+        # The default cache is shared using the filesystem
+        config = Config()
+        result = cache.configuration(config)
+        self.assertEqual(result['CACHE_TYPE'], 'FileSystemCache')
+        self.assertEqual(
+            result['CACHE_DIR'],
+            config.agent_cache_directory(PATTOO_API_WEB_NAME))
+        self.assertEqual(
+            result['CACHE_DEFAULT_TIMEOUT'], config.cache_timeout())
+        self.assertEqual(result['CACHE_THRESHOLD'], config.cache_size())
+
+        # Test other types
+        result = cache.configuration(_Config())
+        self.assertEqual(result['CACHE_TYPE'], 'RedisCache')
+        self.assertEqual(result['CACHE_REDIS_URL'], 'redis://localhost:6379/0')
+        self.assertNotIn('CACHE_DIR', result)
+
+        # The default cache works with the installed packages
+        app = Flask(__name__)
+        _cache = Cache(app, config=cache.configuration(config))
+        with app.app_context():
+            _cache.set_many({'test_one': [1], 'test_two': [2]})
+            self.assertEqual(
+                _cache.get_many('test_one', 'test_two'), [[1], [2]])
+            _cache.delete_many('test_one', 'test_two')
+
+        # Every cache_type is a backend of the installed Flask-Caching
+        for cache_type in [
+                'filesystem', 'simple', 'redis', 'memcached', 'null']:
+            config = Config()
+            config.cache_type = lambda: cache_type
+            result = cache.configuration(config)
+            factory = import_string('flask_caching.backends.{}'.format(
+                result['CACHE_TYPE']))
+            self.assertTrue(issubclass(factory, BaseCache), msg=cache_type)
+
+    def test_key(self):
+        """Testing method / function key."""
+        # Initialize key variables
+        row = Row(
+            idx_datapoint=1, data_type=DATA_FLOAT, polling_interval=10000,
+            last_timestamp=1000000)
+
+        # Start times are aligned with the polling interval
+        self.assertEqual(
+            cache.key(row, 20001), cache.key(row, 29999))
+        self.assertNotEqual(
+            cache.key(row, 20001), cache.key(row, 30000))
+
+        # Start times are aligned with the rollups
+        self.assertEqual(
+            cache.key(row, 1, resolution=300000, points=10),
+            cache.key(row, 299999, resolution=300000, points=10))
+
+        # New data changes the key
+        self.assertNotEqual(
+            cache.key(row, 1), cache.key(row._replace(last_timestamp=1), 1))
+
+        # Test other arguments
+        self.assertNotEqual(
+            cache.key(row, 1), cache.key(row._replace(idx_datapoint=2), 1))
+        self.assertNotEqual(
+            cache.key(row, 1, points=10), cache.key(row, 1))
+        self.assertNotEqual(
+            cache.key(row, 1, points=10, mode='max'),
+            cache.key(row, 1, points=10))
+
+    def test_etag(self):
+        """Testing method / function etag."""
+        # Initialize key variables
+        rows = {
+            1: Row(
+                idx_datapoint=1, data_type=DATA_FLOAT,
+                polling_interval=10000, last_timestamp=1000000),
+            2: Row(
+                idx_datapoint=2, data_type=DATA_FLOAT,
+                polling_interval=10000, last_timestamp=2000000)}
+        ts_starts = {1: 20001, 2: 20001}
+        result = cache.etag(rows, ts_starts)
+
+        # Tags don't depend on the order of the DataPoints
+        self.assertEqual(
+            cache.etag({2: rows[2], 1: rows[1]}, ts_starts), result)
+        self.assertEqual(cache.etag(rows, {1: 29999, 2: 29999}), result)
+
+        # New data changes the tag
+        _rows = dict(rows)
+        _rows[2] = rows[2]._replace(last_timestamp=2000001)
+        self.assertNotEqual(cache.etag(_rows, ts_starts), result)
+        self.assertNotEqual(cache.etag({1: rows[1]}, ts_starts), result)
+
+        # Test other arguments
+        self.assertNotEqual(cache.etag(rows, {1: 30000, 2: 20001}), result)
+        self.assertNotEqual(cache.etag(rows, ts_starts, points=10), result)
+        self.assertNotEqual(
+            cache.etag(rows, ts_starts, points=10, mode='max'),
+            cache.etag(rows, ts_starts, points=10))
+
+    def test_series(self):
+        """Testing method / function series."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+        timestamp = int(time.time() * 1000)
+        insert = PattooDBrecord(
+            pattoo_checksum=data.hashstring(str(random())),
+            pattoo_key=data.hashstring(str(random())),
+            pattoo_agent_id=data.hashstring(str(random())),
+            pattoo_agent_polling_interval=polling_interval,
+            pattoo_timestamp=timestamp,
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_value=0,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+        idx_datapoint = datapoint.idx_datapoint(insert)
+        ts_starts = {idx_datapoint: timestamp}
+
+        # Insert data
+        def _insert(count):
+            lib_data.insert_rows([IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=polling_interval,
+                timestamp=timestamp + (polling_interval * count),
+                value=count)])
+
+        with APP.app_context():
+            # Results match those of the database
+            _insert(0)
+            rows = datapoint.metadata([idx_datapoint])
+            expected = datapoint.series(rows, ts_starts)
+            self.assertEqual(cache.series(rows, ts_starts), expected)
+
+            # Results are cached
+            key = cache.key(rows[idx_datapoint], timestamp)
+            self.assertEqual(cache.CACHE.get(key), expected[idx_datapoint])
+            self.assertEqual(cache.series(rows, ts_starts), expected)
+
+            # New data isn't hidden by the cache
+            _insert(1)
+            rows = datapoint.metadata([idx_datapoint])
+            expected = datapoint.series(rows, ts_starts)
+            self.assertEqual(len(expected[idx_datapoint]), 2)
+            self.assertEqual(cache.series(rows, ts_starts), expected)
+
+            # Test DataPoints that don't exist
+            self.assertEqual(cache.series({}, {}), {})
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
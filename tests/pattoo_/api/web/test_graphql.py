@@ -11,6 +11,7 @@ from random import random, uniform
 import requests
 from flask_testing import TestCase, LiveServerTestCase
 from flask_caching import Cache
+from sqlalchemy import event
 
 
 # Try to create a working PYTHONPATH
@@ -32,14 +33,18 @@ else:
     sys.exit(2)
 
 from pattoo_shared import data, log, converter
-from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo_shared.constants import (
+    DATA_FLOAT, PattooDBrecord, PATTOO_API_WEB_PREFIX)
 from pattoo_shared.configuration import Config, ServerConfig
 
 from tests.libraries.configuration import UnittestConfig
 from pattoo.api.web import PATTOO_API_WEB as APP
 from pattoo.constants import IDXTimestampValue
-from pattoo.db.table import datapoint
+from pattoo.db import POOL
+from pattoo.db.table import datapoint, glue, pair
 from pattoo.db.table import data as lib_data
+from pattoo.db.table.datapoint import DataPoint
+from pattoo import uri
 
 
 class TestBasicFunctions(LiveServerTestCase):
@@ -130,6 +135,234 @@ class TestBasicFunctions(LiveServerTestCase):
         result = graphql_result['data']['allDatapoints']['edges'][0]['node']
         self.assertEqual(result['checksum'], pattoo_checksum)
 
+    def test_series(self):
+        """Testing method / function DataPoint.resolve_series."""
+        # Initialize key variables
+        _data = []
+        _pi = 300 * 1000
+        secondsago = 3600
+        now = int(time.time()) * 1000
+
+        insert = PattooDBrecord(
+            pattoo_checksum=data.hashstring(str(random())),
+            pattoo_key=data.hashstring(str(random())),
+            pattoo_agent_id=data.hashstring(str(random())),
+            pattoo_agent_polling_interval=_pi,
+            pattoo_timestamp=now,
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_value=0,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+
+        # Create checksum entry in the DB, then update the data table
+        idx_datapoint = datapoint.idx_datapoint(insert)
+        for count, timestamp in enumerate(
+                range(now - (secondsago * 1000), now, _pi)):
+            _data.append(IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=_pi,
+                timestamp=timestamp,
+                value=count))
+        lib_data.insert_rows(_data)
+
+        # Test
+        query = ('''\
+{
+  allDatapoints(idxDatapoint: "IDX") {
+    edges {
+      node {
+        all: series(secondsago: SECONDS) {
+          timestamp
+          value
+        }
+        reduced: series(secondsago: SECONDS, points: 4, mode: "max") {
+          timestamp
+          value
+        }
+      }
+    }
+  }
+}
+'''.replace('IDX', str(idx_datapoint)).replace('SECONDS', str(secondsago)))
+        graphql_result = _get(query)
+        result = graphql_result['data']['allDatapoints']['edges'][0]['node']
+
+        # Values match those of the REST API
+        obj = DataPoint(idx_datapoint)
+        expected = obj.data(
+            uri.timestamp_start(obj.polling_interval(), secondsago),
+            obj.last_timestamp())
+        self.assertEqual(
+            result['all'],
+            [{'timestamp': str(_['timestamp']), 'value': _['value']}
+             for _ in expected])
+        self.assertEqual(len(result['reduced']), 4)
+        self.assertEqual(
+            max([_['value'] for _ in result['reduced']]),
+            max([_['value'] for _ in result['all'] if _['value'] is not None]))
+
+    def test_paging(self):
+        """Testing method / function InstrumentedQuery.connection_resolver."""
+        # Initialize key variables
+        agent_id = data.hashstring(str(random()))
+        idx_datapoints = []
+
+        # Create DataPoints of the same agent
+        for _ in range(5):
+            insert = PattooDBrecord(
+                pattoo_checksum=data.hashstring(str(random())),
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=300000,
+                pattoo_timestamp=int(time.time()) * 1000,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=0,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoints.append(datapoint.idx_datapoint(insert))
+        idx_agent = DataPoint(idx_datapoints[0]).idx_agent()
+
+        def _page(arguments):
+            query = ('''\
+{
+  allDatapoints(idxAgent: "IDX", ARGUMENTS) {
+    totalCount
+    pageInfo {
+      startCursor
+      endCursor
+      hasNextPage
+      hasPreviousPage
+    }
+    edges {
+      node {
+        idxDatapoint
+      }
+    }
+  }
+}
+'''.replace('IDX', str(idx_agent)).replace('ARGUMENTS', arguments))
+            result = _get(query)['data']['allDatapoints']
+            result['idx_datapoints'] = [
+                int(_['node']['idxDatapoint']) for _ in result['edges']]
+            return result
+
+        # Page forwards
+        result = _page('first: 2')
+        self.assertEqual(result['idx_datapoints'], idx_datapoints[:2])
+        self.assertEqual(result['totalCount'], 5)
+        self.assertTrue(result['pageInfo']['hasNextPage'])
+        result = _page('first: 3, after: "{}"'.format(
+            result['pageInfo']['endCursor']))
+        self.assertEqual(result['idx_datapoints'], idx_datapoints[2:])
+        self.assertFalse(result['pageInfo']['hasNextPage'])
+
+        # Page backwards
+        result = _page('last: 2')
+        self.assertEqual(result['idx_datapoints'], idx_datapoints[3:])
+        self.assertTrue(result['pageInfo']['hasPreviousPage'])
+        result = _page('last: 2, before: "{}"'.format(
+            result['pageInfo']['startCursor']))
+        self.assertEqual(result['idx_datapoints'], idx_datapoints[1:3])
+
+        # Page sorted results
+        result = _page('first: 2, sortBy: ["idxDatapoint desc"]')
+        self.assertEqual(
+            result['idx_datapoints'], idx_datapoints[::-1][:2])
+        result = _page('sortBy: ["idxDatapoint desc"], after: "{}"'.format(
+            result['pageInfo']['endCursor']))
+        self.assertEqual(
+            result['idx_datapoints'], idx_datapoints[::-1][2:])
+
+    def test_batching(self):
+        """Testing method / function pattoo.db.schema.loader."""
+        # Initialize key variables
+        agent_id = data.hashstring(str(random()))
+        statements = []
+        expected = {}
+
+        # Create DataPoints of the same agent with key-value pairs
+        for _ in range(5):
+            insert = PattooDBrecord(
+                pattoo_checksum=data.hashstring(str(random())),
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=300000,
+                pattoo_timestamp=int(time.time()) * 1000,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=0,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoint = datapoint.idx_datapoint(insert)
+            items = [(data.hashstring(str(random())), str(_))
+                     for _ in range(2)]
+            glue.insert_rows(idx_datapoint, sorted(
+                pair.insert_rows(items).values()))
+            expected[str(idx_datapoint)] = sorted([_[0] for _ in items])
+        idx_agent = DataPoint(idx_datapoint).idx_agent()
+
+        # Test
+        query = ('''\
+{
+  allDatapoints(idxAgent: "IDX") {
+    edges {
+      node {
+        idxDatapoint
+        agent {
+          idxAgent
+        }
+        glueDatapoint {
+          edges {
+            node {
+              pair {
+                key
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+'''.replace('IDX', str(idx_agent)))
+
+        # Count the statements of a single request
+        def _count(*args):
+            statements.append(args[2])
+
+        engine = POOL.get_bind()
+        event.listen(engine, 'before_cursor_execute', _count)
+        try:
+            with APP.test_client() as client:
+                response = client.get(
+                    '{}/graphql'.format(PATTOO_API_WEB_PREFIX),
+                    query_string={'query': query})
+        finally:
+            event.remove(engine, 'before_cursor_execute', _count)
+
+        # Results are correct
+        edges = response.get_json()['data']['allDatapoints']['edges']
+        self.assertEqual(len(edges), 5)
+        for edge in edges:
+            node = edge['node']
+            self.assertEqual(node['agent']['idxAgent'], str(idx_agent))
+            self.assertEqual(
+                sorted([_['node']['pair']['key']
+                        for _ in node['glueDatapoint']['edges']]),
+                expected[node['idxDatapoint']])
+
+        # There is a single query for each level of nesting: DataPoints,
+        # their agents, their glue and its pairs.
+        self.assertEqual(len(statements), 4)
+
 
 def _get(query):
     """Get pattoo API server GraphQL query results.
@@ -143,6 +143,87 @@ class TestBasicFunctions(LiveServerTestCase):
                 self.assertEqual(item, expected[count])
                 count += 1
 
+    def test_route_data_batch(self):
+        """Testing method / function route_data_batch."""
+        # Initialize key variables
+        secondsago = 3600
+        _pi = 300 * 1000
+        now = int(time.time()) * 1000
+        idx_datapoints = []
+        _data = []
+
+        # Create DataPoints with data
+        for _ in range(2):
+            insert = PattooDBrecord(
+                pattoo_checksum=data.hashstring(str(random())),
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_id=data.hashstring(str(random())),
+                pattoo_agent_polling_interval=_pi,
+                pattoo_timestamp=now,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=0,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoint = datapoint.idx_datapoint(insert)
+            idx_datapoints.append(idx_datapoint)
+            for count, timestamp in enumerate(
+                    range(now - (secondsago * 1000), now, _pi)):
+                _data.append(IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=_pi,
+                    timestamp=timestamp,
+                    value=count))
+        lib_data.insert_rows(_data)
+
+        # Create URL
+        config = Config()
+        url = '{}?secondsago={}&{}&idx_datapoint=-1'.format(
+            config.web_api_server_url(graphql=False), secondsago,
+            '&'.join(['idx_datapoint={}'.format(_) for _ in idx_datapoints]))
+
+        # Check response. The data of each DataPoint matches that of the
+        # single DataPoint route.
+        with requests.get(url) as response:
+            result = response.json()
+        self.assertEqual(
+            sorted(result.keys()),
+            sorted([str(_) for _ in idx_datapoints + [-1]]))
+        self.assertEqual(result['-1'], [])
+        for idx_datapoint in idx_datapoints:
+            with requests.get('{}/{}?secondsago={}'.format(
+                    config.web_api_server_url(graphql=False),
+                    idx_datapoint, secondsago)) as response:
+                self.assertEqual(
+                    result[str(idx_datapoint)], response.json())
+
+        # Test downsampling
+        with requests.get('{}&points=3&mode=lttb'.format(url)) as response:
+            result = response.json()
+        for idx_datapoint in idx_datapoints:
+            self.assertEqual(len(result[str(idx_datapoint)]), 3)
+
+        # Test conditional requests. Data the client already has isn't sent.
+        with requests.get(url) as response:
+            etag = response.headers['ETag']
+            self.assertIn('Last-Modified', response.headers)
+        with requests.get(
+                url, headers={'If-None-Match': etag}) as response:
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response.headers['ETag'], etag)
+
+        # New data changes the ETag
+        lib_data.insert_rows([IDXTimestampValue(
+            idx_datapoint=idx_datapoints[0], polling_interval=_pi,
+            timestamp=now, value=0)])
+        with requests.get(
+                url, headers={'If-None-Match': etag}) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response.headers['ETag'], etag)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
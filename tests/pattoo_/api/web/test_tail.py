@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Test the pattoo_apid time series kept in memory."""
+
+import os
+import unittest
+import sys
+import time
+from random import random
+
+# PIP3 imports
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}web'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import data
+from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.api.web import tail
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.constants import IDXTimestampValue
+from pattoo.db.table import datapoint
+from pattoo.db.table import data as lib_data
+
+
+class _Config(Config):
+    """Keep a single window in memory."""
+
+    def series_cache_size(self):
+        """Get series_cache_size."""
+        return 1
+
+
+def _window(timestamps, ts_start, ts_stop):
+    """Create a Window with values matching the timestamps."""
+    return tail.Window(
+        ts_start=ts_start, ts_stop=ts_stop,
+        timestamps=np.array(timestamps, dtype=np.int64),
+        values=np.array(timestamps, dtype=float))
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_series(self):
+        """Testing method / function series."""
+        # Initialize key variables
+        tail.clear()
+        polling_interval = 300 * 1000
+        timestamp = int(time.time() * 1000)
+        idx_datapoints = []
+
+        # Create DataPoints
+        for _ in range(2):
+            insert = PattooDBrecord(
+                pattoo_checksum=data.hashstring(str(random())),
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_id=data.hashstring(str(random())),
+                pattoo_agent_polling_interval=polling_interval,
+                pattoo_timestamp=timestamp,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=0,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoints.append(datapoint.idx_datapoint(insert))
+        ts_starts = {_: timestamp for _ in idx_datapoints}
+
+        # Add data. The results match those read from the database, with
+        # and without windows in memory.
+        for count in range(3):
+            lib_data.insert_rows([
+                IDXTimestampValue(
+                    idx_datapoint=_,
+                    polling_interval=polling_interval,
+                    timestamp=timestamp + (polling_interval * count),
+                    value=count) for _ in idx_datapoints])
+            rows = datapoint.metadata(idx_datapoints)
+            expected = datapoint.series(rows, ts_starts)
+            self.assertEqual(tail.series(rows, ts_starts), expected)
+            self.assertEqual(tail.series(rows, ts_starts), expected)
+            self.assertEqual(
+                len(expected[idx_datapoints[0]]), count + 1)
+
+        # The window ends at the last_timestamp
+        window = tail._WINDOWS[(idx_datapoints[0], None)]
+        self.assertEqual(
+            window.ts_stop, rows[idx_datapoints[0]].last_timestamp)
+        self.assertEqual(len(window.timestamps), 3)
+
+        # Only the most recently used windows are kept
+        tail.series(rows, ts_starts, config=_Config())
+        self.assertEqual(
+            list(tail._WINDOWS.keys()), [(idx_datapoints[1], None)])
+
+    def test_clear(self):
+        """Testing method / function clear."""
+        # Test
+        tail._WINDOWS[(0, None)] = None
+        tail.clear()
+        self.assertEqual(len(tail._WINDOWS), 0)
+
+    def test__slide(self):
+        """Testing method / function _slide."""
+        # Everything is read if there is no window
+        (start, window) = tail._slide(None, 1000, 5000, None)
+        self.assertEqual(start, 1000)
+        self.assertEqual((window.ts_start, window.ts_stop), (1000, 5000))
+        self.assertEqual(len(window.timestamps), 0)
+
+        # Everything is read if the window starts too late, or if its end is
+        # after the last_timestamp of the DataPoint
+        _window_ = _window([2000, 3000], 2000, 3000)
+        self.assertEqual(tail._slide(_window_, 1000, 5000, None)[0], 1000)
+        self.assertEqual(tail._slide(_window_, 2000, 2500, None)[0], 2000)
+
+        # Only new rows are read. The window moves forward by as much as the
+        # end of the request.
+        _window_ = _window([1000, 2000, 3000], 1000, 3000)
+        (start, window) = tail._slide(_window_, 2000, 4000, None)
+        self.assertEqual(start, 3001)
+        self.assertEqual(window.ts_start, 2000)
+        self.assertEqual(window.timestamps.tolist(), [2000, 3000])
+        self.assertEqual(window.values.tolist(), [2000, 3000])
+
+        # The window keeps its length if the request is for a shorter time
+        (start, window) = tail._slide(_window_, 3000, 4000, None)
+        self.assertEqual(start, 3001)
+        self.assertEqual(window.ts_start, 2000)
+        self.assertEqual(window.timestamps.tolist(), [2000, 3000])
+
+        # Nothing is read if there is no new data
+        (start, window) = tail._slide(_window_, 1000, 3000, 1000)
+        self.assertEqual(start, 3001)
+        self.assertEqual(window.timestamps.tolist(), [1000, 2000, 3000])
+
+        # The most recent rollup bucket is read again
+        (start, window) = tail._slide(_window_, 1000, 4500, 1000)
+        self.assertEqual(start, 3000)
+        self.assertEqual(window.timestamps.tolist(), [1000, 2000])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
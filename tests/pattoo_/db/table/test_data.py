@@ -34,6 +34,7 @@ from pattoo.constants import IDXTimestampValue
 from pattoo_shared.constants import DATA_FLOAT
 from tests.libraries.configuration import UnittestConfig
 from pattoo.db.models import Data
+from pattoo.configuration import ConfigIngester as Config
 from pattoo.db.table import data, datapoint
 from pattoo.db import db
 
@@ -77,7 +78,8 @@ class TestBasicFunctions(unittest.TestCase):
             polling_interval=polling_interval,
             timestamp=timestamp,
             value=pattoo_value)]
-        data.insert_rows(_data)
+        result = data.insert_rows(_data)
+        self.assertEqual(result, 1)
 
         # Verify that the data is there
         with db.db_query(20015) as session:
@@ -88,6 +90,39 @@ class TestBasicFunctions(unittest.TestCase):
         for row in rows:
             self.assertEqual(row.value, pattoo_value)
 
+        # Verify that the last_timestamp was updated
+        obj = datapoint.DataPoint(idx_datapoint)
+        self.assertEqual(obj.last_timestamp(), timestamp)
+
+        # Duplicate rows fail whichever way they are inserted. "LOAD DATA
+        # LOCAL INFILE" only works if the database connection allows it.
+        _data.append(IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=polling_interval,
+            timestamp=timestamp + 1,
+            value=pattoo_value))
+        options = [False]
+        if Config().load_data_infile() is True:
+            options.append(True)
+        for load_data_infile in options:
+            with self.assertRaises(SystemExit):
+                data.insert_rows(
+                    _data, chunk_size=1, load_data_infile=load_data_infile)
+        self.assertEqual(obj.last_timestamp(), timestamp)
+
+    def test__options(self):
+        """Testing method / function _options."""
+        # Test
+        config = Config()
+        result = data._options()
+        self.assertEqual(
+            result['insert_chunk_size'], config.insert_chunk_size())
+        self.assertEqual(
+            result['load_data_infile'], config.load_data_infile())
+
+        # The configuration is only read once
+        self.assertIs(data._options(), result)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
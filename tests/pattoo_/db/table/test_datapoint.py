@@ -6,6 +6,12 @@ import unittest
 import sys
 from random import random
 import time
+import collections
+from decimal import Decimal
+from unittest.mock import patch
+
+# PIP3 imports
+import numpy as np
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -26,12 +32,13 @@ else:
     sys.exit(2)
 
 from pattoo_shared import data, times
-from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo_shared.constants import DATA_FLOAT, DATA_COUNT, PattooDBrecord
 from pattoo.db.table import datapoint, agent
 from pattoo.db.table import data as lib_data
 from pattoo.db.table.datapoint import DataPoint
 from pattoo.db.models import DataPoint as _DataPoint
-from pattoo.db import db
+from pattoo.db.models import ChartDataPoint
+from pattoo.db import db, misc
 from pattoo.constants import IDXTimestampValue
 
 from tests.libraries.configuration import UnittestConfig
@@ -74,6 +81,98 @@ class TestBasicFunctions(unittest.TestCase):
         expected = datapoint.checksum_exists(checksum)
         self.assertEqual(result, expected)
 
+    def test_idx_datapoints(self):
+        """Testing method / function idx_datapoints."""
+        # Initialize key variables
+        records = []
+        agent_id = data.hashstring(str(random()))
+        for index in range(0, 5):
+            checksum = data.hashstring(str(random()))
+            records.append(PattooDBrecord(
+                pattoo_checksum=checksum,
+                pattoo_metadata=[('key', 'value')],
+                pattoo_data_type=32,
+                pattoo_key='polar_bear',
+                pattoo_value=0.0,
+                pattoo_timestamp=1575789070108,
+                pattoo_agent_polled_target='panda_bear_{}'.format(index % 2),
+                pattoo_agent_program='koala_bear',
+                pattoo_agent_hostname='grizzly_bear',
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=10000))
+
+        # Create one entry beforehand
+        expected = {records[0].pattoo_checksum: datapoint.idx_datapoint(
+            records[0])}
+        for record in records[1:]:
+            self.assertFalse(datapoint.checksum_exists(record.pattoo_checksum))
+
+        # Test creation, including duplicate records
+        result = datapoint.idx_datapoints(records + records[2:])
+        self.assertEqual(len(result), len(records))
+        for record in records:
+            checksum = record.pattoo_checksum
+            self.assertEqual(
+                result[checksum], datapoint.checksum_exists(checksum))
+            obj = DataPoint(result[checksum])
+            self.assertEqual(obj.polling_interval(), 10000)
+            self.assertEqual(obj.data_type(), 32)
+        self.assertEqual(
+            result[records[0].pattoo_checksum],
+            expected[records[0].pattoo_checksum])
+
+        # Each new DataPoint has a chart
+        for record in records[1:]:
+            idx_datapoint = result[record.pattoo_checksum]
+            with db.db_query(20170) as session:
+                rows = session.query(ChartDataPoint.idx_chart).filter(
+                    ChartDataPoint.idx_datapoint == idx_datapoint).all()
+            self.assertEqual(len(rows), 1)
+
+        # Test after creation
+        self.assertEqual(datapoint.idx_datapoints(records), result)
+
+    def test_idx_datapoints_concurrent(self):
+        """Testing method / function idx_datapoints."""
+        # Initialize key variables
+        agent_id = data.hashstring(str(random()))
+        record = PattooDBrecord(
+            pattoo_checksum=data.hashstring(str(random())),
+            pattoo_metadata=[('key', 'value')],
+            pattoo_data_type=32,
+            pattoo_key='polar_bear',
+            pattoo_value=0.0,
+            pattoo_timestamp=1575789070108,
+            pattoo_agent_polled_target='panda_bear',
+            pattoo_agent_program='koala_bear',
+            pattoo_agent_hostname='grizzly_bear',
+            pattoo_agent_id=agent_id,
+            pattoo_agent_polling_interval=10000)
+
+        # Another process creates the DataPoint after it is looked up
+        expected = datapoint.idx_datapoint(record)
+        misc.CACHE.get(agent_id)
+        with patch('pattoo.db.table.datapoint._idx_datapoints',
+                   return_value={}):
+            result = datapoint.idx_datapoints([record])
+        self.assertEqual(result, {record.pattoo_checksum: expected})
+
+        # No other chart is created
+        with db.db_query(20197) as session:
+            rows = session.query(ChartDataPoint.idx_chart).filter(
+                ChartDataPoint.idx_datapoint == expected).all()
+        self.assertEqual(len(rows), 1)
+
+        # The agent's cached checksums are read again from the database
+        misses = misc.CACHE.misses
+        misc.CACHE.get(agent_id)
+        self.assertEqual(misc.CACHE.misses, misses + 1)
+
+    def test__idx_datapoints(self):
+        """Testing method / function _idx_datapoints."""
+        # Tested by test_idx_datapoints
+        pass
+
     def test_checksum_exists(self):
         """Testing method / function checksum_exists."""
         # Initialize key variables
@@ -121,34 +220,221 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
 
+    def test_metadata(self):
+        """Testing method / function metadata."""
+        # Initialize key variables
+        idx_datapoints = [_idx_datapoint(), _idx_datapoint()]
+
+        # Test
+        self.assertEqual(datapoint.metadata([]), {})
+        result = datapoint.metadata(idx_datapoints + [-1])
+        self.assertEqual(sorted(result.keys()), idx_datapoints)
+        for _idx_datapoint_, row in result.items():
+            obj = DataPoint(_idx_datapoint_)
+            self.assertEqual(row.idx_datapoint, _idx_datapoint_)
+            self.assertEqual(row.data_type, obj.data_type())
+            self.assertEqual(row.polling_interval, obj.polling_interval())
+            self.assertEqual(row.last_timestamp, obj.last_timestamp())
+
+    def test_series(self):
+        """Testing method / function series."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+        _timestamp = int(time.time() * 1000)
+        ts_starts = {}
+        _data = []
+
+        # Create two DataPoints with data
+        for offset in range(2):
+            insert = PattooDBrecord(
+                pattoo_checksum=data.hashstring(str(random())),
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_id=data.hashstring(str(random())),
+                pattoo_agent_polling_interval=polling_interval,
+                pattoo_timestamp=_timestamp,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=0,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoint = datapoint.idx_datapoint(insert)
+            ts_starts[idx_datapoint] = _timestamp + (
+                offset * polling_interval)
+            for count in range(10):
+                _data.append(IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=polling_interval,
+                    timestamp=_timestamp + (polling_interval * count),
+                    value=count * (offset + 1)))
+        lib_data.insert_rows(_data)
+
+        # Test. Results match those of each DataPoint.
+        rows = datapoint.metadata(list(ts_starts.keys()))
+        result = datapoint.series(rows, ts_starts)
+        self.assertEqual(sorted(result.keys()), sorted(ts_starts.keys()))
+        for idx_datapoint, ts_start in ts_starts.items():
+            obj = DataPoint(idx_datapoint)
+            self.assertEqual(
+                result[idx_datapoint],
+                obj.data(ts_start, obj.last_timestamp()))
+        self.assertEqual(datapoint.series({}, {}), {})
+
+        # Results read from the rollups match those of each DataPoint
+        result = datapoint.series(rows, ts_starts, resolution=3600000)
+        for idx_datapoint, ts_start in ts_starts.items():
+            obj = DataPoint(idx_datapoint)
+            self.assertEqual(
+                result[idx_datapoint],
+                obj.data(ts_start, obj.last_timestamp(), resolution=3600000))
+
+    def test_rollup_resolution(self):
+        """Testing method / function rollup_resolution."""
+        # The Data table is used if no resolution is required
+        self.assertIsNone(datapoint.rollup_resolution(10000, None))
+        self.assertIsNone(datapoint.rollup_resolution(None, 3600000))
+
+        # The Data table is used if there are no coarser rollups
+        self.assertIsNone(datapoint.rollup_resolution(10000, 299999))
+        self.assertIsNone(datapoint.rollup_resolution(300000, 300000))
+
+        # The coarsest rollup meeting the resolution is used
+        for (polling_interval, resolution, expected) in [
+                (10000, 300000, 300000),
+                (10000, 3599999, 300000),
+                (10000, 3600000, 3600000),
+                (300000, 3600000, 3600000),
+                (10000, 604800000, 86400000)]:
+            self.assertEqual(
+                datapoint.rollup_resolution(polling_interval, resolution),
+                expected)
+
+    def test__values(self):
+        """Testing method / function _values."""
+        # Initialize key variables
+        row = collections.namedtuple('Row', 'timestamp value')
+        rows = [row(timestamp=1000, value=1), row(timestamp=3000, value=4)]
+
+        # Test non-counter values. Missing values are None.
+        result = datapoint._values(rows, DATA_FLOAT, 1000, 1000, 3000)
+        self.assertEqual(result, [
+            {'timestamp': 1000, 'value': 1},
+            {'timestamp': 2000, 'value': None},
+            {'timestamp': 3000, 'value': 4}])
+
+        # Test counter values. These are changes per second.
+        rows.insert(1, row(timestamp=2000, value=2))
+        result = datapoint._values(rows, DATA_COUNT, 1000, 1000, 3000)
+        self.assertEqual(result, [
+            {'timestamp': 2000, 'value': 1},
+            {'timestamp': 3000, 'value': 2}])
+        self.assertEqual(
+            datapoint._values(rows[:1], DATA_COUNT, 1000, 1000, 3000), [])
+
+        # The last value of each polling interval is used
+        rows = [row(timestamp=1000, value=1), row(timestamp=1500, value=2)]
+        result = datapoint._values(rows, DATA_FLOAT, 1000, 1000, 1000)
+        self.assertEqual(result, [{'timestamp': 1000, 'value': 2}])
+
+        # Results are the same as the dict based implementation that was
+        # used before numpy arrays. np.round() gives 961900.9378982258 for
+        # the first value.
+        rows = [row(timestamp=1000, value=Decimal('961900.9378982257'))]
+        for count in range(1, 500):
+            rows.append(row(
+                timestamp=(count * 1000) + 17,
+                value=Decimal(int(random() * 10 ** 9)) / 7))
+        del rows[100]
+        for data_type in [DATA_FLOAT, DATA_COUNT]:
+            self.assertEqual(
+                datapoint._values(rows, data_type, 1000, 1000, 600000),
+                _legacy_values(rows, data_type, 1000, 1000, 600000))
+
+    def test_values(self):
+        """Testing method / function values."""
+        # Initialize key variables
+        timestamps = np.array([1000, 3000, 3500], dtype=np.int64)
+        values = np.array([1, 4, 5], dtype=float)
+
+        # Test. Rows are the same as those used by _values.
+        result = datapoint.values(
+            timestamps, values, DATA_FLOAT, 1000, 1000, 3000)
+        self.assertEqual(result, [
+            {'timestamp': 1000, 'value': 1},
+            {'timestamp': 2000, 'value': None},
+            {'timestamp': 3000, 'value': 5}])
+        result = datapoint.values(
+            timestamps[:0], values[:0], DATA_FLOAT, 1000, 1000, 2000)
+        self.assertEqual(result, [
+            {'timestamp': 1000, 'value': None},
+            {'timestamp': 2000, 'value': None}])
+
+    def test_fetch(self):
+        """Testing method / function fetch."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+        _timestamp = int(time.time() * 1000)
+        idx_datapoint = _idx_datapoint()
+        lib_data.insert_rows([IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=polling_interval,
+            timestamp=_timestamp + (polling_interval * count),
+            value=count) for count in range(5)])
+        rows = datapoint.metadata([idx_datapoint])
+
+        # Test. Only rows in the range are returned.
+        result = datapoint.fetch(
+            rows, {idx_datapoint: (
+                _timestamp + polling_interval,
+                _timestamp + (polling_interval * 3))})
+        (timestamps, values) = result[idx_datapoint]
+        self.assertEqual(
+            timestamps.tolist(),
+            [_timestamp + (polling_interval * _) for _ in range(1, 4)])
+        self.assertEqual(values.tolist(), [1, 2, 3])
+
+    def test__round(self):
+        """Testing method / function _round."""
+        # Test
+        result = datapoint._round(
+            np.array([961900.9378982257, 1.25, np.nan]), 1)
+        self.assertEqual(result.tolist()[:2], [961900.9, 1.2])
+        self.assertTrue(np.isnan(result[2]))
+        result = datapoint._round(np.array([961900.9378982257]), 10)
+        self.assertEqual(result.tolist(), [961900.9378982257])
+
     def test__counters(self):
         """Testing method / function _counters."""
-        # Create a counter-like dict
+        # Create a counter-like array
         increment = 2
-        inputs = {}
-        for item in range(0, 20, increment):
-            inputs[item] = item
-
-        result = datapoint._counters(inputs, 1, 1)
-        self.assertEqual(len(inputs) - 1, len(result))
-        for item in result:
-            self.assertTrue(item['timestamp'] in inputs)
-            self.assertEqual(item['value'], increment * 1000)
+        timestamps = np.arange(0, 20, increment)
+        values = timestamps.astype(float)
+        values[5] = np.nan
+
+        result = datapoint._counters(timestamps, values, 1, 1)
+        self.assertEqual(len(timestamps) - 1, len(result))
+        for key, item in enumerate(result):
+            self.assertEqual(item['timestamp'], timestamps[key + 1])
+            if key in [4, 5]:
+                # Absent data means no change
+                self.assertIsNone(item['value'])
+            else:
+                self.assertEqual(item['value'], increment * 1000)
 
     def test__response(self):
         """Testing method / function _response."""
         # Initialize variables
-        inputs = {
-            1: 1 * 3,
-            2: 2 * 3,
-            3: 3 * 3,
-            4: 4 * 3
-        }
-        result = datapoint._response(inputs)
-        self.assertEqual(len(inputs), len(result))
+        timestamps = np.array([1, 2, 3, 4])
+        values = np.array([3, np.nan, 9, 12])
+        result = datapoint._response(timestamps, values)
+        self.assertEqual(result, [
+            {'timestamp': 1, 'value': 3},
+            {'timestamp': 2, 'value': None},
+            {'timestamp': 3, 'value': 9},
+            {'timestamp': 4, 'value': 12}])
         for item in result:
-            timestamp = item['timestamp']
-            self.assertEqual(item['value'], inputs[timestamp])
+            self.assertTrue(isinstance(item['timestamp'], int))
 
 
 class TestDataPoint(unittest.TestCase):
@@ -292,6 +578,70 @@ class TestDataPoint(unittest.TestCase):
         result = obj.data(ts_start, ts_stop)
         self.assertEqual(result, expected)
 
+        # Test reading from the hourly rollup. Values are the average of the
+        # values of each hour.
+        buckets = {}
+        for item in expected:
+            buckets.setdefault(
+                times.normalized_timestamp(3600000, item['timestamp']),
+                []).append(item['value'])
+        result = obj.data(ts_start, ts_stop, resolution=3600000)
+        self.assertEqual(
+            [_['timestamp'] for _ in result], sorted(buckets.keys()))
+        for item in result:
+            values = buckets[item['timestamp']]
+            self.assertAlmostEqual(item['value'], sum(values) / len(values))
+
+
+def _legacy_values(rows, data_type, polling_interval, ts_start, ts_stop):
+    """Convert rows using dicts keyed by timestamp.
+
+    This is how pattoo.db.table.datapoint._values worked before it used
+    numpy arrays.
+
+    Args:
+        rows: Data table rows sorted by timestamp
+        data_type: Type of data
+        polling_interval: Polling interval
+        ts_start: Normalized start time
+        ts_stop: Stop time
+
+    Returns:
+        result: List of key-value pair dicts
+
+    """
+    # Initialize key variables
+    places = 10
+    result = []
+
+    # Make sure we have entries for entire time range
+    timestamps = times.timestamps(ts_start, ts_stop, polling_interval)
+    nones = {_key: None for _key in timestamps}
+    for row in rows:
+        timestamp = times.normalized_timestamp(
+            polling_interval, row.timestamp)
+        nones[timestamp] = round(float(row.value), places)
+
+    if data_type == DATA_FLOAT:
+        for timestamp, value in sorted(nones.items()):
+            result.append({'timestamp': timestamp, 'value': value})
+
+    elif data_type == DATA_COUNT:
+        _timestamps = []
+        values = []
+        for timestamp, value in sorted(nones.items()):
+            _timestamps.append(timestamp)
+            values.append(value)
+        deltas = np.abs(np.diff(np.array(values).astype(float)))
+        for key, delta in enumerate(deltas):
+            if np.isnan(delta):
+                tps = None
+            else:
+                tps = round((delta / polling_interval) * 1000, places)
+            result.append({'timestamp': _timestamps[key + 1], 'value': tps})
+
+    return result
+
 
 def _idx_datapoint():
     """Create a new DataPoint db entry.
@@ -31,6 +31,54 @@ from tests.libraries.configuration import UnittestConfig
 from pattoo.db.table import glue, pair, datapoint, agent
 
 
+class TestBatch(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test
+        batch = glue.Batch()
+        self.assertEqual(batch.inserted, 0)
+        self.assertEqual(batch.skipped, 0)
+
+    def test_add(self):
+        """Testing method / function add."""
+        # Tested by test_flush
+        pass
+
+    def test_flush(self):
+        """Testing method / function flush."""
+        # Initialize key variables
+        idx_datapoint = _idx_datapoint()
+        idx_pairs = []
+        for _ in range(0, 5):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            idx_pairs.extend(pair.insert_rows((key, value)).values())
+
+        # Add rows, including duplicates
+        batch = glue.Batch()
+        batch.add(idx_datapoint, idx_pairs)
+        batch.add(idx_datapoint, idx_pairs[0])
+        for idx_pair in idx_pairs:
+            self.assertFalse(glue.glue_exists(idx_datapoint, idx_pair))
+
+        # Test
+        batch.flush()
+        self.assertEqual(batch.inserted, len(idx_pairs))
+        self.assertEqual(batch.skipped, 0)
+        for idx_pair in idx_pairs:
+            self.assertTrue(glue.glue_exists(idx_datapoint, idx_pair))
+
+        # Pre-existing rows are skipped
+        batch.add(idx_datapoint, idx_pairs)
+        batch.flush()
+        self.assertEqual(batch.inserted, len(idx_pairs))
+        self.assertEqual(batch.skipped, len(idx_pairs))
+        self.assertEqual(
+            sorted(glue.idx_pairs(idx_datapoint)), sorted(idx_pairs))
+
+
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -132,6 +180,33 @@ class TestBasicFunctions(unittest.TestCase):
             self.assertTrue(idx_pair in result)
 
 
+def _idx_datapoint():
+    """Create a new DataPoint db entry.
+
+    Args:
+        None
+
+    Returns:
+        result: idx_datapoint value for new DataPoint
+
+    """
+    # Initialize key variables
+    polling_interval = 1
+    checksum = data.hashstring(str(random()))
+
+    # Create a new Agent entry
+    agent_id = data.hashstring(str(random()))
+    agent_target = data.hashstring(str(random()))
+    agent_program = data.hashstring(str(random()))
+    agent.insert_row(agent_id, agent_target, agent_program)
+    idx_agent = agent.exists(agent_id, agent_target)
+
+    # Create entry
+    datapoint.insert_row(checksum, DATA_FLOAT, polling_interval, idx_agent)
+    result = datapoint.checksum_exists(checksum)
+    return result
+
+
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
     UnittestConfig().create()
@@ -61,10 +61,37 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertFalse(result)
 
         # Create entry and check
-        pair.insert_rows((key, value))
+        inserted = pair.insert_rows((key, value))
         result = pair.pair_exists(key, value)
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
+        self.assertEqual(inserted, {(key, value): result})
+
+        # Inserting again, with duplicates, returns the same indexes
+        inserted = pair.insert_rows([[(key, value)], (key, value)])
+        self.assertEqual(inserted, {(key, value): result})
+
+    def test_lookup(self):
+        """Testing method / function lookup."""
+        # Initialize key variables
+        keypairs = []
+        for _ in range(0, 10):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            keypairs.append((key, value))
+
+        # Nothing should be found
+        result = pair.lookup(keypairs)
+        self.assertEqual(result, {})
+
+        # Insert values in tables
+        pair.insert_rows(keypairs)
+
+        # Test
+        result = pair.lookup(keypairs)
+        self.assertEqual(len(result), len(keypairs))
+        for key, value in keypairs:
+            self.assertEqual(result[(key, value)], pair.pair_exists(key, value))
 
     def test_idx_pairs(self):
         """Testing method / function idx_pairs."""
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Test the rollup module."""
+
+import os
+import unittest
+import sys
+import time
+from random import random
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}db{0}table'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import data as lib_data
+from pattoo_shared.constants import PattooDBrecord, DATA_FLOAT
+from pattoo.constants import IDXTimestampValue
+from tests.libraries.configuration import UnittestConfig
+from pattoo.db.models import DataRollup
+from pattoo.db.table import data, datapoint, rollup
+from pattoo.db import db
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_aggregate(self):
+        """Testing method / function aggregate."""
+        # Initialize key variables
+        rows = [
+            (1, 3600000, 5),
+            (1, 3660000, 2),
+            (2, 3660000, 7),
+            (1, 3900000, 4)]
+
+        # Test
+        result = rollup.aggregate(rows)
+        self.assertEqual(len(result), 2 * 3 + 1)
+        self.assertEqual(
+            result[(1, 300000, 3600000)], [2, 5, 7, 2, 2, 3660000])
+        self.assertEqual(
+            result[(1, 300000, 3900000)], [4, 4, 4, 1, 4, 3900000])
+        self.assertEqual(
+            result[(1, 3600000, 3600000)], [2, 5, 11, 3, 4, 3900000])
+        self.assertEqual(
+            result[(1, 86400000, 0)], [2, 5, 11, 3, 4, 3900000])
+        self.assertEqual(
+            result[(2, 86400000, 0)], [7, 7, 7, 1, 7, 3660000])
+        self.assertEqual(rollup.aggregate([]), {})
+
+    def test_update(self):
+        """Testing method / function update."""
+        # Initialize key variables
+        resolution = 3600000
+        idx_datapoint = _idx_datapoint()
+        timestamp = (int(time.time() * 1000) // resolution) * resolution
+
+        # Insert the data in two batches. The second batch is merged with
+        # the bucket created by the first.
+        for values in [[(0, 6), (1, 2)], [(3, 9), (2, 1)]]:
+            data.insert_rows([
+                IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=1000,
+                    timestamp=timestamp + offset,
+                    value=value) for offset, value in values])
+
+        # Test
+        with db.db_query(20188) as session:
+            row = session.query(DataRollup).filter(
+                DataRollup.idx_datapoint == idx_datapoint,
+                DataRollup.resolution == resolution,
+                DataRollup.timestamp == timestamp).one()
+        self.assertEqual(row.minimum, 1)
+        self.assertEqual(row.maximum, 9)
+        self.assertEqual(row.total, 18)
+        self.assertEqual(row.count, 4)
+        self.assertEqual(row.last, 9)
+        self.assertEqual(row.last_timestamp, timestamp + 3)
+
+    def test_backfill(self):
+        """Testing method / function backfill."""
+        # Initialize key variables
+        idx_datapoint = _idx_datapoint()
+        timestamp = int(time.time() * 1000)
+        data.insert_rows([
+            IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=1000,
+                timestamp=timestamp + offset,
+                value=offset) for offset in range(5)])
+        expected = _rollups(idx_datapoint)
+
+        # Delete the rollups then recreate them
+        with db.db_modify(20189) as session:
+            session.query(DataRollup).filter(
+                DataRollup.idx_datapoint == idx_datapoint).delete()
+        self.assertEqual(_rollups(idx_datapoint), [])
+        rollup.backfill()
+        self.assertEqual(_rollups(idx_datapoint), expected)
+
+        # Existing rollups aren't changed
+        rollup.backfill()
+        self.assertEqual(_rollups(idx_datapoint), expected)
+
+        # Incomplete rollups are replaced. Rollups are incomplete when new
+        # data is ingested before the backfill.
+        with db.db_modify(20196) as session:
+            session.query(DataRollup).filter(
+                DataRollup.idx_datapoint == idx_datapoint).delete()
+            rollup.update(session, [(idx_datapoint, timestamp + 4, 4)])
+        self.assertIn(idx_datapoint, rollup._pending())
+        rollup.backfill()
+        self.assertEqual(_rollups(idx_datapoint), expected)
+        self.assertNotIn(idx_datapoint, rollup._pending())
+
+    def test__pending(self):
+        """Testing method / function _pending."""
+        # Tested by test_backfill
+        pass
+
+
+def _idx_datapoint():
+    """Create a new DataPoint db entry.
+
+    Args:
+        None
+
+    Returns:
+        result: idx_datapoint value for new DataPoint
+
+    """
+    # Create the DataPoint
+    record = PattooDBrecord(
+        pattoo_checksum=lib_data.hashstring(str(random())),
+        pattoo_key=lib_data.hashstring(str(random())),
+        pattoo_agent_id=lib_data.hashstring(str(random())),
+        pattoo_agent_polling_interval=1000,
+        pattoo_timestamp=int(time.time() * 1000),
+        pattoo_data_type=DATA_FLOAT,
+        pattoo_value=0,
+        pattoo_agent_polled_target='pattoo_agent_polled_target',
+        pattoo_agent_program='pattoo_agent_program',
+        pattoo_agent_hostname='pattoo_agent_hostname',
+        pattoo_metadata=[]
+    )
+    result = datapoint.idx_datapoint(record)
+    return result
+
+
+def _rollups(idx_datapoint):
+    """Get the rollups of a DataPoint.
+
+    Args:
+        idx_datapoint: DataPoint index
+
+    Returns:
+        result: Sorted list of tuples
+
+    """
+    # Get the rollups
+    with db.db_query(20190) as session:
+        rows = session.query(
+            DataRollup.resolution, DataRollup.timestamp, DataRollup.minimum,
+            DataRollup.maximum, DataRollup.total, DataRollup.count,
+            DataRollup.last, DataRollup.last_timestamp).filter(
+                DataRollup.idx_datapoint == idx_datapoint).all()
+    result = sorted([tuple(_) for _ in rows])
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -27,12 +27,142 @@ from pattoo_shared import data
 from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
 from tests.libraries.configuration import UnittestConfig
 from pattoo.db.table import datapoint, glue, pair
-from pattoo.db import misc
+from pattoo.db.table import data as data_table
+from pattoo.db import misc, db
+from pattoo.db.models import DataPoint
 from pattoo.ingest import get
-from pattoo.constants import ChecksumLookup
+from pattoo.constants import ChecksumLookup, IDXTimestampValue
 from pattoo.db.table import agent
 
 
+class TestChecksumCache(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test
+        cache = misc.ChecksumCache()
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Initialize key variables
+        cache = misc.ChecksumCache(size=1)
+        (agent_id, checksums) = _agent()
+        (fake_agent_id, _) = _agent()
+
+        # Test
+        result = cache.get(agent_id)
+        self.assertEqual(sorted(result.keys()), sorted(checksums.keys()))
+        self.assertEqual(cache.misses, 1)
+        result = cache.get(agent_id)
+        self.assertEqual(sorted(result.keys()), sorted(checksums.keys()))
+        self.assertEqual(cache.hits, 1)
+
+        # Changing the result must not change the cache
+        result.clear()
+        self.assertTrue(bool(cache.get(agent_id)))
+        self.assertEqual(cache.hits, 2)
+
+        # The least recently used agent is removed
+        cache.get(fake_agent_id)
+        cache.get(agent_id)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 3)
+
+    def test_add(self):
+        """Testing method / function add."""
+        # Initialize key variables
+        cache = misc.ChecksumCache()
+        (agent_id, checksums) = _agent()
+        checksum = data.hashstring(str(random()))
+        lookup = ChecksumLookup(
+            idx_datapoint=-1, polling_interval=1, last_timestamp=1)
+
+        # Agents not in the cache are ignored
+        cache.add(agent_id, checksum, lookup)
+        self.assertFalse(checksum in cache.get(agent_id))
+
+        # Test
+        cache.add(agent_id, checksum, lookup)
+        result = cache.get(agent_id)
+        self.assertEqual(len(result), len(checksums) + 1)
+        self.assertEqual(result[checksum], lookup)
+
+    def test_advance(self):
+        """Testing method / function advance."""
+        # Initialize key variables
+        cache = misc.ChecksumCache()
+        (agent_id, checksums) = _agent()
+        cache.get(agent_id)
+        last_timestamps = {
+            value: index + 10 for index, value in enumerate(
+                checksums.values())}
+
+        # Test
+        cache.advance(last_timestamps)
+        result = cache.get(agent_id)
+        for checksum, idx_datapoint in checksums.items():
+            self.assertEqual(
+                result[checksum].last_timestamp,
+                last_timestamps[idx_datapoint])
+
+        # Timestamps never go backwards
+        cache.advance({_: 2 for _ in checksums.values()})
+        result = cache.get(agent_id)
+        for checksum, idx_datapoint in checksums.items():
+            self.assertEqual(
+                result[checksum].last_timestamp,
+                last_timestamps[idx_datapoint])
+
+    def test_invalidate(self):
+        """Testing method / function invalidate."""
+        # Initialize key variables
+        (agent_id, checksums) = _agent()
+        idx_datapoint = list(checksums.values())[0]
+        timestamp = int(time.time() * 1000)
+        misc.CACHE.get(agent_id)
+        misses = misc.CACHE.misses
+
+        # Disable a DataPoint
+        with db.db_modify(20167, die=True) as session:
+            session.query(DataPoint).filter(
+                DataPoint.idx_datapoint == idx_datapoint).update(
+                    {'enabled': 0})
+
+        # Inserting data for the disabled DataPoint invalidates the agent
+        data_table.insert_rows([IDXTimestampValue(
+            idx_datapoint=idx_datapoint, polling_interval=1,
+            timestamp=timestamp, value=1)])
+        misc.CACHE.get(agent_id)
+        self.assertEqual(misc.CACHE.misses, misses + 1)
+
+        # It is already known to be disabled the next time
+        data_table.insert_rows([IDXTimestampValue(
+            idx_datapoint=idx_datapoint, polling_interval=1,
+            timestamp=timestamp + 1, value=1)])
+        misc.CACHE.get(agent_id)
+        self.assertEqual(misc.CACHE.misses, misses + 1)
+
+    def test_discard(self):
+        """Testing method / function discard."""
+        # Initialize key variables
+        cache = misc.ChecksumCache()
+        (agent_id, _) = _agent()
+
+        # Test
+        cache.get(agent_id)
+        cache.discard(agent_id)
+        cache.discard(agent_id)
+        cache.get(agent_id)
+        self.assertEqual(cache.misses, 2)
+
+
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -146,6 +276,30 @@ class TestBasicFunctions(unittest.TestCase):
                 expected[key].last_timestamp)
 
 
+def _agent():
+    """Create an agent with DataPoints.
+
+    Args:
+        None
+
+    Returns:
+        result: Tuple of agent_id and a dict of idx_datapoint values keyed
+            by checksum
+
+    """
+    # Initialize key variables
+    checksums = {}
+    agent_id = data.hashstring(str(random()))
+    idx_agent = agent.idx_agent(agent_id, 'panda_bear', 'koala_bear')
+
+    # Create DataPoints
+    for _ in range(0, 3):
+        checksum = data.hashstring(str(random()))
+        datapoint.insert_row(checksum, DATA_FLOAT, 1, idx_agent)
+        checksums[checksum] = datapoint.checksum_exists(checksum)
+    return (agent_id, checksums)
+
+
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
     UnittestConfig().create()
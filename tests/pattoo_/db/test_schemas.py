@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
-"""Testing pattoo/db/db.py."""
+"""Testing pattoo/db/schemas.py."""
 
 import os
 import unittest
 import sys
 
+# PIP3 imports
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.dialects import mysql
+
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -24,14 +28,72 @@ else:
 
 
 from tests.libraries.configuration import UnittestConfig
+from pattoo.db.models import Data, DataPoint
+from pattoo.db.schemas import InstrumentedQuery
+
+
+def _sql(criterion):
+    """Convert a criterion to MySQL."""
+    return str(criterion.compile(
+        dialect=mysql.dialect(), compile_kwargs={'literal_binds': True}))
 
 
-class TestBasicFunctions(unittest.TestCase):
+class TestInstrumentedQuery(unittest.TestCase):
     """Checks all functions and methods."""
 
-    def foo(self):
-        """Dummy test."""
-        pass
+    def test_get_order_by(self):
+        """Testing method / function get_order_by."""
+        # Results are sorted by the primary key
+        result = InstrumentedQuery.get_order_by(Data)
+        self.assertEqual(
+            result, [(Data.idx_datapoint, 'asc'), (Data.timestamp, 'asc')])
+
+        # Test sorting by other columns
+        result = InstrumentedQuery.get_order_by(
+            DataPoint, ['lastTimestamp DESC', 'pollingInterval'])
+        self.assertEqual(
+            result,
+            [(DataPoint.last_timestamp, 'desc'),
+             (DataPoint.polling_interval, 'asc'),
+             (DataPoint.idx_datapoint, 'asc')])
+
+    def test_get_keyset_criterion(self):
+        """Testing method / function get_keyset_criterion."""
+        # Initialize key variables
+        order_by = [(Data.idx_datapoint, 'asc'), (Data.timestamp, 'desc')]
+
+        # Test
+        result = InstrumentedQuery.get_keyset_criterion(order_by, [1, 2])
+        self.assertEqual(
+            _sql(result), '''\
+pt_data.idx_datapoint > 1 OR \
+pt_data.idx_datapoint = 1 AND pt_data.timestamp < 2''')
+        result = InstrumentedQuery.get_keyset_criterion(
+            order_by, [1, 2], reverse=True)
+        self.assertEqual(
+            _sql(result), '''\
+pt_data.idx_datapoint < 1 OR \
+pt_data.idx_datapoint = 1 AND pt_data.timestamp > 2''')
+
+    def test_get_cursor(self):
+        """Testing method / function get_cursor."""
+        # Initialize key variables
+        order_by = InstrumentedQuery.get_order_by(Data)
+        row = Data(idx_datapoint=3, timestamp=4)
+        make_transient_to_detached(row)
+        other = DataPoint(idx_datapoint=3)
+        make_transient_to_detached(other)
+
+        # Cursors contain the primary key
+        cursor = InstrumentedQuery.get_cursor(row)
+        self.assertEqual(
+            InstrumentedQuery.get_cursor_values(Data, order_by, cursor),
+            [3, 4])
+
+        # Test bad cursors
+        for cursor in ['bad', InstrumentedQuery.get_cursor(other)]:
+            with self.assertRaises(Exception):
+                InstrumentedQuery.get_cursor_values(Data, order_by, cursor)
 
 
 if __name__ == '__main__':
@@ -31,7 +31,7 @@ from pattoo_shared.constants import DATA_INT
 from pattoo_shared.configuration import ServerConfig
 from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
 from pattoo.db.table import datapoint
-from pattoo.ingest.files import Cache
+from pattoo.ingest.files import Cache, Pipeline
 from pattoo.ingest import files as files_test
 
 from tests.libraries.configuration import UnittestConfig
@@ -92,6 +92,41 @@ class TestCache(unittest.TestCase):
         # Purge cache to make sure there are no extraneous files
         cache.purge()
 
+    def test_stream(self):
+        """Testing method / function stream."""
+        # Initialize key variables
+        agent_ids = []
+        for index in range(0, 3):
+            pattoo_values = create_cache(
+                cache_filename='cache_test_{}.json'.format(index))
+            agent_ids.append(pattoo_values['pattoo_agent_id'])
+
+        # Nothing is read until the data is streamed
+        cache = Cache(stream=True)
+        self.assertEqual(cache.files, 3)
+        self.assertFalse(bool(cache.records()))
+
+        # Test
+        result = list(cache.stream(memory_limit=1))
+        self.assertEqual(len(result), 3)
+        for index, (_data, filepaths, marker) in enumerate(result):
+            self.assertEqual(len(_data), 1)
+            self.assertEqual(_data[0][0].pattoo_agent_id, agent_ids[index])
+            self.assertEqual(
+                filepaths, [cache._filepaths[index]])
+            self.assertEqual(marker, {})
+
+        # Test
+        result = list(cache.stream())
+        self.assertEqual(len(result), 1)
+        (_data, filepaths, _) = result[0]
+        self.assertEqual(
+            sorted([_[0].pattoo_agent_id for _ in _data]), sorted(agent_ids))
+        self.assertEqual(filepaths, cache._filepaths)
+
+        # Purge cache to make sure there are no extraneous files
+        cache.purge()
+
     def test_purge(self):
         """Testing method / function purge."""
         # Initialize key variables
@@ -153,6 +188,63 @@ class TestCache(unittest.TestCase):
         self.assertEqual(key_pair['value'], value)
 
 
+class TestPipeline(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test
+        pipeline = Pipeline()
+        self.assertEqual(pipeline.files, 0)
+        self.assertEqual(pipeline.records, 0)
+        self.assertEqual(pipeline.rows, 0)
+
+    def test_run(self):
+        """Testing method / function run."""
+        # Initialize key variables
+        polling_interval = 20
+        _pi = polling_interval * 1000
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+
+        # Create cache files and read them
+        for index in range(0, 3):
+            _ = create_cache(cache_filename='cache_test_{}.json'.format(index))
+        pdbrs = []
+        for _, json_data in files.read_json_files(cache_directory):
+            pdbrs.extend(converter.cache_to_keypairs(json_data))
+        self.assertEqual(len(pdbrs), 3)
+        for pdbr in pdbrs:
+            self.assertFalse(datapoint.checksum_exists(pdbr.pattoo_checksum))
+
+        # Ingest using single file batches
+        pipeline = Pipeline(batch_size=1, queue_size=1)
+        pipeline.run()
+        self.assertEqual(pipeline.files, 3)
+        self.assertEqual(pipeline.records, 3)
+        self.assertEqual(pipeline.rows, 3)
+
+        # Test (cache should be purged)
+        result = files.read_json_files(cache_directory, die=False)
+        self.assertFalse(bool(result))
+
+        # Test (Single data entry should exist for each datapoint)
+        for pdbr in pdbrs:
+            idx_datapoint = datapoint.checksum_exists(pdbr.pattoo_checksum)
+            self.assertTrue(bool(idx_datapoint))
+            obj = datapoint.DataPoint(idx_datapoint)
+            result = obj.data(pdbr.pattoo_timestamp, pdbr.pattoo_timestamp)
+            self.assertEqual(len(result), 1)
+            self.assertEqual(
+                result[0]['timestamp'],
+                times.normalized_timestamp(_pi, pdbr.pattoo_timestamp))
+            self.assertEqual(result[0]['value'], pdbr.pattoo_value)
+
+
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -200,6 +292,67 @@ class TestBasicFunctions(unittest.TestCase):
             key_pair['timestamp'], times.normalized_timestamp(_pi, timestamp))
         self.assertEqual(key_pair['value'], value)
 
+    def test__read(self):
+        """Testing method / function _read."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        claimed = set()
+        for index in range(0, 3):
+            _ = create_cache(cache_filename='cache_test_{}.json'.format(index))
+
+        # Test
+        result = files_test._read(cache_directory, claimed, 0, 2)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(claimed, set([filepath for filepath, _ in result]))
+
+        # Claimed files are not read again
+        result = files_test._read(cache_directory, claimed, 0, 2)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(claimed), 3)
+        result = files_test._read(cache_directory, claimed, 0, 2)
+        self.assertFalse(bool(result))
+
+        # Purged files are forgotten
+        files_test._purge(sorted(claimed))
+        result = files_test._read(cache_directory, claimed, 0, 2)
+        self.assertFalse(bool(result))
+        self.assertFalse(bool(claimed))
+
+    def test__list(self):
+        """Testing method / function _list."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        for index in range(0, 3):
+            _ = create_cache(cache_filename='cache_test_{}.json'.format(index))
+
+        # Test
+        result = files_test._list(cache_directory, 0, 2)
+        self.assertEqual(result, [
+            '{}{}cache_test_{}.json'.format(
+                cache_directory, os.sep, _) for _ in range(0, 2)])
+        result = files_test._list(cache_directory, 3600, 2)
+        self.assertFalse(bool(result))
+
+        # Purge cache to make sure there are no extraneous files
+        files_test._purge(files_test._list(cache_directory, 0, 3))
+
+    def test__records(self):
+        """Testing method / function _records."""
+        # Tested by TestCache.test_records
+        pass
+
+    def test__group(self):
+        """Testing method / function _group."""
+        # Tested by TestCache.test_records
+        pass
+
+    def test__purge(self):
+        """Testing method / function _purge."""
+        # Tested by TestCache.test_purge
+        pass
+
     def test__lock(self):
         """Testing method / function _lock."""
         # Initialize key variables
@@ -229,7 +382,7 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(result)
 
 
-def create_cache():
+def create_cache(cache_filename='cache_test.json'):
     """Testing method / function records."""
     # Initialize key variables
     config = ServerConfig()
@@ -271,7 +424,7 @@ def create_cache():
     apd.add(ddv)
     cache_dict = converter.posting_data_points(
         converter.agentdata_to_post(apd))
-    cache_file = '{}{}cache_test.json'.format(cache_directory, os.sep)
+    cache_file = '{}{}{}'.format(cache_directory, os.sep, cache_filename)
     with open(cache_file, 'w') as _fp:
         json.dump(cache_dict, _fp)
 
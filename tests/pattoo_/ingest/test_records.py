@@ -51,30 +51,6 @@ class TestRecords(unittest.TestCase):
         """Testing method / function __init__."""
         pass
 
-    def test_multiprocess_pairs(self):
-        """Testing method / function multiprocess_pairs."""
-        # Initialize key variables
-        items = make_records()
-        records = items['records']
-
-        # Key-value pair should not exist
-        for record in records:
-            key = record.pattoo_key
-            value = record.pattoo_value
-            result = pair.pair_exists(key, value)
-            self.assertFalse(result)
-
-        # Insert pairs as necessary
-        process = ingest_data.Records([records])
-        process.multiprocess_pairs()
-
-        # Key-value pair should exist
-        for record in records:
-            key = record.pattoo_key
-            value = record.pattoo_value
-            result = pair.pair_exists(key, value)
-            self.assertFalse(result)
-
     def test_multiprocess_data(self):
         """Testing method / function multiprocess_data."""
         # Initialize key variables
@@ -90,7 +66,6 @@ class TestRecords(unittest.TestCase):
 
         # Test
         process = ingest_data.Records([records])
-        process.multiprocess_pairs()
         process.multiprocess_data()
 
         # Get data from database
@@ -105,30 +80,6 @@ class TestRecords(unittest.TestCase):
             self.assertEqual(result['value'], expected[index]['value'])
             self.assertEqual(result['timestamp'], expected[index]['timestamp'])
 
-    def test_singleprocess_pairs(self):
-        """Testing method / function singleprocess_pairs."""
-        # Initialize key variables
-        items = make_records()
-        records = items['records']
-
-        # Key-value pair should not exist
-        for record in records:
-            key = record.pattoo_key
-            value = record.pattoo_value
-            result = pair.pair_exists(key, value)
-            self.assertFalse(result)
-
-        # Insert pairs as necessary
-        process = ingest_data.Records([records])
-        process.singleprocess_pairs()
-
-        # Key-value pair should exist
-        for record in records:
-            key = record.pattoo_key
-            value = record.pattoo_value
-            result = pair.pair_exists(key, value)
-            self.assertFalse(result)
-
     def test_singleprocess_data(self):
         """Testing method / function singleprocess_data."""
         # Initialize key variables
@@ -144,7 +95,6 @@ class TestRecords(unittest.TestCase):
 
         # Test
         process = ingest_data.Records([records])
-        process.singleprocess_pairs()
         process.singleprocess_data()
 
         # Get data from database
@@ -174,7 +124,8 @@ class TestRecords(unittest.TestCase):
 
         # Test
         process = ingest_data.Records([records])
-        process.ingest()
+        rows = process.ingest()
+        self.assertEqual(rows, len(expected))
 
         # Get data from database
         idx_datapoint = datapoint.checksum_exists(checksum)
@@ -196,21 +147,11 @@ class TestBasicFunctions(unittest.TestCase):
     # General object setup
     #########################################################################
 
-    def test__process_kvps_exception(self):
-        """Testing method / function _process_kvps_exception."""
-        # Tested by TestProcess class unittests in this file
-        pass
-
     def test__process_data_exception(self):
         """Testing method / function _process_data_exception."""
         # Tested by TestProcess class unittests in this file
         pass
 
-    def test__multiprocess_pairs(self):
-        """Testing method / function _multiprocess_pairs."""
-        # Tested by TestProcess class unittests in this file
-        pass
-
     def test__multiprocess_data(self):
         """Testing method / function _multiprocess_data."""
         # Tested by TestProcess class unittests in this file
@@ -234,7 +175,8 @@ class TestBasicFunctions(unittest.TestCase):
         pair.insert_rows(kvps)
 
         # Insert
-        ingest_data.process_db_records(records)
+        rows = ingest_data.process_db_records(records)
+        self.assertEqual(rows, len(expected))
 
         # Get data from database
         idx_datapoint = datapoint.checksum_exists(checksum)
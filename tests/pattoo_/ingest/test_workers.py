@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test pattoo ingest worker pool."""
+
+import os
+import unittest
+import sys
+from operator import add
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.ingest.workers import WorkerPool
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Tested by test_starmap
+        pass
+
+    def test_start(self):
+        """Testing method / function start."""
+        # Test
+        pool = WorkerPool(processes=2)
+        pool.start()
+        pool.start()
+        self.assertEqual(len(pool._workers), 2)
+        for worker in pool._workers:
+            self.assertTrue(worker.is_alive())
+        pool.stop()
+
+    def test_stop(self):
+        """Testing method / function stop."""
+        # Test
+        pool = WorkerPool(processes=2)
+        pool.start()
+        workers = pool._workers
+        pool.stop()
+        self.assertFalse(bool(pool._workers))
+        for worker in workers:
+            self.assertFalse(worker.is_alive())
+
+    def test_starmap(self):
+        """Testing method / function starmap."""
+        # Initialize key variables
+        pool = WorkerPool(processes=3)
+        arguments = [(_, _ * 10) for _ in range(0, 20)]
+        expected = [add(*_) for _ in arguments]
+
+        # Test
+        result = pool.starmap(add, arguments)
+        self.assertEqual(result, expected)
+
+        # Test using keys. The same sub processes should be reused
+        workers = pool._workers
+        keys = [str(_ % 4) for _ in range(0, 20)]
+        result = pool.starmap(add, arguments, keys=keys)
+        self.assertEqual(result, expected)
+        self.assertEqual(pool._workers, workers)
+
+        # Test with no arguments
+        self.assertEqual(pool.starmap(add, []), [])
+        pool.stop()
+
+    def test__check(self):
+        """Testing method / function _check."""
+        # Nothing should happen when all the sub processes are running
+        pool = WorkerPool(processes=1)
+        pool.start()
+        pool._check()
+        pool.stop()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
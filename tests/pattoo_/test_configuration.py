@@ -94,6 +94,48 @@ class TestConfiguration(unittest.TestCase):
         result = self.config.db_name()
         self.assertEqual(result, expected)
 
+    def test_cache_type(self):
+        """Testing method cache_type."""
+        # Initialize key values
+        expected = 'filesystem'
+
+        # Test
+        result = self.config.cache_type()
+        self.assertEqual(result, expected)
+
+    def test_cache_url(self):
+        """Testing method cache_url."""
+        # Test
+        result = self.config.cache_url()
+        self.assertIsNone(result)
+
+    def test_cache_timeout(self):
+        """Testing method cache_timeout."""
+        # Initialize key values
+        expected = 600
+
+        # Test
+        result = self.config.cache_timeout()
+        self.assertEqual(result, expected)
+
+    def test_cache_size(self):
+        """Testing method cache_size."""
+        # Initialize key values
+        expected = 10000
+
+        # Test
+        result = self.config.cache_size()
+        self.assertEqual(result, expected)
+
+    def test_series_cache_size(self):
+        """Testing method series_cache_size."""
+        # Initialize key values
+        expected = 100
+
+        # Test
+        result = self.config.series_cache_size()
+        self.assertEqual(result, expected)
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
@@ -190,6 +232,159 @@ class TestConfigAgent(unittest.TestCase):
         result = self.config.ip_bind_port()
         self.assertEqual(result, expected)
 
+    def test_spool(self):
+        """Testing function spool."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.spool()
+        self.assertEqual(result, expected)
+
+    def test_spool_segment_size(self):
+        """Testing function spool_segment_size."""
+        # Initialize key values
+        expected = 67108864
+
+        # Test
+        result = self.config.spool_segment_size()
+        self.assertEqual(result, expected)
+
+    def test_spool_fsync_interval(self):
+        """Testing function spool_fsync_interval."""
+        # Initialize key values
+        expected = 1
+
+        # Test
+        result = self.config.spool_fsync_interval()
+        self.assertEqual(result, expected)
+
+    def test_async_server(self):
+        """Testing function async_server."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.async_server()
+        self.assertEqual(result, expected)
+
+    def test_async_server_threads(self):
+        """Testing function async_server_threads."""
+        # Initialize key values
+        expected = 4
+
+        # Test
+        result = self.config.async_server_threads()
+        self.assertEqual(result, expected)
+
+    def test_write_through(self):
+        """Testing function write_through."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.write_through()
+        self.assertEqual(result, expected)
+
+    def test_write_through_batch_size(self):
+        """Testing function write_through_batch_size."""
+        # Initialize key values
+        expected = 500
+
+        # Test
+        result = self.config.write_through_batch_size()
+        self.assertEqual(result, expected)
+
+    def test_write_through_interval(self):
+        """Testing function write_through_interval."""
+        # Initialize key values
+        expected = 5
+
+        # Test
+        result = self.config.write_through_interval()
+        self.assertEqual(result, expected)
+
+    def test_cache_high_water_files(self):
+        """Testing function cache_high_water_files."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_high_water_files()
+        self.assertEqual(result, expected)
+
+    def test_cache_high_water_bytes(self):
+        """Testing function cache_high_water_bytes."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_high_water_bytes()
+        self.assertEqual(result, expected)
+
+    def test_cache_low_water_files(self):
+        """Testing function cache_low_water_files."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_low_water_files()
+        self.assertEqual(result, expected)
+
+    def test_cache_low_water_bytes(self):
+        """Testing function cache_low_water_bytes."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_low_water_bytes()
+        self.assertEqual(result, expected)
+
+    def test_cache_retry_after(self):
+        """Testing function cache_retry_after."""
+        # Initialize key values
+        expected = 60
+
+        # Test
+        result = self.config.cache_retry_after()
+        self.assertEqual(result, expected)
+
+    def test_dedup_window(self):
+        """Testing function dedup_window."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.dedup_window()
+        self.assertEqual(result, expected)
+
+    def test_dedup_size(self):
+        """Testing function dedup_size."""
+        # Initialize key values
+        expected = 100000
+
+        # Test
+        result = self.config.dedup_size()
+        self.assertEqual(result, expected)
+
+    def test_max_post_size(self):
+        """Testing function max_post_size."""
+        # Initialize key values
+        expected = 67108864
+
+        # Test
+        result = self.config.max_post_size()
+        self.assertEqual(result, expected)
+
+    def test_max_decoded_size(self):
+        """Testing function max_decoded_size."""
+        # Initialize key values
+        expected = 268435456
+
+        # Test
+        result = self.config.max_decoded_size()
+        self.assertEqual(result, expected)
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
@@ -295,6 +490,69 @@ class TestConfigIngester(unittest.TestCase):
         result = self.config.batch_size()
         self.assertEqual(result, expected)
 
+    def test_insert_chunk_size(self):
+        """Testing function insert_chunk_size."""
+        # Initialize key values
+        expected = 5000
+
+        # Test
+        result = self.config.insert_chunk_size()
+        self.assertEqual(result, expected)
+
+    def test_load_data_infile(self):
+        """Testing function load_data_infile."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.load_data_infile()
+        self.assertEqual(result, expected)
+
+    def test_pipeline(self):
+        """Testing function pipeline."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.pipeline()
+        self.assertEqual(result, expected)
+
+    def test_pipeline_queue_size(self):
+        """Testing function pipeline_queue_size."""
+        # Initialize key values
+        expected = 2
+
+        # Test
+        result = self.config.pipeline_queue_size()
+        self.assertEqual(result, expected)
+
+    def test_checksum_cache_size(self):
+        """Testing function checksum_cache_size."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.checksum_cache_size()
+        self.assertEqual(result, expected)
+
+    def test_stream(self):
+        """Testing function stream."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.stream()
+        self.assertEqual(result, expected)
+
+    def test_stream_memory_limit(self):
+        """Testing function stream_memory_limit."""
+        # Initialize key values
+        expected = 67108864
+
+        # Test
+        result = self.config.stream_memory_limit()
+        self.assertEqual(result, expected)
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
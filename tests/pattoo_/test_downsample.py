@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the downsample module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import downsample
+
+
+def _values(values):
+    """Create a time series with timestamps one second apart."""
+    return [
+        {'timestamp': index * 1000, 'value': value}
+        for index, value in enumerate(values)]
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_downsample(self):
+        """Testing function downsample."""
+        # Initialize key variables
+        values = _values(range(10))
+
+        # Nothing is done unless there are too many values
+        for points in [None, 0, -1, 10, 11]:
+            self.assertEqual(downsample.downsample(values, points), values)
+
+        # Test modes
+        self.assertEqual(
+            downsample.downsample(values, 5),
+            [{'timestamp': _ * 2000, 'value': (_ * 2) + 0.5}
+             for _ in range(5)])
+        self.assertEqual(
+            [_['value'] for _ in downsample.downsample(values, 5, 'min')],
+            [0, 2, 4, 6, 8])
+        self.assertEqual(
+            [_['value'] for _ in downsample.downsample(values, 5, 'max')],
+            [1, 3, 5, 7, 9])
+        self.assertEqual(len(downsample.downsample(values, 5, 'lttb')), 5)
+
+        # Unknown modes are averaged
+        self.assertEqual(
+            downsample.downsample(values, 5, 'unknown'),
+            downsample.downsample(values, 5))
+
+    def test__bucketed(self):
+        """Testing function _bucketed."""
+        # Buckets without values are None. The last bucket may be smaller.
+        values = _values([1, None, None, None, 5, 6, 7])
+        result = downsample._bucketed(values, 3, downsample.np.nanmean)
+        self.assertEqual(result, [
+            {'timestamp': 0, 'value': 1},
+            {'timestamp': 3000, 'value': 5.5},
+            {'timestamp': 6000, 'value': 7}])
+        result = downsample._bucketed(
+            _values([None, None, 1, 2]), 2, downsample.np.nanmax)
+        self.assertEqual(result, [
+            {'timestamp': 0, 'value': None},
+            {'timestamp': 2000, 'value': 2}])
+
+    def test__lttb(self):
+        """Testing function _lttb."""
+        # Peaks are preserved. The first and last values are always kept.
+        values = _values([0, 0, 0, 10, 0, 0, 0, -10, 0, 0])
+        result = downsample._lttb(values, 4)
+        self.assertEqual(
+            [_['value'] for _ in result], [0, 10, -10, 0])
+        self.assertEqual(result[0], values[0])
+        self.assertEqual(result[-1], values[-1])
+
+        # Missing values are ignored
+        values = _values([None, 1, None, 2, 3, None])
+        self.assertEqual(
+            downsample._lttb(values, 3),
+            [_ for _ in values if _['value'] is not None])
+        self.assertEqual(
+            [_['value'] for _ in downsample._lttb(values, 2)], [1, 3])
+        self.assertEqual(
+            [_['value'] for _ in downsample._lttb(values, 1)], [1])
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Test the spool module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import spool
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.configuration import ConfigAgent
+
+
+class TestWriter(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing function __init__."""
+        pass
+
+    def test_append(self):
+        """Testing function append."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Segments are rotated when they are too large
+            writer = spool.Writer(directory, segment_size=10)
+            writer.append({'one': 1})
+            writer.append({'two': 2})
+            self.assertEqual(len(spool._segments(directory)), 2)
+            extensions = sorted(
+                [extension for _, extension in spool._segments(
+                    directory).values()])
+            self.assertEqual(extensions, ['.active', '.spool'])
+
+            # Test
+            records, _ = spool.Reader(directory).read(10)
+            self.assertEqual(
+                [data for _, data in records], [{'one': 1}, {'two': 2}])
+            writer.close()
+
+    def test_extend(self):
+        """Testing function extend."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            writer.extend([])
+            self.assertEqual(os.listdir(directory), [])
+            writer.extend([{'one': 1}, {'two': 2}])
+            writer.close()
+
+            # Test
+            records, _ = spool.Reader(directory).read(10)
+            self.assertEqual(
+                [data for _, data in records], [{'one': 1}, {'two': 2}])
+
+    def test_close(self):
+        """Testing function close."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            writer.append({'one': 1})
+            writer.close()
+            writer.close()
+            extensions = [extension for _, extension in spool._segments(
+                directory).values()]
+            self.assertEqual(extensions, ['.spool'])
+
+
+class TestReader(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing function __init__."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            writer.append({'one': 1})
+
+            # Data appended after the reader is created isn't read
+            reader = spool.Reader(directory)
+            writer.append({'two': 2})
+            records, _ = reader.read(10)
+            self.assertEqual([data for _, data in records], [{'one': 1}])
+            writer.close()
+
+    def test_pending(self):
+        """Testing function pending."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertFalse(spool.Reader(directory).pending())
+            writer = spool.Writer(directory)
+            writer.append({'one': 1})
+            writer.append({'two': 2})
+            writer.close()
+
+            # Test
+            reader = spool.Reader(directory)
+            self.assertTrue(reader.pending())
+            reader.read(1)
+            self.assertTrue(reader.pending())
+            reader.read(1)
+            self.assertFalse(reader.pending())
+
+    def test_read(self):
+        """Testing function read."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            for value in range(5):
+                writer.append({'value': value})
+            writer.close()
+
+            # Partially written records are ignored
+            (filepath, _) = list(spool._segments(directory).values())[0]
+            size = os.path.getsize(filepath)
+            with open(filepath, 'ab') as f_handle:
+                f_handle.write(spool._HEADER.pack(100) + b'{"value"')
+
+            # Test
+            reader = spool.Reader(directory)
+            records, marker = reader.read(3)
+            self.assertEqual(
+                [data['value'] for _, data in records], [0, 1, 2])
+            self.assertEqual(len(set([key for key, _ in records])), 3)
+            self.assertEqual(
+                [key for key, _ in records],
+                sorted([key for key, _ in records]))
+            records, marker = reader.read(3)
+            self.assertEqual([data['value'] for _, data in records], [3, 4])
+            self.assertEqual(list(marker.values()), [size])
+            records, marker = reader.read(3)
+            self.assertEqual(records, [])
+            self.assertEqual(marker, {})
+
+    def test_records(self):
+        """Testing function records."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            writer.append({'one': 1})
+            writer.append({'two': 2})
+            writer.close()
+
+            # Test
+            reader = spool.Reader(directory)
+            records = reader.records(10)
+            (key, data, (basename, position)) = next(records)
+            self.assertEqual(data, {'one': 1})
+            self.assertTrue(key.startswith(basename))
+            self.assertEqual(reader._positions[basename], position)
+            self.assertEqual(len(list(records)), 1)
+            self.assertFalse(reader.pending())
+
+    def test_commit(self):
+        """Testing function commit."""
+        with tempfile.TemporaryDirectory() as directory:
+            writer = spool.Writer(directory)
+            writer.append({'one': 1})
+            writer.append({'two': 2})
+            writer.close()
+
+            # Records that have been committed aren't read again
+            reader = spool.Reader(directory)
+            _, marker = reader.read(1)
+            reader.commit(marker)
+            records, _ = spool.Reader(directory).read(10)
+            self.assertEqual([data for _, data in records], [{'two': 2}])
+
+            # Segments are deleted once they have been read
+            reader = spool.Reader(directory)
+            _, marker = reader.read(10)
+            reader.commit(marker)
+            self.assertEqual(os.listdir(directory), [])
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_directory(self):
+        """Testing function directory."""
+        # Test
+        config = ConfigAgent()
+        expected = '{}{}spool'.format(
+            config.agent_cache_directory(PATTOO_API_AGENT_NAME), os.sep)
+        result = spool.directory()
+        self.assertEqual(result, expected)
+        self.assertTrue(os.path.isdir(result))
+
+    def test_append(self):
+        """Testing function append."""
+        # Tested by test_close
+        pass
+
+    def test_close(self):
+        """Testing function close."""
+        # Initialize key variables
+        _directory = spool.directory()
+        reader = spool.Reader(_directory)
+        _, marker = reader.read(1000000)
+        reader.commit(marker)
+
+        # Test
+        spool.append({'one': 1})
+        spool.close()
+        extensions = [extension for _, extension in spool._segments(
+            _directory).values()]
+        self.assertEqual(extensions, ['.spool'])
+        self.assertEqual(spool._WRITERS, {})
+
+        # Read the data to delete the segment
+        reader = spool.Reader(_directory)
+        records, marker = reader.read(10)
+        self.assertEqual([data for _, data in records], [{'one': 1}])
+        reader.commit(marker)
+        self.assertEqual(os.listdir(_directory), [])
+
+    def test_extend(self):
+        """Testing function extend."""
+        # Tested by test_close
+        pass
+
+    def test__segments(self):
+        """Testing function _segments."""
+        # Tested by TestWriter
+        pass
+
+    def test__offset(self):
+        """Testing function _offset."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(spool._offset(directory, 'segment'), 0)
+            with open(spool._filepath(
+                    directory, 'segment', '.offset'), 'w') as f_handle:
+                f_handle.write('10')
+            self.assertEqual(spool._offset(directory, 'segment'), 10)
+
+    def test__filepath(self):
+        """Testing function _filepath."""
+        # Test
+        result = spool._filepath('/tmp', 'segment', '.spool')
+        self.assertEqual(result, '/tmp{}segment.spool'.format(os.sep))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unittest
+    unittest.main()
@@ -76,6 +76,31 @@ class TestBasicFunctiions(unittest.TestCase):
             result = uri.chart_timestamp_args(idx_datapoint, value)
             self.assertEqual(result + 604800000, now)
 
+    def test_timestamp_start(self):
+        """Testing function timestamp_start."""
+        # Initialize key variables
+        _pi = 1000
+
+        # Test
+        now = normalized_timestamp(_pi, int(time.time() * 1000))
+        result = uri.timestamp_start(_pi)
+        self.assertEqual(result + 604800000, now)
+        for value in [-1, 6011]:
+            now = normalized_timestamp(_pi, int(time.time() * 1000))
+            result = uri.timestamp_start(_pi, value)
+            self.assertEqual(result + (abs(value) * 1000), now)
+
+    def test_resolution(self):
+        """Testing function resolution."""
+        # Nothing is returned unless points is specified
+        for points in [None, 0, -1, '10']:
+            self.assertIsNone(uri.resolution(3600, points))
+
+        # Test
+        self.assertEqual(uri.resolution(3600, 12), 300000)
+        self.assertEqual(uri.resolution(-3600, 12), 300000)
+        self.assertEqual(uri.resolution(None, 7), 86400000)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests